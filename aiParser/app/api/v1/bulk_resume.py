@@ -0,0 +1,126 @@
+import os
+import time
+import asyncio
+from contextlib import aclosing
+from typing import AsyncIterator, List, Tuple
+
+from fastapi import APIRouter, UploadFile, File, HTTPException, Header
+from fastapi.responses import StreamingResponse
+from app.services import responses
+from app.services.bulk_ingest import iter_zip_members, parse_document, summarize
+from app.services.executor import EXECUTOR_PROCESSES, limit, run_in_process, run_in_thread
+from app.services.parse_cache import bytes_key, parse_cache
+from app.services.parse_resume import PARSE_CACHE_VERSION
+from app.services.resumeText import MAX_PDF_BYTES, PdfLimitError, read_upload
+
+router = APIRouter()
+API_KEY = os.getenv("API_KEY")
+
+# all files of one bulk request together; a single PDF / TXT is capped at
+# MAX_PDF_BYTES like /upload, a zip only by what is left of this budget
+MAX_BULK_BYTES = int(os.getenv("MAX_BULK_BYTES", str(200 * 1024 * 1024)))
+
+
+async def _documents(uploads: List[Tuple[str, bytes]]) -> AsyncIterator[Tuple[str, bytes]]:
+    for name, data in uploads:
+        if not name.lower().endswith(".zip"):
+            yield name, data
+            continue
+        members = iter_zip_members(data)
+        while True:
+            # inflating a member is CPU work -> worker thread pool, not the event loop
+            member = await run_in_thread(next, members, None)
+            if member is None:
+                break
+            yield f"{name}!{member[0]}", member[1]
+
+
+async def _parse_one(name: str, data: bytes):
+    key = bytes_key(data, PARSE_CACHE_VERSION)
+    cached = parse_cache.get(key)
+    if cached is not None:
+        return {"file": name, "status": "success", "data": cached}
+    result = await run_in_process(parse_document, name, data)
+    if result["status"] == "success":
+        parse_cache.put(key, result["data"])
+    return result
+
+
+def _result_line(result) -> bytes:
+    return responses.dumps(result) + b"\n"
+
+
+async def _stream(documents: AsyncIterator[Tuple[str, bytes]], limiter):
+    # the slot is taken here, not in the handler: a client that disconnects
+    # before the body starts never runs this, so there is nothing to leak
+    try:
+        async with limiter, aclosing(_parse_all(documents)) as lines:
+            async for line in lines:
+                yield line
+    except HTTPException as e:
+        # the queue filled up between the handler's check and now
+        yield _result_line({"status": "error", "error": e.detail})
+
+
+async def _parse_all(documents: AsyncIterator[Tuple[str, bytes]]):
+    started = time.perf_counter()
+    done = errors = 0
+    max_in_flight = max(2, 2 * EXECUTOR_PROCESSES)
+    pending = set()
+    try:
+        async for name, data in documents:
+            pending.add(asyncio.ensure_future(_parse_one(name, data)))
+            if len(pending) < max_in_flight:
+                continue
+            finished, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in finished:
+                result = task.result()
+                done += 1
+                errors += result["status"] != "success"
+                yield _result_line(result)
+        while pending:
+            finished, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in finished:
+                result = task.result()
+                done += 1
+                errors += result["status"] != "success"
+                yield _result_line(result)
+        yield _result_line({"summary": summarize(done, errors, time.perf_counter() - started)})
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+@router.post("/bulk")
+async def bulk_upload(
+    files: List[UploadFile] = File(...),
+    x_api_key: str = Header(None)
+):
+    """
+    Parse many resumes (PDF / TXT files, or zips of them) in one call.
+    Streams NDJSON: one {"file", "status", "data" | "error"} line per document
+    as it finishes, then a final {"summary": {..., "docs_per_sec"}} line.
+    """
+    if x_api_key != API_KEY:
+        raise HTTPException(status_code=401, detail="Unauthorized")
+
+    uploads = []
+    remaining = MAX_BULK_BYTES
+    for f in files:
+        name = f.filename or "upload"
+        per_file = None if name.lower().endswith(".zip") else MAX_PDF_BYTES
+        max_bytes = remaining if per_file is None else min(per_file, remaining)
+        try:
+            data = await read_upload(f, max_bytes)
+        except PdfLimitError:
+            if max_bytes == per_file:
+                raise HTTPException(status_code=413, detail=f"{name}: file larger than {per_file} bytes")
+            raise HTTPException(status_code=413, detail=f"Bulk upload larger than {MAX_BULK_BYTES} bytes")
+        remaining -= len(data)
+        uploads.append((name, data))
+
+    # one bulk job per worker at a time: 503 now if the queue is already full,
+    # the slot itself is held by the stream (released when it ends)
+    limiter = limit("resume-bulk")
+    limiter.check()
+    return StreamingResponse(_stream(_documents(uploads), limiter), media_type=responses.NDJSON_MEDIA_TYPE)
@@ -0,0 +1,117 @@
+from fastapi import APIRouter, Header, HTTPException
+from pydantic import BaseModel
+from typing import Any, Dict, List
+import os
+
+from app.services import catalog
+from app.services.executor import limit, run_in_thread
+
+router = APIRouter()
+
+
+class JobDocument(BaseModel):
+    jobId: str
+    title: str
+    text: str
+    active: bool = True                  # inactive jobs are skipped by "all active" matching
+    attributes: Dict[str, Any] = {}      # filterable, e.g. {"location": "Remote", "type": "full-time"}
+
+class SeekerDocument(BaseModel):
+    seekerId: str
+    resumeText: str
+    active: bool = True
+    attributes: Dict[str, Any] = {}
+
+class JobUpsertRequest(BaseModel):
+    jobs: List[JobDocument]
+
+class SeekerUpsertRequest(BaseModel):
+    jobseekers: List[SeekerDocument]
+
+class DeleteRequest(BaseModel):
+    ids: List[str]
+
+
+def _check_key(x_api_key: str) -> None:
+    API_KEY = os.getenv("PARSER_API_KEY")
+    if API_KEY and x_api_key != API_KEY:
+        raise HTTPException(status_code=401, detail="Unauthorized")
+
+
+# --------------------------
+# Jobs
+# --------------------------
+@router.put("/jobs")
+async def upsert_jobs(request: JobUpsertRequest, x_api_key: str = Header(None)):
+    """Register or update jobs (encoded once; match them later by jobId)."""
+    _check_key(x_api_key)
+    docs = [
+        {
+            "id": job.jobId,
+            # same texts /match-jobs and /match-candidates embed for inline jobs
+            "texts": {catalog.JOB_LISTING: f"{job.title}. {job.text}", catalog.JOB_TEXT: job.text},
+            "active": job.active,
+            "attributes": job.attributes,
+        }
+        for job in request.jobs
+    ]
+    async with limit("catalog"):
+        upserted = await run_in_thread(catalog.jobs.upsert, docs)
+    return {"upserted": upserted, "total": len(catalog.jobs)}
+
+
+@router.post("/jobs/delete")
+async def delete_jobs(request: DeleteRequest, x_api_key: str = Header(None)):
+    _check_key(x_api_key)
+    async with limit("catalog"):
+        deleted = await run_in_thread(catalog.jobs.delete, request.ids)
+    return {"deleted": len(deleted), "total": len(catalog.jobs)}
+
+
+@router.delete("/jobs/{job_id}")
+async def delete_job(job_id: str, x_api_key: str = Header(None)):
+    _check_key(x_api_key)
+    async with limit("catalog"):
+        deleted = await run_in_thread(catalog.jobs.delete, [job_id])
+    if not deleted:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return {"deleted": 1, "total": len(catalog.jobs)}
+
+
+# --------------------------
+# Jobseekers
+# --------------------------
+@router.put("/jobseekers")
+async def upsert_jobseekers(request: SeekerUpsertRequest, x_api_key: str = Header(None)):
+    """Register or update jobseekers (encoded once; match them later by seekerId)."""
+    _check_key(x_api_key)
+    docs = [
+        {
+            "id": seeker.seekerId,
+            "texts": {catalog.SEEKER_RESUME: seeker.resumeText},
+            "active": seeker.active,
+            "attributes": seeker.attributes,
+        }
+        for seeker in request.jobseekers
+    ]
+    async with limit("catalog"):
+        upserted = await run_in_thread(catalog.jobseekers.upsert, docs)
+    return {"upserted": upserted, "total": len(catalog.jobseekers)}
+
+
+@router.post("/jobseekers/delete")
+async def delete_jobseekers(request: DeleteRequest, x_api_key: str = Header(None)):
+    _check_key(x_api_key)
+    async with limit("catalog"):
+        deleted = await run_in_thread(catalog.jobseekers.delete, request.ids)
+    return {"deleted": len(deleted), "total": len(catalog.jobseekers)}
+
+
+@router.delete("/jobseekers/{seeker_id}")
+async def delete_jobseeker(seeker_id: str, x_api_key: str = Header(None)):
+    _check_key(x_api_key)
+    async with limit("catalog"):
+        deleted = await run_in_thread(catalog.jobseekers.delete, [seeker_id])
+    if not deleted:
+        raise HTTPException(status_code=404, detail="Jobseeker not found")
+    return {"deleted": 1, "total": len(catalog.jobseekers)}
@@ -1,13 +1,24 @@
-from fastapi import APIRouter, Header, HTTPException
+from fastapi import APIRouter, Header, HTTPException, Query
 from pydantic import BaseModel
-from typing import List
-from sentence_transformers import SentenceTransformer, util
+from typing import Any, Dict, List, Optional
 import os
 
+from app.scoring import (
+    best_per_column, global_top_k, iter_pairs, ranked_pairs_blockwise, to_percentages, top_k_per_row,
+)
+from app.services import catalog, metrics, responses
+from app.services.compact_vectors import similarity
+# Same model (and embedding store) used for job recommendations
+from app.services.embeddings import embed
+from app.services.executor import limit, run_in_thread
+
 router = APIRouter()
 
-# Same model used for job recommendations
-model = SentenceTransformer("sentence-transformers/all-mpnet-base-v2")
+# pairs: every (job, seeker) above the threshold (J x S rows at worst)
+# top_k_per_job: [{jobId, candidates: [{seekerId, matchPercentage}]}], k per job
+# best_per_seeker: [{seekerId, jobId, matchPercentage}], the seeker's best job (at most k seekers)
+# global_top_k: the k best (job, seeker) pairs
+MODES = ("pairs", "top_k_per_job", "best_per_seeker", "global_top_k")
 
 class JobItem(BaseModel):
     jobId: str
@@ -19,48 +30,112 @@ class SeekerItem(BaseModel):
     resumeText: str  # full resume
 
 class MatchCandidateRequest(BaseModel):
-    jobs: List[JobItem]
-    jobseekers: List[SeekerItem]
+    # each side: inline documents, registered ids, or neither = all active registered
+    jobs: Optional[List[JobItem]] = None
+    jobIds: Optional[List[str]] = None
+    jobFilters: Optional[Dict[str, Any]] = None
+    jobseekers: Optional[List[SeekerItem]] = None
+    seekerIds: Optional[List[str]] = None
+    seekerFilters: Optional[Dict[str, Any]] = None
+    mode: str = "pairs"          # see MODES
+    k: Optional[int] = None      # required for top_k_per_job / global_top_k
+
+
+def _job_side(request: MatchCandidateRequest):
+    if request.jobs is not None:
+        return [job.jobId for job in request.jobs], embed([job.text for job in request.jobs])
+    return catalog.jobs.select(catalog.JOB_TEXT, request.jobIds, request.jobFilters)
+
+
+def _seeker_side(request: MatchCandidateRequest):
+    if request.jobseekers is not None:
+        # persisted like jobs: recruiters resend the same (large) seeker pool,
+        # which would evict itself from the in-memory query cache
+        return [s.seekerId for s in request.jobseekers], embed([s.resumeText for s in request.jobseekers])
+    return catalog.jobseekers.select(catalog.SEEKER_RESUME, request.seekerIds, request.seekerFilters)
+
+
+def _sides(request: MatchCandidateRequest):
+    """Both sides resolved; unknown or empty registered sides are a 404, not an empty match."""
+    sides, missing = [], []
+    for resolve, kind, filters in ((_job_side, "jobs", request.jobFilters),
+                                   (_seeker_side, "jobseekers", request.seekerFilters)):
+        try:
+            ids, embeddings = resolve(request)
+        except catalog.UnknownDocumentError as e:
+            missing.append(str(e))
+            continue
+        if not ids:
+            missing.append(f"No registered {kind} match {kind[:-1]}Filters" if filters else f"No active registered {kind}")
+        sides.append((ids, embeddings))
+    if missing:
+        raise HTTPException(status_code=404, detail="; ".join(missing))
+    return sides
+
+
+def _ranked_candidates(request: MatchCandidateRequest):
+    """Results as an iterator; scoring and ranking are done by the time it returns."""
+    # One batched encode per side (cached texts are skipped entirely;
+    # registered documents are not encoded at all)
+    with metrics.timer("match_candidates.embed"):
+        (job_ids, job_embeddings), (seeker_ids, seeker_embeddings) = _sides(request)
+
+    if request.mode == "pairs":
+        with metrics.timer("match_candidates.score"):
+            # Keep matches above threshold, sorted by match score; scored in
+            # job blocks so the full (jobs x seekers) matrix never exists
+            ranked = ranked_pairs_blockwise(job_embeddings, seeker_embeddings)
+        return iter_pairs(ranked, job_ids, seeker_ids, row_key="jobId", col_key="seekerId")
+
+    with metrics.timer("match_candidates.score"):
+        # Normalized embeddings -> (jobs x seekers) cosine matrix in one matmul
+        scores = to_percentages(similarity(job_embeddings, seeker_embeddings))
+
+    with metrics.timer("match_candidates.select"):
+        # partial selection on the matrix: response size is bounded by k, not J x S
+        if request.mode == "top_k_per_job":
+            rows = top_k_per_row(scores, job_ids, seeker_ids, "jobId", "seekerId", request.k, group_key="candidates")
+        elif request.mode == "best_per_seeker":
+            rows = best_per_column(scores, job_ids, seeker_ids, "jobId", "seekerId", request.k)
+        else:
+            rows = global_top_k(scores, job_ids, seeker_ids, "jobId", "seekerId", request.k)
+    return iter(rows)
+
+
+def _match_candidates(request: MatchCandidateRequest):
+    rows = _ranked_candidates(request)
+    with metrics.timer("match_candidates.build"):
+        return list(rows)
 
 
 @router.post("/match-candidates")
-async def match_candidates(request: MatchCandidateRequest, x_api_key: str = Header(None)):
+async def match_candidates(
+    request: MatchCandidateRequest,
+    x_api_key: str = Header(None),
+    accept: Optional[str] = Header(None),
+    stream: bool = Query(False),   # NDJSON, one result row per line, best first
+):
 
     API_KEY = os.getenv("PARSER_API_KEY")
     if API_KEY and x_api_key != API_KEY:
         raise HTTPException(status_code=401, detail="Unauthorized")
 
-    if not request.jobs or not request.jobseekers:
+    if request.jobs == [] or request.jobseekers == [] or request.jobIds == [] or request.seekerIds == []:
         raise HTTPException(status_code=400, detail="Jobs and Jobseekers cannot be empty.")
-
-    results = []
-
-    # Pre-encode all resume embeddings
-    seeker_embeddings = {
-        seeker.seekerId: model.encode(seeker.resumeText, convert_to_tensor=True)
-        for seeker in request.jobseekers
-    }
-
-    for job in request.jobs:
-        job_embedding = model.encode(job.text, convert_to_tensor=True)
-
-        for seeker in request.jobseekers:
-            seeker_emb = seeker_embeddings.get(seeker.seekerId)
-            if seeker_emb is None:
-                continue
-
-            similarity = util.cos_sim(job_embedding, seeker_emb).item()
-            match_percentage = round(float(similarity) * 100, 2)
-
-            # Keep matches above threshold
-            if match_percentage >= 20:
-                results.append({
-                    "jobId": job.jobId,
-                    "seekerId": seeker.seekerId,
-                    "matchPercentage": match_percentage
-                })
-
-    # Sort by match score
-    results.sort(key=lambda x: x["matchPercentage"], reverse=True)
-    return results
-
+    if request.mode not in MODES:
+        raise HTTPException(status_code=400, detail=f"mode must be one of: {', '.join(MODES)}")
+    if request.k is None and request.mode in ("top_k_per_job", "global_top_k"):
+        raise HTTPException(status_code=400, detail=f"k is required for mode {request.mode}")
+    if request.k is not None and request.k <= 0:
+        raise HTTPException(status_code=400, detail="k must be positive")
+    if request.jobs is not None and (request.jobIds is not None or request.jobFilters):
+        raise HTTPException(status_code=400, detail="jobIds / jobFilters apply to registered jobs, not inline jobs")
+    if request.jobseekers is not None and (request.seekerIds is not None or request.seekerFilters):
+        raise HTTPException(status_code=400, detail="seekerIds / seekerFilters apply to registered jobseekers, not inline jobseekers")
+
+    async with limit("match-candidates"):
+        if responses.wants_stream(stream, accept):
+            # ranked up front, rows serialized as the client reads them
+            return responses.ndjson_response(await run_in_thread(_ranked_candidates, request))
+        # plain dicts of str/float: skip FastAPI's per-item jsonable_encoder pass
+        return responses.DefaultJSONResponse(await run_in_thread(_match_candidates, request))
@@ -1,13 +1,14 @@
-from fastapi import APIRouter, Header, HTTPException
+from fastapi import APIRouter, Header, HTTPException, Query
 from pydantic import BaseModel
-from typing import List
+from typing import Any, Dict, List, Optional
 import os
-from sentence_transformers import SentenceTransformer, util
 
-router = APIRouter()
+from app.scoring import MATCH_THRESHOLD, iter_matches, rank_matches
+from app.services import catalog, metrics, responses
+from app.services.embeddings import embed, embed_queries_async
+from app.services.executor import limit, run_in_thread
 
-# Load BERT once globally
-model = SentenceTransformer("sentence-transformers/all-mpnet-base-v2")
+router = APIRouter()
 
 # Pydantic models
 class JobItem(BaseModel):
@@ -16,39 +17,102 @@ class JobItem(BaseModel):
     title: str
 
 class MatchRequest(BaseModel):
-    resumeText: str
-    jobs: List[JobItem]
+    resumeText: Optional[str] = None
+    seekerId: Optional[str] = None     # registered jobseeker instead of resumeText
+    jobs: Optional[List[JobItem]] = None
+    jobIds: Optional[List[str]] = None # registered jobs; no jobs / jobIds = all active registered jobs
+    filters: Optional[Dict[str, Any]] = None  # on registered job attributes, list value = any of
+    top_k: Optional[int] = None        # only return the k best jobs (ANN retrieval when matching all active registered jobs)
+    min_score: Optional[float] = None  # minimum matchPercentage, defaults to MATCH_THRESHOLD
 
-# API endpoint
-@router.post("/match-jobs")
-async def smart_match_jobs(request: MatchRequest, x_api_key: str = Header(None)):
-    API_KEY = os.getenv("PARSER_API_KEY")
-    if API_KEY and x_api_key != API_KEY:
-        raise HTTPException(status_code=401, detail="Unauthorized")
 
-    if not request.jobs:
-        return []
+def _match_registered_jobs(request: MatchRequest, resume_embedding, min_score: float):
+    if request.top_k is not None and request.jobIds is None and not request.filters:
+        # whole active catalog: approximate top-k from its IVF index; the raw
+        # cut-off is a little lower so rounding matches the exact threshold
+        with metrics.timer("match_jobs.ann_search"):
+            job_ids, similarities = catalog.jobs.nearest(
+                catalog.JOB_LISTING, resume_embedding, request.top_k, (min_score - 0.005) / 100)
+        if not job_ids and not catalog.jobs.has_active():
+            raise HTTPException(status_code=404, detail="No active registered jobs")
+        with metrics.timer("match_jobs.score"):
+            ranked = rank_matches(similarities, min_score, request.top_k)
+        return iter_matches(ranked, job_ids, "jobId")
+
+    with metrics.timer("match_jobs.select"):
+        selection = catalog.jobs.select(catalog.JOB_LISTING, request.jobIds, request.filters)
+    if not selection.ids:
+        # same as /match-candidates: an empty registered side is an error, not an empty match
+        raise HTTPException(status_code=404,
+                            detail="No registered jobs match filters" if request.filters else "No active registered jobs")
+    with metrics.timer("match_jobs.score"):
+        # already encoded: one (blockwise dequantized) matrix-vector product
+        ranked = rank_matches(selection.vectors @ resume_embedding, min_score, request.top_k)
+    return iter_matches(ranked, selection.ids, "jobId")
 
-    resume_embedding = model.encode(request.resumeText, convert_to_tensor=True)
-    results = []
+def _registered_resume(seeker_id: str):
+    return catalog.jobseekers.select(catalog.SEEKER_RESUME, [seeker_id]).vectors.to_float()[0]
 
-    for job in request.jobs:
-        job_text = f"{job.title}. {job.text}"  # title + all job info
-        job_embedding = model.encode(job_text, convert_to_tensor=True)
+def _ranked_jobs(request: MatchRequest, resume_embedding, min_score: float):
+    """
+    Scores and ranks the jobs now; returns an iterator that only builds the
+    result dicts, so a streamed response starts with the ranking done.
+    """
+    if request.jobs is None:
+        return _match_registered_jobs(request, resume_embedding, min_score)
 
-        similarity = util.cos_sim(resume_embedding, job_embedding).item()
-        match_percentage = round(float(similarity) * 100, 2)
+    job_texts = [f"{job.title}. {job.text}" for job in request.jobs]  # title + all job info
 
-        # Keep only matches >=50%
-        if match_percentage >= 20:
-            results.append({
-                "jobId": job.jobId,
-                "matchPercentage": match_percentage
-            })
+    with metrics.timer("match_jobs.embed_jobs"):
+        job_embeddings = embed(job_texts)
+
+    with metrics.timer("match_jobs.score"):
+        # embeddings are normalized -> dot product == cosine similarity;
+        # keep matches >= min_score (20% by default), best first; an inline
+        # list is scored exactly, top_k only trims the result
+        ranked = rank_matches(job_embeddings @ resume_embedding, min_score, request.top_k)
+    return iter_matches(ranked, [job.jobId for job in request.jobs], "jobId")
+
+def _match_jobs(request: MatchRequest, resume_embedding, min_score: float):
+    return list(_ranked_jobs(request, resume_embedding, min_score))
+
+# API endpoint
+@router.post("/match-jobs")
+async def smart_match_jobs(
+    request: MatchRequest,
+    x_api_key: str = Header(None),
+    accept: Optional[str] = Header(None),
+    stream: bool = Query(False),   # NDJSON, one {jobId, matchPercentage} per line, best first
+):
+    API_KEY = os.getenv("PARSER_API_KEY")
+    if API_KEY and x_api_key != API_KEY:
+        raise HTTPException(status_code=401, detail="Unauthorized")
 
-    # Sort top matches
-    results.sort(key=lambda x: x["matchPercentage"], reverse=True)
+    if (request.resumeText is None) == (request.seekerId is None):
+        raise HTTPException(status_code=400, detail="Provide exactly one of resumeText or seekerId")
+    if request.jobs is not None and (request.jobIds is not None or request.filters):
+        raise HTTPException(status_code=400, detail="jobIds / filters apply to registered jobs, not inline jobs")
+    streaming = responses.wants_stream(stream, accept)
+    if request.jobs == [] or request.jobIds == []:
+        return responses.ndjson_response([]) if streaming else []
 
-    # Optional: return only top 10 matches
-    return results
+    if request.top_k is not None and request.top_k <= 0:
+        raise HTTPException(status_code=400, detail="top_k must be positive")
+    min_score = MATCH_THRESHOLD if request.min_score is None else request.min_score
 
+    async with limit("match-jobs"):
+        try:
+            if request.seekerId is not None:
+                resume_embedding = await run_in_thread(_registered_resume, request.seekerId)
+            else:
+                # resume encodes from concurrent jobseekers share one batched encode
+                with metrics.timer("match_jobs.embed_resume"):
+                    resume_embedding = (await embed_queries_async([request.resumeText]))[0]
+            # job encode + scoring run on the worker thread pool, not the event loop
+            if streaming:
+                rows = await run_in_thread(_ranked_jobs, request, resume_embedding, min_score)
+                return responses.ndjson_response(rows)
+            # plain dicts of str/float: skip FastAPI's per-item jsonable_encoder pass
+            return responses.DefaultJSONResponse(await run_in_thread(_match_jobs, request, resume_embedding, min_score))
+        except catalog.UnknownDocumentError as e:
+            raise HTTPException(status_code=404, detail=str(e))
@@ -1,8 +1,9 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query
 from pydantic import BaseModel
 from typing import List, Optional
-import asyncio
-from app.services.parse_resume import parse_resume_text
+from app.services.executor import limit, run_in_process
+from app.services.parse_cache import parse_cache, text_key
+from app.services.parse_resume import PARSE_CACHE_VERSION, parse_resume_text, resolve_fields
 
 router = APIRouter()
 
@@ -11,10 +12,25 @@ class RawTextInput(BaseModel):
     links: Optional[List[str]] = []
 
 @router.post("/parse")
-def parse_resume(data: RawTextInput):
+async def parse_resume(
+    data: RawTextInput,
+    fields: Optional[str] = Query(None, description="comma-separated subset, e.g. emails,phones,skills"),
+):
     if not data.raw_text:
         raise HTTPException(status_code=400, detail="No resume text provided")
+    try:
+        selected = resolve_fields(fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
-    result = parse_resume_text(data)
-    return result
+    cache_key = text_key(data.raw_text, data.links, PARSE_CACHE_VERSION, selected)
+    result = parse_cache.get(cache_key)
+    if result is not None:
+        return result
 
+    # pure-Python parser holds the GIL -> process pool
+    async with limit("resume-parse"):
+        result = await run_in_process(parse_resume_text, data.raw_text, data.links, selected)
+    if result.get("status") == "success":
+        parse_cache.put(cache_key, result)
+    return result
@@ -0,0 +1,32 @@
+from fastapi import APIRouter, Header, HTTPException
+from fastapi.responses import FileResponse
+
+from app.services import profiling
+
+router = APIRouter()
+
+
+def _check_key(x_api_key: str) -> None:
+    if not profiling.authorized(x_api_key):
+        raise HTTPException(status_code=401, detail="Unauthorized")
+
+
+@router.get("/profiles/{profile_id}")
+def profile_summary(profile_id: str, x_api_key: str = Header(None)):
+    """Top functions by cumulative time, peak traced memory and retained allocations."""
+    _check_key(x_api_key)
+    summary = profiling.load_summary(profile_id)
+    if summary is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return summary
+
+
+@router.get("/profiles/{profile_id}/pstats")
+def profile_pstats(profile_id: str, x_api_key: str = Header(None)):
+    """Merged cProfile stats (`python -m pstats file` / snakeviz)."""
+    _check_key(x_api_key)
+    path = profiling.pstats_path(profile_id)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return FileResponse(path, media_type="application/octet-stream", filename=f"{profile_id}.prof")
+
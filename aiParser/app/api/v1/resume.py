@@ -1,10 +1,14 @@
 import os
+from typing import Optional
 from dotenv import load_dotenv
 
-from fastapi import APIRouter, UploadFile, File, HTTPException, Header
+from fastapi import APIRouter, UploadFile, File, HTTPException, Header, Query
 from fastapi.responses import JSONResponse
-from app.services.resumeText import get_resume_text
-from app.services.parse_resume import parse_resume_text
+from app.services.resumeText import PdfLimitError, extract_text_and_links_async, read_upload
+from app.services.parse_resume import PARSE_CACHE_VERSION, parse_resume_text, resolve_fields
+from app.services.parse_cache import bytes_key, parse_cache
+from app.services import metrics
+from app.services.executor import limit, run_in_process
 import traceback
 import logging
 
@@ -17,28 +21,50 @@ API_KEY = os.getenv("API_KEY")
 @router.post("/upload")
 async def upload_resume(
     file: UploadFile = File(...),
-    x_api_key: str = Header(None)
+    x_api_key: str = Header(None),
+    fields: Optional[str] = Query(None, description="comma-separated subset, e.g. emails,phones,skills"),
 ):
     # 🔐 Validate API key
     if x_api_key != API_KEY:  # replace with env config later
         raise HTTPException(status_code=401, detail="Unauthorized")
+    try:
+        selected = resolve_fields(fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
     try:
-        # get both text + links from parser service
-        resume_data = await get_resume_text(file)
+        with metrics.timer("upload.read"):
+            contents = await read_upload(file)
+    except PdfLimitError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+
+    # same file uploaded again -> skip extraction and parsing entirely
+    cache_key = bytes_key(contents, PARSE_CACHE_VERSION, selected)
+    parsed = parse_cache.get(cache_key)
+    if parsed is not None:
+        return JSONResponse(content={"status": "success", "data": parsed})
 
-        text = resume_data.get("text", "")
-        links = resume_data.get("links", [])
-        parsed = parse_resume_text(text, links)
+    async with limit("resume-upload"):
+        try:
+            # get both text + links (thread pool; long PDFs split across processes)
+            resume_data = await extract_text_and_links_async(contents)
 
+            text = resume_data.get("text", "")
+            links = resume_data.get("links", [])
+            parsed = await run_in_process(parse_resume_text, text, links, selected)
 
-        return JSONResponse(content={
-            "status": "success",
-            "data": parsed
-        })
+            if parsed.get("status") == "success":
+                parse_cache.put(cache_key, parsed)
 
-    except Exception as e:
-        tb = traceback.format_exc()
-        logger.error(f"Resume parsing failed: {e}\n{tb}")
-        raise HTTPException(status_code=500, detail=f"Resume parsing failed: {str(e)}")
+            with metrics.timer("upload.serialize"):
+                return JSONResponse(content={
+                    "status": "success",
+                    "data": parsed
+                })
 
+        except PdfLimitError as e:
+            raise HTTPException(status_code=413, detail=str(e))
+        except Exception as e:
+            tb = traceback.format_exc()
+            logger.error(f"Resume parsing failed: {e}\n{tb}")
+            raise HTTPException(status_code=500, detail=f"Resume parsing failed: {str(e)}")
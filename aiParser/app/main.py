@@ -1,23 +1,84 @@
+import os
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.responses import JSONResponse, Response
 from app.api.v1 import resume
 from app.api.v1 import parse_resume
+from app.api.v1 import bulk_resume
 from app.api.v1 import match_jobs  
 from app.api.v1 import match_candidates
+from app.api.v1 import catalog
+from app.api.v1 import profiles
+from app.services import embeddings, executor, metrics, model_registry, profiling, responses
 
 
-app = FastAPI(title="AI Resume Parser API", version="1.0")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # MODEL_WARMUP: lazy (load on first request) | background | eager (block startup)
+    # the parse pool is started with the models, not by the first parse request
+    if model_registry.MODEL_WARMUP == "eager":
+        model_registry.warm_up()
+        executor.start_process_pool(wait=True)
+    elif model_registry.MODEL_WARMUP == "background":
+        model_registry.warm_up(background=True)
+        executor.start_process_pool()
+    try:
+        yield
+    finally:
+        await embeddings.batcher.close()
+        executor.shutdown()
+
+
+# orjson for every JSON response when installed (falls back to the stdlib encoder)
+app = FastAPI(title="AI Resume Parser API", version="1.0", default_response_class=responses.DefaultJSONResponse,
+              lifespan=lifespan)
+
+# request latency histograms (+ Server-Timing header when SERVER_TIMING=1)
+if metrics.METRICS_ENABLED:
+    app.middleware("http")(metrics.metrics_middleware)
+
+# PROFILING_ENABLED=1: X-Profile: 1 (or ?profile=1) + a valid X-API-Key profiles
+# that one request; results under PROFILE_DIR and /debug/profiles/<id>
+if profiling.PROFILING_ENABLED:
+    app.middleware("http")(profiling.profiling_middleware)
 
 # include routers
 app.include_router(resume.router, prefix="/api/v1/resume", tags=["Resume"])
 app.include_router(parse_resume.router, prefix="/api/v1/resume", tags=["Resume"])
+app.include_router(bulk_resume.router, prefix="/api/v1/resume", tags=["Resume"])
 app.include_router(match_jobs.router, prefix="/api/v1", tags=["Matching"])
 app.include_router(match_candidates.router, prefix="/api/v1", tags=["Candidate Matching"])
+app.include_router(catalog.router, prefix="/api/v1/catalog", tags=["Catalog"])
+if profiling.PROFILING_ENABLED:
+    app.include_router(profiles.router, prefix="/debug", tags=["Debug"])
+
+# Fork-friendly preload: with `gunicorn --preload` this runs once in the master,
+# and every worker shares the loaded weights copy-on-write.
+if os.getenv("MODEL_PRELOAD") == "1":
+    model_registry.preload()
 
 
 @app.get("/")
 def root():
     return {"message": "Python FastAPI backend is working with pro structure!"}
 
-# uvicorn app.main:app --host 0.0.0.0 --port 9000 --reload
 
+@app.get("/ready")
+def ready():
+    # the parse pool workers load NER / spaCy themselves
+    ok = model_registry.is_ready() and executor.process_pool_ready()
+    workers = {"ready": executor.parse_workers_ready(), "total": max(executor.EXECUTOR_PROCESSES, 0)}
+    return JSONResponse(
+        status_code=200 if ok else 503,
+        content={"ready": ok, "models": model_registry.status(), "parse_workers": workers},
+    )
 
+# METRICS_ENDPOINT=1 (internal deployments only): Prometheus scrape endpoint
+if metrics.METRICS_ENABLED and metrics.METRICS_ENDPOINT:
+    @app.get("/metrics", include_in_schema=False)
+    def prometheus_metrics():
+        return Response(content=metrics.render(), media_type=metrics.CONTENT_TYPE)
+
+# uvicorn app.main:app --host 0.0.0.0 --port 9000 --reload
+# multi-worker, shared weights:
+# MODEL_PRELOAD=1 gunicorn app.main:app --preload -w 4 -k uvicorn.workers.UvicornWorker -b 0.0.0.0:9000
@@ -0,0 +1,246 @@
+# app/scoring.py
+# Vectorized similarity scoring shared by the matching routers.
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+import os
+
+import numpy as np
+
+from app.services.compact_vectors import similarity
+
+# Matches below this percentage are dropped
+MATCH_THRESHOLD = float(os.getenv("MATCH_THRESHOLD", "20"))
+
+# Batch size handed to SentenceTransformer.encode
+ENCODE_BATCH_SIZE = int(os.getenv("ENCODE_BATCH_SIZE", "32"))
+
+# rows of the left-hand matrix scored per block in `ranked_pairs_blockwise`
+SCORE_BLOCK_ROWS = int(os.getenv("SCORE_BLOCK_ROWS", "256"))
+
+# materialize result dicts this many rows at a time when iterating lazily
+_ROW_BATCH = 1024
+
+
+def normalize_rows(x: np.ndarray) -> np.ndarray:
+    x = np.asarray(x, dtype=np.float32)
+    if x.ndim == 1:
+        x = x[None, :]
+    norms = np.linalg.norm(x, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return x / norms
+
+
+def cosine_matrix(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Full (len(a), len(b)) cosine similarity matrix as one matrix multiply."""
+    return normalize_rows(a) @ normalize_rows(b).T
+
+
+def to_percentages(similarity: np.ndarray) -> np.ndarray:
+    return np.round(similarity.astype(np.float64) * 100, 2)
+
+
+def threshold_pairs(
+    scores: np.ndarray,
+    row_ids: Sequence[str],
+    col_ids: Sequence[str],
+    row_key: str,
+    col_key: str,
+    threshold: float = MATCH_THRESHOLD,
+) -> List[Dict[str, Any]]:
+    """
+    Turn a percentage matrix into `[{row_key, col_key, matchPercentage}]` rows
+    with score >= threshold, best first. Ties keep row-major order.
+    """
+    rows, cols = np.nonzero(scores >= threshold)
+    if rows.size == 0:
+        return []
+    kept = scores[rows, cols]
+    order = np.argsort(-kept, kind="stable")
+    return [
+        {row_key: row_ids[r], col_key: col_ids[c], "matchPercentage": float(s)}
+        for r, c, s in zip(rows[order].tolist(), cols[order].tolist(), kept[order].tolist())
+    ]
+
+
+def ranked_pairs_blockwise(
+    a: np.ndarray,
+    b: np.ndarray,
+    threshold: float = MATCH_THRESHOLD,
+    block_rows: int = SCORE_BLOCK_ROWS,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    `(rows, cols, percentages)` of every pair of `a @ b.T` >= threshold, best
+    first, ties in row-major order (same order as `threshold_pairs`). Scored
+    `block_rows` rows at a time, so only the surviving pairs are ever held,
+    never the full matrix. Either side may be a compact `VectorBlock`.
+    """
+    rows, cols, kept = [], [], []
+    for start in range(0, len(a), block_rows):
+        scores = to_percentages(similarity(a[start:start + block_rows], b))
+        r, c = np.nonzero(scores >= threshold)
+        rows.append(r + start)
+        cols.append(c)
+        kept.append(scores[r, c])
+    if not rows:
+        empty = np.zeros(0, dtype=np.int64)
+        return empty, empty, np.zeros(0, dtype=np.float64)
+    rows, cols, kept = np.concatenate(rows), np.concatenate(cols), np.concatenate(kept)
+    order = np.argsort(-kept, kind="stable")
+    return rows[order], cols[order], kept[order]
+
+
+def iter_pairs(
+    ranked: Tuple[np.ndarray, np.ndarray, np.ndarray],
+    row_ids: Sequence[str],
+    col_ids: Sequence[str],
+    row_key: str,
+    col_key: str,
+) -> Iterator[Dict[str, Any]]:
+    """Result dicts for `ranked_pairs_blockwise` output, built lazily in order."""
+    rows, cols, kept = ranked
+    for start in range(0, rows.size, _ROW_BATCH):
+        stop = start + _ROW_BATCH
+        for r, c, s in zip(rows[start:stop].tolist(), cols[start:stop].tolist(), kept[start:stop].tolist()):
+            yield {row_key: row_ids[r], col_key: col_ids[c], "matchPercentage": s}
+
+
+def top_k_indices(values: np.ndarray, k: int) -> np.ndarray:
+    """
+    Ascending indices of the k largest `values` (1-D), lower index first on
+    ties, i.e. the same set a stable descending sort would keep. O(n).
+    """
+    if values.size <= k:
+        return np.arange(values.size)
+    kth = np.partition(values, values.size - k)[values.size - k]
+    above = np.nonzero(values > kth)[0]
+    ties = np.nonzero(values == kth)[0][: k - above.size]
+    return np.sort(np.concatenate([above, ties]))
+
+
+def rank_matches(
+    similarities: np.ndarray,
+    threshold: float = MATCH_THRESHOLD,
+    k: Optional[int] = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    `(indices, percentages)` of one query's similarity vector: scores >=
+    threshold, best first, ties in index order, at most `k` (partial
+    selection, no full sort).
+    """
+    scores = to_percentages(np.asarray(similarities).reshape(-1))
+    keep = np.nonzero(scores >= threshold)[0]
+    if k is not None and keep.size > k:
+        keep = keep[top_k_indices(scores[keep], k)]
+    order = keep[np.argsort(-scores[keep], kind="stable")]
+    return order, scores[order]
+
+
+def iter_matches(
+    ranked: Tuple[np.ndarray, np.ndarray],
+    ids: Sequence[str],
+    id_key: str,
+) -> Iterator[Dict[str, Any]]:
+    """`{id_key, matchPercentage}` dicts for `rank_matches` output, built lazily in order."""
+    order, scores = ranked
+    for start in range(0, order.size, _ROW_BATCH):
+        stop = start + _ROW_BATCH
+        for i, s in zip(order[start:stop].tolist(), scores[start:stop].tolist()):
+            yield {id_key: ids[i], "matchPercentage": s}
+
+
+def ranked_matches(
+    similarities: np.ndarray,
+    ids: Sequence[str],
+    id_key: str,
+    threshold: float = MATCH_THRESHOLD,
+    k: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    return list(iter_matches(rank_matches(similarities, threshold, k), ids, id_key))
+
+
+def top_k_per_row(
+    scores: np.ndarray,
+    row_ids: Sequence[str],
+    col_ids: Sequence[str],
+    row_key: str,
+    col_key: str,
+    k: int,
+    group_key: str = "matches",
+    threshold: float = MATCH_THRESHOLD,
+) -> List[Dict[str, Any]]:
+    """
+    `[{row_key, group_key: [{col_key, matchPercentage}]}]`: each row's k best
+    columns (>= threshold), best first. Partial selection per row, so the
+    work after the matmul is O(rows * cols) + O(rows * k log k).
+    """
+    n_cols = scores.shape[1]
+    k = min(k, n_cols)
+    if k <= 0:
+        return []
+    if k < n_cols:
+        # per row: everything above the k-th score, then ties in column order
+        kth = np.partition(scores, n_cols - k, axis=1)[:, n_cols - k][:, None]
+        above = scores > kth
+        ties = scores == kth
+        room = k - above.sum(axis=1, keepdims=True)
+        keep = above | (ties & (np.cumsum(ties, axis=1) <= room))
+        top = np.nonzero(keep)[1].reshape(-1, k)
+    else:
+        top = np.broadcast_to(np.arange(n_cols), scores.shape)
+    top_scores = np.take_along_axis(scores, top, axis=1)
+    order = np.argsort(-top_scores, axis=1, kind="stable")
+    top = np.take_along_axis(top, order, axis=1)
+    top_scores = np.take_along_axis(top_scores, order, axis=1)
+
+    out = []
+    for r, (cols, vals) in enumerate(zip(top.tolist(), top_scores.tolist())):
+        matches = [{col_key: col_ids[c], "matchPercentage": v} for c, v in zip(cols, vals) if v >= threshold]
+        if matches:
+            out.append({row_key: row_ids[r], group_key: matches})
+    return out
+
+
+def best_per_column(
+    scores: np.ndarray,
+    row_ids: Sequence[str],
+    col_ids: Sequence[str],
+    row_key: str,
+    col_key: str,
+    k: Optional[int] = None,
+    threshold: float = MATCH_THRESHOLD,
+) -> List[Dict[str, Any]]:
+    """
+    `[{col_key, row_key, matchPercentage}]`: every column's best row (argmax,
+    first row on ties) when >= threshold, best first, at most `k` columns.
+    """
+    best_rows = np.argmax(scores, axis=0)
+    best = scores[best_rows, np.arange(scores.shape[1])]
+    cols = np.nonzero(best >= threshold)[0]
+    if k is not None and cols.size > k:
+        cols = cols[top_k_indices(best[cols], k)]
+    cols = cols[np.argsort(-best[cols], kind="stable")]
+    return [
+        {col_key: col_ids[c], row_key: row_ids[r], "matchPercentage": s}
+        for c, r, s in zip(cols.tolist(), best_rows[cols].tolist(), best[cols].tolist())
+    ]
+
+
+def global_top_k(
+    scores: np.ndarray,
+    row_ids: Sequence[str],
+    col_ids: Sequence[str],
+    row_key: str,
+    col_key: str,
+    k: int,
+    threshold: float = MATCH_THRESHOLD,
+) -> List[Dict[str, Any]]:
+    """Like `threshold_pairs`, but only the k best pairs of the whole matrix."""
+    flat = scores.ravel()
+    keep = np.nonzero(flat >= threshold)[0]
+    if keep.size > k:
+        keep = keep[top_k_indices(flat[keep], k)]
+    keep = keep[np.argsort(-flat[keep], kind="stable")]
+    rows, cols = np.unravel_index(keep, scores.shape)
+    return [
+        {row_key: row_ids[r], col_key: col_ids[c], "matchPercentage": float(s)}
+        for r, c, s in zip(rows.tolist(), cols.tolist(), flat[keep].tolist())
+    ]
@@ -0,0 +1,237 @@
+# app/services/ann_index.py
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+import os
+import logging
+import threading
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# --------------------------
+# Config
+# --------------------------
+# below this many vectors the index just scans everything (exact)
+ANN_MIN_TRAIN_SIZE = int(os.getenv("ANN_MIN_TRAIN_SIZE", "2048"))
+# inverted lists probed per query; higher = better recall, slower
+ANN_NPROBE = int(os.getenv("ANN_NPROBE", "8"))
+# retrain the coarse quantizer once the index grew this much since last training
+ANN_RETRAIN_GROWTH = float(os.getenv("ANN_RETRAIN_GROWTH", "2.0"))
+ANN_KMEANS_ITERS = 10
+
+
+class IVFIndex:
+    """
+    Inverted-file (IVF) index over L2-normalized vectors, scored by inner product.
+
+    Vectors are bucketed under the nearest of ~sqrt(n) k-means centroids; a query
+    only scores the buckets of its `nprobe` closest centroids. Small indexes skip
+    training and are searched exactly. Supports incremental add / update / remove
+    by string id without a rebuild.
+    """
+
+    def __init__(self, nprobe: int = ANN_NPROBE, min_train_size: int = ANN_MIN_TRAIN_SIZE, seed: int = 0):
+        self.nprobe = nprobe
+        self.min_train_size = min_train_size
+        self._rng = np.random.default_rng(seed)
+        self._lock = threading.RLock()
+
+        self.dim: Optional[int] = None
+        self._vectors = np.zeros((0, 0), dtype=np.float32)
+        self._ids: List[Optional[str]] = []      # slot -> id (None = free)
+        self._slot_of: Dict[str, int] = {}       # id -> slot
+        self._free: List[int] = []
+        self._tags: Dict[str, str] = {}          # id -> content key, for cheap "did it change"
+
+        self._centroids: Optional[np.ndarray] = None
+        self._assign = np.zeros(0, dtype=np.int64)   # slot -> list number
+        self._lists: List[set] = []
+        self._list_cache: Dict[int, np.ndarray] = {}
+        self._trained_size = 0
+
+    def __len__(self) -> int:
+        return len(self._slot_of)
+
+    def __contains__(self, item_id: str) -> bool:
+        return item_id in self._slot_of
+
+    def tag(self, item_id: str) -> Optional[str]:
+        return self._tags.get(item_id)
+
+    @property
+    def is_trained(self) -> bool:
+        return self._centroids is not None
+
+    # --------------------------
+    # Mutation
+    # --------------------------
+    def add(self, ids: Sequence[str], vectors: np.ndarray, tags: Optional[Sequence[str]] = None) -> None:
+        """Insert or replace vectors for `ids`."""
+        if not len(ids):
+            return
+        vectors = np.asarray(vectors, dtype=np.float32)
+        # last occurrence wins for duplicated ids
+        last = {item_id: n for n, item_id in enumerate(ids)}
+        if len(last) != len(ids):
+            keep = sorted(last.values())
+            ids = [ids[n] for n in keep]
+            vectors = vectors[keep]
+            tags = [tags[n] for n in keep] if tags is not None else None
+        with self._lock:
+            if self.dim is None:
+                self.dim = int(vectors.shape[1])
+                self._vectors = np.zeros((0, self.dim), dtype=np.float32)
+            self.remove([i for i in ids if i in self._slot_of])
+
+            slots = [self._take_slot() for _ in ids]
+            self._vectors[slots] = vectors
+            for n, (item_id, slot) in enumerate(zip(ids, slots)):
+                self._ids[slot] = item_id
+                self._slot_of[item_id] = slot
+                if tags is not None:
+                    self._tags[item_id] = tags[n]
+
+            if self._centroids is None:
+                if len(self) >= self.min_train_size:
+                    self._train()
+            elif len(self) >= self._trained_size * ANN_RETRAIN_GROWTH:
+                self._train()
+            else:
+                self._bucket(np.asarray(slots, dtype=np.int64))
+
+    def remove(self, ids: Iterable[str]) -> None:
+        with self._lock:
+            for item_id in ids:
+                slot = self._slot_of.pop(item_id, None)
+                if slot is None:
+                    continue
+                self._tags.pop(item_id, None)
+                self._ids[slot] = None
+                self._free.append(slot)
+                if self._centroids is not None:
+                    lst = int(self._assign[slot])
+                    self._lists[lst].discard(slot)
+                    self._list_cache.pop(lst, None)
+
+    def _take_slot(self) -> int:
+        if self._free:
+            return self._free.pop()
+        slot = len(self._ids)
+        if slot >= self._vectors.shape[0]:
+            grow = max(64, self._vectors.shape[0])
+            self._vectors = np.vstack([self._vectors, np.zeros((grow, self.dim), dtype=np.float32)])
+            self._assign = np.concatenate([self._assign, np.zeros(grow, dtype=np.int64)])
+        self._ids.append(None)
+        return slot
+
+    # --------------------------
+    # Coarse quantizer
+    # --------------------------
+    def _live_slots(self) -> np.ndarray:
+        return np.fromiter(self._slot_of.values(), dtype=np.int64, count=len(self._slot_of))
+
+    def _train(self) -> None:
+        slots = self._live_slots()
+        data = self._vectors[slots]
+        nlist = max(1, int(np.sqrt(len(slots))))
+        centroids = data[self._rng.choice(len(slots), size=nlist, replace=False)].copy()
+
+        for _ in range(ANN_KMEANS_ITERS):
+            assign = np.argmax(data @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assign, data)
+            counts = np.bincount(assign, minlength=nlist)
+            empty = counts == 0
+            if empty.any():
+                # re-seed dead centroids from random points
+                sums[empty] = data[self._rng.choice(len(slots), size=int(empty.sum()))]
+            norms = np.linalg.norm(sums, axis=1, keepdims=True)
+            norms[norms == 0] = 1.0
+            centroids = sums / norms
+
+        self._centroids = centroids.astype(np.float32)
+        self._lists = [set() for _ in range(nlist)]
+        self._list_cache = {}
+        self._trained_size = len(slots)
+        self._bucket(slots)
+        logger.info("IVF index trained: %d vectors, %d lists", len(slots), nlist)
+
+    def _bucket(self, slots: np.ndarray) -> None:
+        if not slots.size:
+            return
+        assign = np.argmax(self._vectors[slots] @ self._centroids.T, axis=1)
+        self._assign[slots] = assign
+        for slot, lst in zip(slots.tolist(), assign.tolist()):
+            self._lists[lst].add(slot)
+            self._list_cache.pop(lst, None)
+
+    def _list_slots(self, lst: int) -> np.ndarray:
+        arr = self._list_cache.get(lst)
+        if arr is None:
+            arr = np.fromiter(self._lists[lst], dtype=np.int64, count=len(self._lists[lst]))
+            self._list_cache[lst] = arr
+        return arr
+
+    # --------------------------
+    # Search
+    # --------------------------
+    def _candidates(self, query: np.ndarray, exact: bool) -> np.ndarray:
+        if exact or self._centroids is None:
+            return self._live_slots()
+        nprobe = min(self.nprobe, len(self._lists))
+        centroid_scores = self._centroids @ query
+        probe = np.argpartition(-centroid_scores, nprobe - 1)[:nprobe]
+        parts = [self._list_slots(int(lst)) for lst in probe]
+        return np.concatenate(parts) if parts else np.zeros(0, dtype=np.int64)
+
+    def search(
+        self,
+        query: np.ndarray,
+        k: int,
+        min_score: Optional[float] = None,
+        exact: bool = False,
+    ) -> List[Tuple[str, float]]:
+        """Top-k `(id, score)` by inner product, best first. `min_score` is a raw similarity."""
+        query = np.asarray(query, dtype=np.float32).reshape(-1)
+        with self._lock:
+            if not len(self) or k <= 0:
+                return []
+            slots = self._candidates(query, exact)
+            if not slots.size:
+                return []
+            scores = self._vectors[slots] @ query
+            if min_score is not None:
+                keep = scores >= min_score
+                slots, scores = slots[keep], scores[keep]
+            if scores.size > k:
+                top = np.argpartition(-scores, k - 1)[:k]
+                slots, scores = slots[top], scores[top]
+            order = np.argsort(-scores, kind="stable")
+            return [(self._ids[s], float(v)) for s, v in zip(slots[order].tolist(), scores[order].tolist())]
+
+    def recall(self, queries: np.ndarray, k: int) -> float:
+        """Mean recall@k of the approximate search against an exact scan."""
+        queries = np.asarray(queries, dtype=np.float32)
+        if queries.ndim == 1:
+            queries = queries[None, :]
+        hits = 0
+        total = 0
+        for q in queries:
+            truth = {i for i, _ in self.search(q, k, exact=True)}
+            found = {i for i, _ in self.search(q, k)}
+            hits += len(truth & found)
+            total += len(truth)
+        return hits / total if total else 1.0
+
+    def sync(self, ids: Sequence[str], tags: Sequence[str], vectors_for) -> None:
+        """
+        Make the index hold exactly `ids`: add ids that are new or whose tag
+        (content key) changed, drop ids no longer present. `vectors_for(positions)`
+        is only called for the positions that need (re)inserting.
+        """
+        with self._lock:
+            wanted = set(ids)
+            self.remove([i for i in list(self._slot_of) if i not in wanted])
+            todo = [n for n, (i, t) in enumerate(zip(ids, tags)) if self._tags.get(i) != t]
+            if todo:
+                self.add([ids[n] for n in todo], vectors_for(todo), [tags[n] for n in todo])
@@ -0,0 +1,156 @@
+# app/services/bulk_ingest.py
+# Bulk resume ingestion: PDFs / text files / zips -> NDJSON parse results.
+#
+#   python -m app.services.bulk_ingest ./cvs --out parsed.ndjson --workers 8
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+import io
+import os
+import sys
+import json
+import time
+import zipfile
+import logging
+import argparse
+import multiprocessing
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from app.services.executor import EXECUTOR_MP_CONTEXT
+from app.services.parse_resume import parse_resume_text
+from app.services.resumeText import MAX_PDF_BYTES, extract_text_and_links
+
+logger = logging.getLogger(__name__)
+
+SUPPORTED_EXTENSIONS = (".pdf", ".txt")
+# zip bombs: stop expanding an archive after this many members
+MAX_ZIP_MEMBERS = int(os.getenv("MAX_ZIP_MEMBERS", "50000"))
+
+
+def is_supported(name: str) -> bool:
+    return name.lower().endswith(SUPPORTED_EXTENSIONS)
+
+
+def iter_zip_members(data: bytes) -> Iterator[Tuple[str, bytes]]:
+    with zipfile.ZipFile(io.BytesIO(data)) as zf:
+        count = 0
+        for info in zf.infolist():
+            if info.is_dir() or not is_supported(info.filename):
+                continue
+            count += 1
+            if count > MAX_ZIP_MEMBERS:
+                break
+            if info.file_size > MAX_PDF_BYTES:
+                yield info.filename, b""  # reported as an error by parse_document
+                continue
+            yield info.filename, zf.read(info)
+
+
+def parse_document(name: str, contents: bytes) -> Dict[str, Any]:
+    """Extract + parse one document. Never raises: errors become result rows."""
+    try:
+        if not is_supported(name):
+            raise ValueError("unsupported file type")
+        if not contents:
+            raise ValueError("empty or oversized file")
+        if name.lower().endswith(".txt"):
+            text, links = contents.decode("utf-8", errors="replace"), []
+        else:
+            # already inside a pool worker -> no nested per-page pool
+            resume_data = extract_text_and_links(contents)
+            text, links = resume_data.get("text", ""), resume_data.get("links", [])
+        parsed = parse_resume_text(text, links)
+        if parsed.get("status") != "success":
+            return {"file": name, "status": "error", "error": parsed.get("message", "parse failed")}
+        return {"file": name, "status": "success", "data": parsed}
+    except Exception as e:
+        return {"file": name, "status": "error", "error": str(e)}
+
+
+def _read_path(path: str) -> Tuple[str, bytes]:
+    with open(path, "rb") as f:
+        return path, f.read()
+
+
+def iter_directory(root: str) -> Iterator[Tuple[str, bytes]]:
+    for dirpath, _, files in os.walk(root):
+        for name in sorted(files):
+            path = os.path.join(dirpath, name)
+            if name.lower().endswith(".zip"):
+                with open(path, "rb") as f:
+                    for member, data in iter_zip_members(f.read()):
+                        yield f"{path}!{member}", data
+            elif is_supported(name):
+                yield _read_path(path)
+
+
+def ingest(
+    documents: Iterable[Tuple[str, bytes]],
+    workers: int,
+    on_result: Callable[[Dict[str, Any]], None],
+) -> Dict[str, Any]:
+    """
+    Parse `documents` on a process pool, calling `on_result` as each finishes
+    (completion order). At most 2 * workers documents are in flight, so
+    memory stays flat however many files the source yields.
+    """
+    ctx = multiprocessing.get_context(EXECUTOR_MP_CONTEXT)
+    started = time.perf_counter()
+    done = errors = 0
+    max_in_flight = max(1, 2 * workers)
+
+    with ProcessPoolExecutor(max_workers=workers, mp_context=ctx) as pool:
+        in_flight = set()
+        for name, data in documents:
+            in_flight.add(pool.submit(parse_document, name, data))
+            if len(in_flight) >= max_in_flight:
+                finished, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                for fut in finished:
+                    result = fut.result()
+                    done += 1
+                    errors += result["status"] != "success"
+                    on_result(result)
+        for fut in wait(in_flight).done:
+            result = fut.result()
+            done += 1
+            errors += result["status"] != "success"
+            on_result(result)
+
+    return summarize(done, errors, time.perf_counter() - started)
+
+
+def summarize(done: int, errors: int, seconds: float) -> Dict[str, Any]:
+    return {
+        "documents": done,
+        "errors": errors,
+        "seconds": round(seconds, 3),
+        "docs_per_sec": round(done / seconds, 2) if seconds > 0 else None,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description="Parse a directory of resumes into NDJSON.")
+    ap.add_argument("directory", help="folder with .pdf / .txt files (and .zip archives of them)")
+    ap.add_argument("--out", default="-", help="NDJSON output file (default: stdout)")
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = ap.parse_args(argv)
+
+    out = sys.stdout if args.out == "-" else open(args.out, "w", encoding="utf-8")
+    try:
+        def write(result: Dict[str, Any]) -> None:
+            out.write(json.dumps(result) + "\n")
+            out.flush()
+
+        summary = ingest(iter_directory(args.directory), args.workers, write)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    print(
+        f"{summary['documents']} documents, {summary['errors']} errors in {summary['seconds']}s "
+        f"({summary['docs_per_sec']} docs/s)",
+        file=sys.stderr,
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
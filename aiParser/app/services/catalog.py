@@ -0,0 +1,317 @@
+# app/services/catalog.py
+# Registered jobs and jobseekers, so match requests can reference them by id
+# instead of resending (and re-validating) every document.
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
+import os
+import json
+import uuid
+import logging
+import threading
+
+import numpy as np
+
+from app.services import metrics
+from app.services.ann_index import IVFIndex
+from app.services.compact_vectors import EMBEDDING_DTYPE, VectorBlock
+from app.services.embedding_store import EmbeddingStore, content_key
+from app.services.embeddings import ensure_embedded, store
+
+try:
+    from filelock import FileLock
+except Exception:
+    FileLock = None
+
+logger = logging.getLogger(__name__)
+
+# vectors read from the store (float32) per chunk while building the compact matrix
+_BUILD_CHUNK = 8192
+# the change log is compacted once it holds more records than this and than documents
+_COMPACT_MIN_RECORDS = 1024
+
+# --------------------------
+# Views
+# --------------------------
+# one embedding per view: /match-jobs embeds "title. text", /match-candidates
+# embeds the job text alone, and registered documents must score identically
+JOB_LISTING = "listing"
+JOB_TEXT = "text"
+SEEKER_RESUME = "resume"
+
+
+class UnknownDocumentError(LookupError):
+    """Match request references ids that were never registered (or were deleted)."""
+
+    def __init__(self, kind: str, ids: Sequence[str]):
+        self.kind = kind
+        self.ids = list(ids)
+        shown = ", ".join(self.ids[:10]) + (" ..." if len(self.ids) > 10 else "")
+        super().__init__(f"Unknown {kind}: {shown}")
+
+
+class Selection(NamedTuple):
+    ids: List[str]
+    vectors: VectorBlock  # (len(ids), dim), L2-normalized, EMBEDDING_DTYPE
+
+
+def matches_filters(attributes: Dict[str, Any], filters: Optional[Dict[str, Any]]) -> bool:
+    """
+    Every filter must match. A list filter value means "any of"; a list
+    attribute matches when any of its values does.
+    """
+    if not filters:
+        return True
+    for name, wanted in filters.items():
+        wanted_values = wanted if isinstance(wanted, list) else [wanted]
+        value = attributes.get(name)
+        values = value if isinstance(value, list) else [value]
+        if not any(v in wanted_values for v in values):
+            return False
+    return True
+
+
+class Catalog:
+    """
+    Registered documents of one kind: id -> content key per view, active flag
+    and free-form attributes for filtering.
+
+    Vectors live in the shared `EmbeddingStore` (content-addressed), the
+    catalog only keeps keys, in `catalog-<kind>.jsonl` next to the store. Like
+    the store, writes take a cross-process lock and readers reload when the
+    file changed, so every uvicorn worker sees the same catalog. The vectors
+    of all active documents are kept as one EMBEDDING_DTYPE matrix (float16
+    or int8 to fit a large seeker pool in RAM) until the catalog changes.
+    """
+
+    def __init__(self, kind: str, embedding_store: EmbeddingStore, views: Sequence[str]):
+        self.kind = kind
+        self.views = tuple(views)
+        self.store = embedding_store
+        self._path = os.path.join(embedding_store.path, f"catalog-{kind}.jsonl")
+        self._lock = threading.RLock()
+        self._file_lock = FileLock(self._path + ".lock") if FileLock else None
+
+        self._docs: Dict[str, Dict[str, Any]] = {}
+        self._epoch: Optional[str] = None  # header of the log file we have read
+        self._offset = 0                   # bytes of it applied (complete lines only)
+        self._records = 0                  # change records applied since the last compaction
+        self._version = 0
+        self._active: Dict[str, tuple] = {}   # view -> (version, ids, attributes, matrix, keys)
+        self._indexes: Dict[str, tuple] = {}  # view -> (version, IVFIndex over the active documents)
+        self._load()
+
+    # --------------------------
+    # Persistence
+    # --------------------------
+    # catalog-<kind>.jsonl: an {"kind", "epoch"} header line, then one change
+    # record per line ({"upsert": {id: doc}} or {"delete": [ids]}). Writers
+    # append under the file lock; readers apply the lines past their offset,
+    # so a change is never missed however close together two writes land.
+    # Compaction rewrites the file under a new epoch, which readers reload.
+    def _apply(self, record: Dict[str, Any]) -> None:
+        self._docs.update(record.get("upsert", {}))
+        for i in record.get("delete", ()):
+            self._docs.pop(i, None)
+        self._records += 1
+
+    def _load(self) -> None:
+        try:
+            f = open(self._path, "rb")
+        except OSError:
+            if self._epoch is None and self._version == 0:
+                self._load_legacy()
+            return
+        with f:
+            header = f.readline()
+            if not header.endswith(b"\n"):
+                return  # being created
+            try:
+                epoch = json.loads(header)["epoch"]
+            except Exception:
+                logger.exception("Catalog header unreadable, ignoring: %s", self._path)
+                return
+            changed = epoch != self._epoch
+            if changed:
+                self._docs, self._records = {}, 0
+                self._epoch, self._offset = epoch, len(header)
+            f.seek(self._offset)
+            data = f.read()
+        end = data.rfind(b"\n") + 1  # a torn last line is read next time
+        for line in data[:end].splitlines():
+            if line.strip():
+                self._apply(json.loads(line))
+        self._offset += end
+        if changed or end:
+            self._version += 1
+
+    def _load_legacy(self) -> None:
+        # catalog-<kind>.json (whole-file rewrites) from before the change log;
+        # its documents go into the first compaction
+        legacy = os.path.splitext(self._path)[0] + ".json"
+        if legacy == self._path or not os.path.exists(legacy):
+            return
+        try:
+            with open(legacy, "r", encoding="utf-8") as f:
+                self._docs = json.load(f).get("docs", {})
+        except Exception:
+            logger.exception("Legacy catalog unreadable, starting empty: %s", legacy)
+            return
+        self._version += 1
+        logger.info("Read %d documents from legacy catalog %s", len(self._docs), legacy)
+
+    def _compact(self) -> None:
+        epoch = uuid.uuid4().hex
+        tmp = self._path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(json.dumps({"kind": self.kind, "epoch": epoch}) + "\n")
+            if self._docs:
+                f.write(json.dumps({"upsert": self._docs}) + "\n")
+        os.replace(tmp, self._path)
+        self._epoch, self._offset, self._records = epoch, 0, 0
+        self._load()
+
+    def _mutate(self, record: Dict[str, Any]) -> None:
+        with self._lock:
+            os.makedirs(os.path.dirname(self._path), exist_ok=True)
+            if self._file_lock is not None:
+                self._file_lock.acquire()
+            try:
+                # another worker may have written since we last looked
+                self._load()
+                if self._epoch is None:
+                    self._compact()
+                with open(self._path, "ab") as f:
+                    f.write(json.dumps(record).encode("utf-8") + b"\n")
+                self._load()
+                if self._records > max(_COMPACT_MIN_RECORDS, len(self._docs)):
+                    self._compact()
+            finally:
+                if self._file_lock is not None:
+                    self._file_lock.release()
+
+    # --------------------------
+    # Public API
+    # --------------------------
+    def __len__(self) -> int:
+        with self._lock:
+            self._load()
+            return len(self._docs)
+
+    def has_active(self) -> bool:
+        with self._lock:
+            self._load()
+            return any(doc["active"] for doc in self._docs.values())
+
+    def upsert(self, docs: List[Dict[str, Any]]) -> int:
+        """
+        Register or replace `{"id", "texts": {view: text}, "active", "attributes"}`
+        documents. Texts are encoded here (only those not in the store yet);
+        returns the number of documents written.
+        """
+        if not docs:
+            return 0
+        texts = [doc["texts"][view] for doc in docs for view in self.views]
+        with metrics.timer(f"catalog.{self.kind}.embed"):
+            ensure_embedded(texts)
+        self._mutate({"upsert": {
+            doc["id"]: {
+                "keys": {view: content_key(self.store.model_name, doc["texts"][view]) for view in self.views},
+                "active": bool(doc.get("active", True)),
+                "attributes": doc.get("attributes") or {},
+            }
+            for doc in docs
+        }})
+        return len(docs)
+
+    def delete(self, ids: Sequence[str]) -> List[str]:
+        """Drop `ids`; returns the ones that were registered. Vectors stay cached in the store."""
+        with self._lock:
+            self._load()
+            known = [i for i in dict.fromkeys(ids) if i in self._docs]
+            if known:
+                self._mutate({"delete": known})
+            return known
+
+    def _active_view(self, view: str) -> tuple:
+        cached = self._active.get(view)
+        if cached is not None and cached[0] == self._version:
+            return cached
+        ids = [i for i, doc in self._docs.items() if doc["active"]]
+        attributes = [self._docs[i]["attributes"] for i in ids]
+        keys = [self._docs[i]["keys"][view] for i in ids]
+
+        # rows of the previous view are reused by content key; only new or
+        # edited documents are read from the store and quantized
+        old_row = {k: n for n, k in enumerate(cached[4])} if cached is not None else {}
+        fetch = [n for n, k in enumerate(keys) if k not in old_row]
+        if cached is not None and not fetch:
+            # deletes / deactivations: one compact gather of the surviving rows
+            matrix = cached[3][np.asarray([old_row[k] for k in keys], dtype=np.int64)]
+        else:
+            first = self.store.get_keys([keys[n] for n in fetch[:_BUILD_CHUNK]])
+            matrix = VectorBlock.empty(len(keys), first.shape[1], EMBEDDING_DTYPE)
+            reuse = [n for n, k in enumerate(keys) if k in old_row]
+            if reuse:
+                matrix.put(reuse, cached[3][np.asarray([old_row[keys[n]] for n in reuse], dtype=np.int64)])
+            # quantized chunk by chunk: no full float32 copy of the pool
+            matrix.put(fetch[:_BUILD_CHUNK], VectorBlock.from_float(first, EMBEDDING_DTYPE))
+            for start in range(_BUILD_CHUNK, len(fetch), _BUILD_CHUNK):
+                chunk = fetch[start:start + _BUILD_CHUNK]
+                matrix.put(chunk, VectorBlock.from_float(self.store.get_keys([keys[n] for n in chunk]), EMBEDDING_DTYPE))
+        cached = (self._version, ids, attributes, matrix, keys)
+        self._active[view] = cached
+        return cached
+
+    def _active_index(self, view: str) -> IVFIndex:
+        cached = self._indexes.get(view)
+        if cached is not None and cached[0] == self._version:
+            return cached[1]
+        index = cached[1] if cached is not None else IVFIndex()
+        ids = [i for i, doc in self._docs.items() if doc["active"]]
+        keys = [self._docs[i]["keys"][view] for i in ids]
+        # only new / edited documents are (re)inserted, deleted ones dropped
+        index.sync(ids, keys, lambda positions: self.store.get_keys([keys[p] for p in positions]))
+        self._indexes[view] = (self._version, index)
+        return index
+
+    def nearest(self, view: str, query: np.ndarray, k: int,
+                min_similarity: Optional[float] = None) -> Tuple[List[str], np.ndarray]:
+        """
+        Approximate k most similar active documents to `query` (IVF index over
+        the view, kept in step with the catalog): ids and raw similarities,
+        best first.
+        """
+        with self._lock:
+            self._load()
+            # synced and searched under one lock: never a half-updated index
+            hits = self._active_index(view).search(query, k, min_score=min_similarity)
+        return [i for i, _ in hits], np.asarray([s for _, s in hits], dtype=np.float32)
+
+    def select(self, view: str, ids: Optional[Sequence[str]] = None,
+               filters: Optional[Dict[str, Any]] = None) -> Selection:
+        """
+        Vectors for `ids` (registered, active or not) or, with `ids=None`, for
+        every active document; `filters` narrows either set by attributes.
+        Raises UnknownDocumentError for ids that are not registered.
+        """
+        with self._lock:
+            self._load()
+            if ids is None:
+                _, all_ids, attributes, matrix, _ = self._active_view(view)
+                if not filters:
+                    return Selection(list(all_ids), matrix)
+                keep = [n for n, attrs in enumerate(attributes) if matches_filters(attrs, filters)]
+                return Selection([all_ids[n] for n in keep], matrix[keep])
+
+            unknown = [i for i in ids if i not in self._docs]
+            if unknown:
+                raise UnknownDocumentError(self.kind, unknown)
+            chosen = [i for i in ids if matches_filters(self._docs[i]["attributes"], filters)]
+            keys = [self._docs[i]["keys"][view] for i in chosen]
+        return Selection(chosen, VectorBlock.from_float(self.store.get_keys(keys), EMBEDDING_DTYPE))
+
+
+jobs = Catalog("jobs", store, (JOB_LISTING, JOB_TEXT))
+jobseekers = Catalog("jobseekers", store, (SEEKER_RESUME,))
+
+metrics.gauge_callback("catalog_documents", "Registered documents by kind", ("kind",),
+                       lambda: {("jobs",): len(jobs), ("jobseekers",): len(jobseekers)})
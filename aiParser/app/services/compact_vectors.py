@@ -0,0 +1,133 @@
+# app/services/compact_vectors.py
+# Compact in-memory embedding matrices: float32, float16, or int8 with one
+# float32 scale per vector, scored blockwise without a full float32 copy.
+from typing import Optional, Sequence, Union
+import os
+
+import numpy as np
+
+# --------------------------
+# Config
+# --------------------------
+# float32 | float16 | int8 -- how resident catalog vectors are held in RAM.
+# int8 is 1/4 of the memory and scores about as fast as float32; float16 is
+# 1/2, but numpy's float16 -> float32 conversion makes its scoring slower.
+EMBEDDING_DTYPE = os.getenv("EMBEDDING_DTYPE", "float32").lower()
+# rows dequantized at a time while scoring (block_rows x dim float32 scratch,
+# small enough to stay in cache)
+DEQUANT_BLOCK_ROWS = int(os.getenv("DEQUANT_BLOCK_ROWS", "256"))
+
+DTYPES = ("float32", "float16", "int8")
+
+
+class VectorBlock:
+    """
+    (n, dim) embeddings in one contiguous array of `dtype`.
+
+    int8 is symmetric per-vector quantization: row i is `codes[i] * scales[i]`
+    with scale = max|x_i| / 127, so a dot product is one int8 row times the
+    query, rescaled once. `block @ q` (q: (dim,) or (dim, m)) dequantizes
+    DEQUANT_BLOCK_ROWS rows at a time; the float32 result is the only
+    full-size output. float32 blocks are scored directly.
+    """
+
+    def __init__(self, codes: np.ndarray, scales: Optional[np.ndarray] = None,
+                 block_rows: int = DEQUANT_BLOCK_ROWS):
+        self.codes = codes
+        self.scales = scales
+        self.block_rows = block_rows
+
+    @classmethod
+    def empty(cls, n: int, dim: int, dtype: str = EMBEDDING_DTYPE) -> "VectorBlock":
+        if dtype not in DTYPES:
+            raise ValueError(f"Unknown EMBEDDING_DTYPE '{dtype}' (expected one of: {', '.join(DTYPES)})")
+        scales = np.ones(n, dtype=np.float32) if dtype == "int8" else None
+        return cls(np.zeros((n, dim), dtype=np.dtype(dtype)), scales)
+
+    @classmethod
+    def from_float(cls, x: np.ndarray, dtype: str = EMBEDDING_DTYPE) -> "VectorBlock":
+        x = np.asarray(x, dtype=np.float32)
+        if x.ndim == 1:
+            x = x[None, :]
+        block = cls.empty(x.shape[0], x.shape[1], dtype)
+        block.write(0, x)
+        return block
+
+    def write(self, start: int, x: np.ndarray) -> None:
+        """Quantize float32 rows `x` into rows start..start+len(x)."""
+        if not len(x):
+            return  # also when the dim is unknown yet: (0, 0)
+        stop = start + x.shape[0]
+        if self.scales is None:
+            self.codes[start:stop] = x
+            return
+        scales = np.abs(x).max(axis=1) / 127.0
+        scales[scales == 0] = 1.0
+        self.codes[start:stop] = np.rint(x / scales[:, None])
+        self.scales[start:stop] = scales
+
+    def put(self, rows: Union[Sequence[int], np.ndarray], other: "VectorBlock") -> None:
+        """Copy the rows of `other` (same dtype, already quantized) into rows `rows`."""
+        self.codes[rows] = other.codes
+        if self.scales is not None:
+            self.scales[rows] = other.scales
+
+    # --------------------------
+    # Shape / memory
+    # --------------------------
+    @property
+    def dtype(self) -> str:
+        return self.codes.dtype.name
+
+    @property
+    def shape(self):
+        return self.codes.shape
+
+    def __len__(self) -> int:
+        return self.codes.shape[0]
+
+    @property
+    def nbytes(self) -> int:
+        return self.codes.nbytes + (self.scales.nbytes if self.scales is not None else 0)
+
+    def __getitem__(self, idx: Union[slice, Sequence[int], np.ndarray]) -> "VectorBlock":
+        """Row subset: a view for slices, a compact copy for index arrays."""
+        scales = self.scales[idx] if self.scales is not None else None
+        return VectorBlock(self.codes[idx], scales, self.block_rows)
+
+    # --------------------------
+    # Scoring
+    # --------------------------
+    def to_float(self, start: int = 0, stop: Optional[int] = None) -> np.ndarray:
+        """float32 copy of rows start..stop (keep the range small)."""
+        rows = self.codes[start:stop].astype(np.float32)
+        if self.scales is not None:
+            rows *= self.scales[start:stop, None]
+        return rows
+
+    def __matmul__(self, other: np.ndarray) -> np.ndarray:
+        other = np.asarray(other, dtype=np.float32)
+        if self.codes.dtype == np.float32:
+            return self.codes @ other
+        out = np.empty((len(self),) + other.shape[1:], dtype=np.float32)
+        for start in range(0, len(self), self.block_rows):
+            stop = start + self.block_rows
+            scores = self.codes[start:stop].astype(np.float32) @ other
+            if self.scales is not None:
+                # per-row scale applied to the scores, not to the dequantized rows
+                scores *= self.scales[start:stop].reshape((-1,) + (1,) * (other.ndim - 1))
+            out[start:stop] = scores
+        return out
+
+
+def similarity(a, b) -> np.ndarray:
+    """(len(a), len(b)) dot products; either side may be a VectorBlock."""
+    if isinstance(a, VectorBlock) and a.codes.dtype != np.float32:
+        out = np.empty((len(a), len(b)), dtype=np.float32)
+        for start in range(0, len(a), a.block_rows):
+            out[start:start + a.block_rows] = similarity(a.to_float(start, start + a.block_rows), b)
+        return out
+    a = a.codes if isinstance(a, VectorBlock) else a
+    if isinstance(b, VectorBlock):
+        return (b @ np.asarray(a, dtype=np.float32).T).T
+    return a @ b.T
@@ -0,0 +1,286 @@
+# app/services/embedding_store.py
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+import os
+import json
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+try:
+    from filelock import FileLock
+except Exception:
+    FileLock = None
+
+logger = logging.getLogger(__name__)
+
+# --------------------------
+# Config
+# --------------------------
+EMBEDDING_STORE_DIR = os.getenv("EMBEDDING_STORE_DIR", os.path.join(".cache", "embeddings"))
+# query texts (resumes sent inline to the match endpoints) kept in memory only
+QUERY_CACHE_SIZE = int(os.getenv("QUERY_CACHE_SIZE", "1024"))
+
+INDEX_FILE = "index.jsonl"
+VECTORS_FILE = "vectors.f32"
+
+EncodeFn = Callable[[List[str]], np.ndarray]
+
+
+def content_key(model_name: str, text: str) -> str:
+    """Stable cache key for one text under one model."""
+    h = hashlib.sha256()
+    h.update(model_name.encode("utf-8"))
+    h.update(b"\x00")
+    h.update(text.encode("utf-8"))
+    return h.hexdigest()
+
+
+class EmbeddingStore:
+    """
+    Disk-backed embedding cache keyed by content hash (+ model name).
+
+    Vectors are appended to a flat float32 file that is memory-mapped for reads.
+    `index.jsonl` is append-only: a header line with the model and dimension,
+    then one content hash per stored row, so adding texts writes only the new
+    lines and readers only parse what was appended since they last looked.
+    Only texts whose hash is not in the index are sent to the encoder, so an
+    unchanged job catalog is encoded once. Stored vectors are L2-normalized,
+    so cosine similarity is a dot product.
+
+    Meant for job / catalog texts; one-off query texts go to `QueryCache`.
+    """
+
+    def __init__(self, model_name: str, root: Optional[str] = None):
+        self.model_name = model_name
+        safe_name = model_name.replace("/", "__")
+        # created on first write, not at import time
+        self.path = os.path.join(root or EMBEDDING_STORE_DIR, safe_name)
+
+        self._index_path = os.path.join(self.path, INDEX_FILE)
+        self._vectors_path = os.path.join(self.path, VECTORS_FILE)
+        self._lock = threading.RLock()
+        # cross-process lock: several uvicorn workers share the same directory
+        self._file_lock = FileLock(self._index_path + ".lock") if FileLock else None
+
+        self.dim: Optional[int] = None
+        self._rows: Dict[str, int] = {}
+        self._n_rows = 0         # index lines = rows in the vectors file (a key may repeat)
+        self._index_offset = 0   # bytes of index.jsonl already read (complete lines only)
+        self._matrix: Optional[np.ndarray] = None
+        # lookups answered from the store vs. texts that had to be encoded
+        self.hits = 0
+        self.misses = 0
+        self._load_index()
+
+    # --------------------------
+    # Persistence
+    # --------------------------
+    def _load_index(self) -> None:
+        """Read index lines appended since the last call."""
+        try:
+            size = os.path.getsize(self._index_path)
+        except OSError:
+            return
+        if size < self._index_offset:
+            # replaced underneath us: start over
+            self.dim, self._rows, self._n_rows, self._index_offset, self._matrix = None, {}, 0, 0, None
+        if size == self._index_offset:
+            return
+        try:
+            with open(self._index_path, "rb") as f:
+                f.seek(self._index_offset)
+                data = f.read(size - self._index_offset)
+        except OSError:
+            logger.exception("Embedding index unreadable: %s", self._index_path)
+            return
+        # a crashed writer may leave a partial last line: it is not ours to read
+        complete = data.rfind(b"\n") + 1
+        lines = data[:complete].splitlines()
+        if self._index_offset == 0 and lines:
+            self.dim = json.loads(lines.pop(0))["dim"]
+        for line in lines:
+            self._rows.setdefault(line.decode("ascii"), self._n_rows)
+            self._n_rows += 1
+        self._index_offset += complete
+
+    def _append_index(self, keys: List[str]) -> None:
+        with open(self._index_path, "ab") as f:
+            # drop any half-written tail left by a crashed writer
+            f.truncate(self._index_offset)
+            lines = []
+            if self._index_offset == 0:
+                lines.append(json.dumps({"model": self.model_name, "dim": self.dim}))
+            lines.extend(keys)
+            data = ("\n".join(lines) + "\n").encode("ascii")
+            f.write(data)
+        self._index_offset += len(data)
+
+    def _vectors(self) -> np.ndarray:
+        n = self._n_rows
+        if self._matrix is not None and self._matrix.shape[0] >= n:
+            return self._matrix
+        if not n or not self.dim:
+            return np.zeros((0, self.dim or 0), dtype=np.float32)
+        self._matrix = np.memmap(self._vectors_path, dtype=np.float32, mode="r", shape=(n, self.dim))
+        return self._matrix
+
+    def _append(self, keys: List[str], vectors: np.ndarray) -> None:
+        os.makedirs(self.path, exist_ok=True)
+        if self._file_lock is not None:
+            self._file_lock.acquire()
+        try:
+            # another worker may have written since we last looked
+            self._load_index()
+            todo = [i for i, k in enumerate(keys) if k not in self._rows]
+            if not todo:
+                return
+            if self.dim is None:
+                self.dim = int(vectors.shape[1])
+            start = self._n_rows
+            # vectors first: an index line is only written for a complete row
+            with open(self._vectors_path, "ab") as f:
+                f.truncate(start * self.dim * 4)
+                f.write(np.ascontiguousarray(vectors[todo], dtype=np.float32).tobytes())
+            self._append_index([keys[i] for i in todo])
+            for offset, i in enumerate(todo):
+                self._rows[keys[i]] = start + offset
+            self._n_rows += len(todo)
+            self._matrix = None
+        finally:
+            if self._file_lock is not None:
+                self._file_lock.release()
+
+    # --------------------------
+    # Public API
+    # --------------------------
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, text: str) -> bool:
+        return content_key(self.model_name, text) in self._rows
+
+    def missing(self, texts: Sequence[str]) -> List[str]:
+        """Unique texts that are not in the store yet (order preserved)."""
+        with self._lock:
+            keys = [content_key(self.model_name, t) for t in texts]
+            if any(k not in self._rows for k in keys):
+                self._load_index()
+            out: Dict[str, str] = {}
+            for k, t in zip(keys, texts):
+                if k not in self._rows and k not in out:
+                    out[k] = t
+            self.misses += len(out)
+            self.hits += len(texts) - len(out)
+            return list(out.values())
+
+    def add(self, texts: Sequence[str], vectors: np.ndarray) -> None:
+        """Store already-computed embeddings for `texts`."""
+        if not len(texts):
+            return
+        keys = [content_key(self.model_name, t) for t in texts]
+        vectors = _l2_normalize(np.asarray(vectors, dtype=np.float32))
+        with self._lock:
+            self._append(keys, vectors)
+
+    def get(self, texts: Sequence[str]) -> np.ndarray:
+        """Stored embeddings for `texts`; every text must already be in the store."""
+        return self.get_keys([content_key(self.model_name, t) for t in texts])
+
+    def get_keys(self, keys: Sequence[str]) -> np.ndarray:
+        """Stored embeddings by content key (see `content_key`)."""
+        if not len(keys):
+            return np.zeros((0, self.dim or 0), dtype=np.float32)
+        with self._lock:
+            if any(k not in self._rows for k in keys):
+                self._load_index()
+            matrix = self._vectors()
+            return np.asarray(matrix[[self._rows[k] for k in keys]])
+
+    def encode(self, texts: Sequence[str], encode_fn: EncodeFn) -> np.ndarray:
+        """
+        Return normalized float32 embeddings (len(texts), dim) for `texts`,
+        calling `encode_fn` only for texts not already in the store.
+        """
+        if not texts:
+            return np.zeros((0, self.dim or 0), dtype=np.float32)
+        self.ensure(texts, encode_fn)
+        return self.get(texts)
+
+    def ensure(self, texts: Sequence[str], encode_fn: EncodeFn) -> int:
+        """Encode and store the `texts` not in the store yet, reading nothing back; returns how many."""
+        missing = self.missing(texts)
+        if missing:
+            # encode outside the lock so readers are never blocked on the model
+            self.add(missing, encode_fn(missing))
+            logger.info("Encoded %d new texts (%d cached)", len(missing), len(texts) - len(missing))
+        return len(missing)
+
+
+class QueryCache:
+    """
+    In-memory LRU of query embeddings (resumes sent inline with a match
+    request). Nothing is written to disk and at most `size` vectors are kept,
+    so personal data is not retained beyond recent traffic.
+    """
+
+    def __init__(self, model_name: str, size: int = QUERY_CACHE_SIZE):
+        self.model_name = model_name
+        self.size = size
+        self._lru: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._lru)
+
+    def lookup(self, texts: Sequence[str]) -> Tuple[Dict[str, np.ndarray], List[str]]:
+        """Cached vectors by text, and the unique texts that still need encoding."""
+        found: Dict[str, np.ndarray] = {}
+        missing: Dict[str, None] = {}
+        with self._lock:
+            for t in texts:
+                if t in found or t in missing:
+                    continue
+                k = content_key(self.model_name, t)
+                v = self._lru.get(k)
+                if v is None:
+                    missing[t] = None
+                else:
+                    self._lru.move_to_end(k)
+                    found[t] = v
+            self.misses += len(missing)
+            self.hits += len(texts) - len(missing)
+        return found, list(missing)
+
+    def add(self, texts: Sequence[str], vectors: np.ndarray) -> Dict[str, np.ndarray]:
+        """Cache freshly encoded `vectors`; returns them normalized, by text."""
+        vectors = _l2_normalize(np.asarray(vectors, dtype=np.float32))
+        out = dict(zip(texts, vectors))
+        if self.size > 0:
+            with self._lock:
+                for t, v in out.items():
+                    k = content_key(self.model_name, t)
+                    self._lru[k] = v
+                    self._lru.move_to_end(k)
+                while len(self._lru) > self.size:
+                    self._lru.popitem(last=False)
+        return out
+
+    def encode(self, texts: Sequence[str], encode_fn: EncodeFn) -> np.ndarray:
+        """Normalized embeddings for `texts`, encoding only those not cached."""
+        if not texts:
+            return np.zeros((0, 0), dtype=np.float32)
+        found, missing = self.lookup(texts)
+        if missing:
+            found.update(self.add(missing, encode_fn(missing)))
+        return np.stack([found[t] for t in texts])
+
+
+def _l2_normalize(x: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(x, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return x / norms
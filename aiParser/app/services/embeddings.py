@@ -0,0 +1,76 @@
+# app/services/embeddings.py
+# Sentence embeddings shared by the matching routers.
+from typing import List, Sequence
+
+import numpy as np
+
+from app.scoring import ENCODE_BATCH_SIZE
+from app.services import metrics, model_registry
+from app.services.encode_batcher import EncodeBatcher
+from app.services.embedding_store import EmbeddingStore, QueryCache, content_key
+
+# includes the encoder backend: vectors from different backends are cached apart
+MODEL_NAME = model_registry.sentence_encoder_id()
+
+# Job / catalog texts and inline seeker pools barely change between calls -> on disk
+store = EmbeddingStore(MODEL_NAME)
+# the single resume of a /match-jobs request: bounded, memory only
+query_cache = QueryCache(MODEL_NAME)
+
+metrics.gauge_callback("embedding_lookups_total", "Embedding store lookups by result", ("result",),
+                       lambda: {("hit",): store.hits, ("miss",): store.misses}, kind="counter")
+metrics.gauge_callback("embedding_store_rows", "Vectors in the embedding store", (),
+                       lambda: {(): len(store)})
+metrics.gauge_callback("query_embedding_lookups_total", "Query embedding cache lookups by result", ("result",),
+                       lambda: {("hit",): query_cache.hits, ("miss",): query_cache.misses}, kind="counter")
+
+
+def encode_texts(texts: List[str]) -> np.ndarray:
+    """Run the sentence encoder (normalized float32, one batched call)."""
+    model = model_registry.get_sentence_model()
+    metrics.ENCODED_ITEMS.inc(len(texts))
+    metrics.ENCODE_BATCH_SIZE.observe(len(texts))
+    with metrics.timer("encode"):
+        return model.encode(
+            texts,
+            batch_size=ENCODE_BATCH_SIZE,
+            convert_to_numpy=True,
+            normalize_embeddings=True,
+        )
+
+
+# concurrent small encode requests (one resume each) are coalesced here
+batcher = EncodeBatcher(encode_texts)
+
+
+def embed(texts: Sequence[str]) -> np.ndarray:
+    """
+    Embeddings for job / catalog texts and inline match-candidates seekers,
+    encoding only those not already in the store.
+    """
+    return store.encode(texts, encode_texts)
+
+
+def ensure_embedded(texts: Sequence[str]) -> int:
+    """Encode `texts` into the store ahead of use (registration); no vectors are returned."""
+    return store.ensure(texts, encode_texts)
+
+
+def embed_queries(texts: Sequence[str]) -> np.ndarray:
+    """Embeddings for one-off query texts (a /match-jobs resume); never persisted."""
+    return query_cache.encode(texts, encode_texts)
+
+
+async def embed_queries_async(texts: Sequence[str]) -> np.ndarray:
+    """
+    Like `embed_queries`, but uncached texts go through the shared
+    micro-batcher so concurrent requests are encoded together.
+    """
+    found, missing = query_cache.lookup(texts)
+    if missing:
+        found.update(query_cache.add(missing, await batcher.encode(missing)))
+    return np.stack([found[t] for t in texts])
+
+
+def text_key(text: str) -> str:
+    return content_key(MODEL_NAME, text)
@@ -0,0 +1,117 @@
+# app/services/encode_batcher.py
+# Coalesces encode calls from concurrent requests into one batched encode.
+from typing import Callable, List, Optional, Sequence, Set, Tuple
+import os
+import time
+import asyncio
+import logging
+import contextvars
+
+import numpy as np
+
+from app.services import metrics
+from app.services.executor import run_in_thread
+
+logger = logging.getLogger(__name__)
+
+# how long the first request of a batch waits for company
+ENCODE_BATCH_WAIT_MS = float(os.getenv("ENCODE_BATCH_WAIT_MS", "5"))
+# flush as soon as this many texts are queued
+ENCODE_BATCH_MAX_ITEMS = int(os.getenv("ENCODE_BATCH_MAX_ITEMS", "64"))
+
+
+class EncodeBatcher:
+    """
+    Dynamic micro-batching in front of a sync `encode_fn(texts) -> ndarray`.
+
+    Texts from concurrent coroutines are queued for up to `max_wait_ms` or
+    until `max_items` are waiting, encoded with a single call on the worker
+    thread pool, and the rows are routed back to each awaiting caller.
+
+    A batch serves several requests, so it runs as a task of the batcher in a
+    fresh context: its encode is timed on ENCODE_BATCH_SECONDS, never on the
+    stage timings / profile of whichever request happened to open it.
+    """
+
+    def __init__(
+        self,
+        encode_fn: Callable[[List[str]], np.ndarray],
+        max_wait_ms: float = ENCODE_BATCH_WAIT_MS,
+        max_items: int = ENCODE_BATCH_MAX_ITEMS,
+    ):
+        self.encode_fn = encode_fn
+        self.max_wait = max_wait_ms / 1000.0
+        self.max_items = max_items
+        self._pending: List[Tuple[List[str], asyncio.Future]] = []
+        self._pending_items = 0
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks: Set[asyncio.Task] = set()
+        self.batches = 0
+        self.items = 0
+
+    async def encode(self, texts: Sequence[str]) -> np.ndarray:
+        texts = list(texts)
+        if not texts:
+            return np.zeros((0, 0), dtype=np.float32)
+        loop = asyncio.get_running_loop()
+        fut = loop.create_future()
+        self._pending.append((texts, fut))
+        self._pending_items += len(texts)
+
+        if self._pending_items >= self.max_items:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait, self._flush)
+        return await fut
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._pending:
+            return
+        batch, self._pending, self._pending_items = self._pending, [], 0
+        task = asyncio.get_running_loop().create_task(self._run(batch), context=contextvars.Context())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def close(self) -> None:
+        """Cancel the pending timer and in-flight batches (their callers get CancelledError)."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending, self._pending_items = self._pending, [], 0
+        for _, fut in batch:
+            fut.cancel()
+        tasks = list(self._tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _run(self, batch: List[Tuple[List[str], asyncio.Future]]) -> None:
+        texts = [t for item_texts, _ in batch for t in item_texts]
+        started = time.perf_counter()
+        try:
+            vectors = np.asarray(await run_in_thread(self.encode_fn, texts), dtype=np.float32)
+        except asyncio.CancelledError:
+            for _, fut in batch:
+                fut.cancel()
+            raise
+        except Exception as e:
+            for _, fut in batch:
+                if not fut.done():
+                    fut.set_exception(e)
+            return
+        finally:
+            metrics.ENCODE_BATCH_SECONDS.observe(time.perf_counter() - started)
+
+        self.batches += 1
+        self.items += len(texts)
+        logger.debug("Encoded batch of %d texts from %d requests", len(texts), len(batch))
+
+        start = 0
+        for item_texts, fut in batch:
+            end = start + len(item_texts)
+            if not fut.done():
+                fut.set_result(vectors[start:end])
+            start = end
@@ -0,0 +1,221 @@
+# app/services/encoder_backends.py
+"""
+Sentence encoder backends, selected with SENTENCE_BACKEND:
+
+  torch       SentenceTransformer in fp32 PyTorch (default)
+  torch-int8  same weights, nn.Linear layers dynamically quantized to int8
+  onnx        ONNX Runtime (CPUExecutionProvider); ONNX_FILE_NAME picks a file
+              from the model repo (e.g. onnx/model_qint8_avx512_vnni.onnx),
+              ONNX_MODEL_DIR a locally exported model (see `export` below).
+              Optional dependencies: pip install -r requirements-onnx.txt
+
+Every backend returns an object with SentenceTransformer's `encode()`, so the
+callers in embeddings.py do not change. Vectors from different backends are
+close but not identical: the embedding store keys them separately (see
+model_registry.sentence_encoder_id), and `parity()` measures the drift.
+
+  python -m app.services.encoder_backends export --out .cache/onnx/mpnet [--quantize avx2]
+  python -m app.services.encoder_backends parity --backend torch-int8 --texts jobs.txt --queries resumes.txt
+"""
+from typing import Any, Callable, Dict, List, Optional, Sequence
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+import importlib.util
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# --------------------------
+# Config
+# --------------------------
+SENTENCE_BACKEND = os.getenv("SENTENCE_BACKEND", "torch").lower()
+ONNX_FILE_NAME = os.getenv("ONNX_FILE_NAME") or None
+ONNX_MODEL_DIR = os.getenv("ONNX_MODEL_DIR") or None
+
+
+def _load_torch(model_name: str):
+    from sentence_transformers import SentenceTransformer
+    return SentenceTransformer(model_name)
+
+
+def _load_torch_int8(model_name: str):
+    import torch
+    from sentence_transformers import SentenceTransformer
+
+    # dynamic quantization is CPU only: int8 weights, activations quantized per batch
+    model = SentenceTransformer(model_name, device="cpu")
+    return torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8, inplace=True)
+
+
+def _load_onnx(model_name: str):
+    from sentence_transformers import SentenceTransformer
+
+    model_kwargs: Dict[str, Any] = {"provider": "CPUExecutionProvider"}
+    if ONNX_FILE_NAME:
+        model_kwargs["file_name"] = ONNX_FILE_NAME
+    # without an ONNX file in the repo / directory, sentence-transformers
+    # exports one on load (needs `optimum[onnxruntime]`); `export` saves it once
+    return SentenceTransformer(ONNX_MODEL_DIR or model_name, backend="onnx", model_kwargs=model_kwargs)
+
+
+BACKENDS: Dict[str, Callable[[str], Any]] = {
+    "torch": _load_torch,
+    "torch-int8": _load_torch_int8,
+    "onnx": _load_onnx,
+}
+
+# modules each backend imports, and where they come from
+REQUIRED_MODULES: Dict[str, Sequence[str]] = {
+    "torch": ("torch", "sentence_transformers"),
+    "torch-int8": ("torch", "sentence_transformers"),
+    "onnx": ("sentence_transformers", "onnxruntime", "optimum"),
+}
+_INSTALL_HINTS = {
+    "onnx": "pip install -r requirements-onnx.txt",
+}
+
+
+def check_available(backend: Optional[str] = None) -> None:
+    """
+    Raise if `backend` is unknown or its packages are not installed, without
+    importing them (cheap enough to run at startup).
+    """
+    backend = backend or SENTENCE_BACKEND
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown SENTENCE_BACKEND '{backend}' (expected one of: {', '.join(BACKENDS)})")
+    missing = [m for m in REQUIRED_MODULES[backend] if importlib.util.find_spec(m) is None]
+    if missing:
+        hint = _INSTALL_HINTS.get(backend, "pip install -r requirements.txt")
+        raise ImportError(f"SENTENCE_BACKEND={backend} needs {', '.join(missing)}: {hint}")
+
+
+def load(model_name: str, backend: Optional[str] = None):
+    backend = backend or SENTENCE_BACKEND
+    check_available(backend)
+    started = time.perf_counter()
+    model = BACKENDS[backend](model_name)
+    logger.info("Sentence encoder %s loaded with backend %s in %.1fs", model_name, backend, time.perf_counter() - started)
+    return model
+
+
+# --------------------------
+# Parity check
+# --------------------------
+def _encode(model, texts: Sequence[str], batch_size: int) -> np.ndarray:
+    return np.asarray(
+        model.encode(list(texts), batch_size=batch_size, convert_to_numpy=True, normalize_embeddings=True),
+        dtype=np.float32,
+    )
+
+
+def parity(reference, candidate, texts: Sequence[str], queries: Optional[Sequence[str]] = None,
+           k: int = 10, batch_size: int = 32) -> Dict[str, Any]:
+    """
+    Cosine drift of `candidate` against `reference` (normally fp32 torch) on
+    `texts`, encode throughput of both, and, with `queries`, how many of the
+    reference top-k texts per query the candidate also ranks top-k.
+    """
+    # one call each first, so one-off graph / session setup is not timed
+    _encode(reference, texts[:1], batch_size)
+    _encode(candidate, texts[:1], batch_size)
+
+    started = time.perf_counter()
+    ref = _encode(reference, texts, batch_size)
+    ref_seconds = time.perf_counter() - started
+    started = time.perf_counter()
+    cand = _encode(candidate, texts, batch_size)
+    cand_seconds = time.perf_counter() - started
+
+    cos = np.sum(ref * cand, axis=1)
+    report: Dict[str, Any] = {
+        "texts": len(texts),
+        "cosine_mean": round(float(cos.mean()), 6),
+        "cosine_min": round(float(cos.min()), 6),
+        "cosine_p01": round(float(np.percentile(cos, 1)), 6),
+        "reference_texts_per_sec": round(len(texts) / ref_seconds, 2),
+        "candidate_texts_per_sec": round(len(texts) / cand_seconds, 2),
+        "speedup": round(ref_seconds / cand_seconds, 2),
+    }
+    if queries:
+        k = min(k, len(texts))
+        ref_q, cand_q = _encode(reference, queries, batch_size), _encode(candidate, queries, batch_size)
+        ref_top = np.argsort(-(ref_q @ ref.T), axis=1)[:, :k]
+        cand_top = np.argsort(-(cand_q @ cand.T), axis=1)[:, :k]
+        overlap = [len(set(a) & set(b)) / k for a, b in zip(ref_top.tolist(), cand_top.tolist())]
+        report[f"top{k}_overlap_mean"] = round(float(np.mean(overlap)), 4)
+        report[f"top{k}_overlap_min"] = round(float(np.min(overlap)), 4)
+    return report
+
+
+# --------------------------
+# ONNX export
+# --------------------------
+def export_onnx(model_name: str, out_dir: str, quantize: Optional[str] = None) -> List[str]:
+    """
+    Export `model_name` to ONNX under `out_dir` (load with ONNX_MODEL_DIR=out_dir),
+    optionally adding a dynamically int8-quantized copy for `quantize`
+    (arm64 | avx2 | avx512 | avx512_vnni); returns the written .onnx files.
+    """
+    from sentence_transformers import SentenceTransformer, export_dynamic_quantized_onnx_model
+
+    model = SentenceTransformer(model_name, backend="onnx", model_kwargs={"provider": "CPUExecutionProvider"})
+    model.save_pretrained(out_dir)
+    if quantize:
+        export_dynamic_quantized_onnx_model(model, quantize, out_dir)
+    written = []
+    for root, _, files in os.walk(out_dir):
+        written.extend(os.path.join(root, f) for f in files if f.endswith(".onnx"))
+    return sorted(written)
+
+
+def _read_lines(path: Optional[str]) -> List[str]:
+    if not path:
+        return []
+    with open(path, "r", encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip()]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    from app.services.model_registry import SENTENCE_MODEL_NAME
+
+    ap = argparse.ArgumentParser(description="sentence encoder backends")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    exp = sub.add_parser("export", help="export the sentence model to ONNX")
+    exp.add_argument("--model", default=SENTENCE_MODEL_NAME)
+    exp.add_argument("--out", required=True)
+    exp.add_argument("--quantize", choices=("arm64", "avx2", "avx512", "avx512_vnni"))
+
+    par = sub.add_parser("parity", help="cosine drift / speed of a backend against the fp32 reference")
+    par.add_argument("--model", default=SENTENCE_MODEL_NAME)
+    par.add_argument("--backend", default=SENTENCE_BACKEND, choices=list(BACKENDS))
+    par.add_argument("--reference", default="torch", choices=list(BACKENDS))
+    par.add_argument("--texts", required=True, help="one text per line")
+    par.add_argument("--queries", help="one query per line: adds top-k overlap against the texts")
+    par.add_argument("--k", type=int, default=10)
+    par.add_argument("--min-cosine", type=float, default=None, help="exit 1 if any text drifts below this")
+    args = ap.parse_args(argv)
+
+    if args.cmd == "export":
+        for path in export_onnx(args.model, args.out, args.quantize):
+            print(path)
+        print(f"use with: SENTENCE_BACKEND=onnx ONNX_MODEL_DIR={args.out} [ONNX_FILE_NAME=onnx/<file>]")
+        return 0
+
+    report = parity(
+        load(args.model, args.reference), load(args.model, args.backend),
+        _read_lines(args.texts), _read_lines(args.queries), k=args.k,
+    )
+    report.update(model=args.model, backend=args.backend, reference=args.reference)
+    print(json.dumps(report, indent=1))
+    if args.min_cosine is not None and report["cosine_min"] < args.min_cosine:
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
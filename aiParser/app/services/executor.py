@@ -0,0 +1,257 @@
+# app/services/executor.py
+# Keeps CPU-bound work (encode, NER, PDF, parsing) off the event loop.
+from typing import Any, Callable, Dict, Optional
+import os
+import asyncio
+import functools
+import contextvars
+import logging
+import multiprocessing
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+
+from fastapi import HTTPException
+
+from app.services import metrics, profiling
+
+logger = logging.getLogger(__name__)
+
+# --------------------------
+# Config
+# --------------------------
+# torch / fitz release the GIL -> threads are enough for them
+EXECUTOR_THREADS = int(os.getenv("EXECUTOR_THREADS", str(min(8, os.cpu_count() or 1))))
+# the regex / dateparser heavy resume parser holds the GIL -> processes (0 = use threads)
+EXECUTOR_PROCESSES = int(os.getenv("EXECUTOR_PROCESSES", "2"))
+# long PDFs are split into this many page ranges, extracted on a pool of as
+# many processes (default one per core; <= 1 = no page-level parallelism)
+PDF_PROCESSES = int(os.getenv("PDF_PROCESSES", str(os.cpu_count() or 1)))
+# spawn: forking a parent that already runs torch threads can deadlock
+EXECUTOR_MP_CONTEXT = os.getenv("EXECUTOR_MP_CONTEXT", "spawn")
+
+RETRY_AFTER_SECONDS = int(os.getenv("RETRY_AFTER_SECONDS", "2"))
+
+# endpoint -> (max in flight, max waiting). Override with
+# CONCURRENCY_<NAME>=in_flight:queue, e.g. CONCURRENCY_MATCH_CANDIDATES=2:4
+DEFAULT_LIMITS = {
+    "match-jobs": (8, 64),
+    "match-candidates": (2, 4),
+    "resume-upload": (4, 32),
+    "resume-parse": (4, 32),
+    "resume-bulk": (1, 2),
+    "catalog": (2, 8),
+}
+
+_pool_lock = threading.Lock()
+_thread_pool: Optional[ThreadPoolExecutor] = None
+_process_pool: Optional[ProcessPoolExecutor] = None
+_pdf_pool: Optional[ProcessPoolExecutor] = None
+_parse_workers_ready = None  # shared counter: parse workers done loading their models
+
+
+def thread_pool() -> ThreadPoolExecutor:
+    global _thread_pool
+    with _pool_lock:
+        if _thread_pool is None:
+            _thread_pool = ThreadPoolExecutor(max_workers=EXECUTOR_THREADS, thread_name_prefix="cpu")
+        return _thread_pool
+
+
+def _new_process_pool(workers: int) -> ProcessPoolExecutor:
+    return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context(EXECUTOR_MP_CONTEXT))
+
+
+def _init_parse_worker(ready) -> None:
+    """
+    Parse pool initializer: load the parser's models (NER, spaCy) before the
+    first task, once per worker; spawned workers cannot share the parent's.
+    """
+    from app.services import model_registry
+    model_registry.warm_up(model_registry.PARSE_MODELS)
+    with ready.get_lock():
+        ready.value += 1
+
+
+def process_pool() -> Optional[ProcessPoolExecutor]:
+    global _process_pool, _parse_workers_ready
+    if EXECUTOR_PROCESSES <= 0:
+        return None
+    with _pool_lock:
+        if _process_pool is None:
+            context = multiprocessing.get_context(EXECUTOR_MP_CONTEXT)
+            _parse_workers_ready = context.Value("i", 0)
+            _process_pool = ProcessPoolExecutor(max_workers=EXECUTOR_PROCESSES, mp_context=context,
+                                                initializer=_init_parse_worker, initargs=(_parse_workers_ready,))
+        return _process_pool
+
+
+def parse_workers_ready() -> int:
+    """Parse pool workers whose models are loaded."""
+    return _parse_workers_ready.value if _parse_workers_ready is not None else 0
+
+
+def process_pool_ready() -> bool:
+    """True once every parse worker is up with its models (always, without a pool)."""
+    return EXECUTOR_PROCESSES <= 0 or parse_workers_ready() >= EXECUTOR_PROCESSES
+
+
+def start_process_pool(wait: bool = False) -> None:
+    """
+    Create the parse pool and start all of its workers now (at startup), so
+    no request waits for an interpreter spawn, the app import or the model
+    load. A spawn pool starts one process per submit while none is idle:
+    one no-op each. `wait` returns once every worker has loaded its models.
+    """
+    pool = process_pool()
+    if pool is None:
+        return
+    started = [pool.submit(os.getpid) for _ in range(EXECUTOR_PROCESSES)]
+    if wait:
+        for f in started:
+            f.result()
+        while not process_pool_ready():
+            time.sleep(0.05)
+
+
+def pdf_process_pool() -> Optional[ProcessPoolExecutor]:
+    """Separate from `process_pool`: page ranges must not queue behind whole-resume parses."""
+    global _pdf_pool
+    if PDF_PROCESSES <= 1:
+        return None
+    with _pool_lock:
+        if _pdf_pool is None:
+            _pdf_pool = _new_process_pool(PDF_PROCESSES)
+        return _pdf_pool
+
+
+async def _run(pool: Executor, fn: Callable[..., Any], *args, **kwargs) -> Any:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(pool, functools.partial(fn, *args, **kwargs))
+
+
+async def run_in_thread(fn: Callable[..., Any], *args, **kwargs) -> Any:
+    # carry the request context (stage timings) into the worker thread
+    ctx = contextvars.copy_context()
+    profile = profiling.current()
+    if profile is None:
+        return await _run(thread_pool(), ctx.run, fn, *args, **kwargs)
+    result, _ = await _run(thread_pool(), ctx.run, profiling.profiled_call, profile.new_part(), fn, *args, **kwargs)
+    return result
+
+
+async def run_in_process(fn: Callable[..., Any], *args, **kwargs) -> Any:
+    """`fn` and its arguments must be picklable (module-level function)."""
+    pool = process_pool()
+    if pool is None:
+        return await run_in_thread(fn, *args, **kwargs)
+    profile = profiling.current()
+    if profile is not None:
+        # profiled request: profile inside the worker, merged when the request ends
+        fn, args = profiling.profiled_call, (profile.new_part(), fn) + args
+    result, timings = await _run(pool, metrics.collect_timings, fn, *args, **kwargs)
+    metrics.record_timings(timings)
+    if profile is not None:
+        result, peak = result
+        profile.worker_peaks.append(peak)
+    return result
+
+
+async def run_in_pdf_process(fn: Callable[..., Any], *args) -> Any:
+    """`fn(*args)` on the PDF page pool; awaited, so no thread waits on it."""
+    pool = pdf_process_pool()
+    if pool is None:
+        return await run_in_thread(fn, *args)
+    return await _run(pool, fn, *args)
+
+
+def shutdown() -> None:
+    global _thread_pool, _process_pool, _pdf_pool, _parse_workers_ready
+    with _pool_lock:
+        if _thread_pool is not None:
+            _thread_pool.shutdown(wait=False)
+            _thread_pool = None
+        if _process_pool is not None:
+            _process_pool.shutdown(wait=False, cancel_futures=True)
+            _process_pool = None
+            _parse_workers_ready = None
+        if _pdf_pool is not None:
+            _pdf_pool.shutdown(wait=False, cancel_futures=True)
+            _pdf_pool = None
+
+
+# --------------------------
+# Per-endpoint backpressure
+# --------------------------
+class ConcurrencyLimiter:
+    """
+    `async with limiter:` admits `max_concurrent` callers at a time and lets at
+    most `max_queue` more wait; anyone beyond that gets 503 + Retry-After
+    instead of piling onto a saturated worker.
+    """
+
+    def __init__(self, name: str, max_concurrent: int, max_queue: int, retry_after: int = RETRY_AFTER_SECONDS):
+        self.name = name
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.retry_after = retry_after
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+        self.in_flight = 0
+        self.waiting = 0
+        self.rejected = 0
+
+    def check(self) -> None:
+        """Raise the 503 that entering right now would raise; acquires nothing."""
+        if self._semaphore.locked() and self.waiting >= self.max_queue:
+            self.rejected += 1
+            raise HTTPException(
+                status_code=503,
+                detail=f"Server busy ({self.name}), retry later",
+                headers={"Retry-After": str(self.retry_after)},
+            )
+
+    async def __aenter__(self):
+        if self._semaphore.locked():
+            self.check()
+            self.waiting += 1
+            try:
+                await self._semaphore.acquire()
+            finally:
+                self.waiting -= 1
+        else:
+            await self._semaphore.acquire()
+        self.in_flight += 1
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.in_flight -= 1
+        self._semaphore.release()
+        return False
+
+
+_limiters: Dict[str, ConcurrencyLimiter] = {}
+
+metrics.gauge_callback("concurrency_in_flight", "Requests running per endpoint limiter", ("endpoint",),
+                       lambda: {(name,): l.in_flight for name, l in _limiters.items()})
+metrics.gauge_callback("concurrency_waiting", "Requests queued per endpoint limiter", ("endpoint",),
+                       lambda: {(name,): l.waiting for name, l in _limiters.items()})
+metrics.gauge_callback("concurrency_rejected_total", "Requests rejected with 503 per endpoint limiter", ("endpoint",),
+                       lambda: {(name,): l.rejected for name, l in _limiters.items()}, kind="counter")
+
+
+def limit(name: str) -> ConcurrencyLimiter:
+    limiter = _limiters.get(name)
+    if limiter is None:
+        max_concurrent, max_queue = DEFAULT_LIMITS.get(name, (EXECUTOR_THREADS, 4 * EXECUTOR_THREADS))
+        override = os.getenv("CONCURRENCY_" + name.upper().replace("-", "_"))
+        if override:
+            try:
+                parts = override.split(":")
+                max_concurrent = int(parts[0])
+                if len(parts) > 1:
+                    max_queue = int(parts[1])
+            except ValueError:
+                logger.warning("Ignoring bad concurrency override for %s: %r", name, override)
+        limiter = ConcurrencyLimiter(name, max_concurrent, max_queue)
+        _limiters[name] = limiter
+    return limiter
@@ -0,0 +1,104 @@
+# app/services/headings.py
+# Section-heading classifier used by parse_resume._find_section_blocks.
+from typing import Dict, Iterable, List, Optional, Tuple
+import os
+import re
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+# extra (multi-language) heading vocabulary merged on top of the built-in one
+HEADINGS_FILE = os.getenv(
+    "HEADINGS_FILE",
+    os.path.join(os.path.dirname(os.path.dirname(__file__)), "headings.json"),
+)
+
+# words and single punctuation marks, so "Education & Awards" -> education, &, awards
+TOKEN_RE = re.compile(r"\w+|[^\w\s]")
+
+# heading lines are short
+MAX_HEADING_WORDS = 8
+
+
+def tokenize(text: str) -> Tuple[str, ...]:
+    return tuple(TOKEN_RE.findall(text.lower()))
+
+
+class HeadingClassifier:
+    """
+    Maps a line to a section name in one pass over its tokens.
+
+    Every keyword phrase is stored as a token tuple in a dict, so a line is
+    checked by looking up each of its token n-grams (n <= longest phrase):
+    the cost depends on line length, not on vocabulary size. When a line
+    contains keywords of several sections, the section listed first wins.
+    """
+
+    def __init__(self, vocabulary: Dict[str, Iterable[str]]):
+        self.sections: List[str] = []
+        self._phrases: Dict[Tuple[str, ...], int] = {}
+        self._max_len = 0
+        self.extend(vocabulary)
+
+    def extend(self, vocabulary: Dict[str, Iterable[str]]) -> None:
+        for section, keywords in vocabulary.items():
+            if section not in self.sections:
+                self.sections.append(section)
+            priority = self.sections.index(section)
+            for kw in keywords:
+                phrase = tokenize(kw)
+                if not phrase:
+                    continue
+                # keep the higher-priority section if a phrase is listed twice
+                if priority < self._phrases.get(phrase, len(self.sections)):
+                    self._phrases[phrase] = priority
+                self._max_len = max(self._max_len, len(phrase))
+
+    def __len__(self) -> int:
+        return len(self._phrases)
+
+    def classify(self, line: str) -> Optional[str]:
+        if len(line.split()) > MAX_HEADING_WORDS:
+            return None
+        tokens = tokenize(line)
+        best = None
+        phrases = self._phrases
+        for i in range(len(tokens)):
+            for n in range(1, min(self._max_len, len(tokens) - i) + 1):
+                priority = phrases.get(tokens[i:i + n])
+                if priority is not None and (best is None or priority < best):
+                    best = priority
+                    if best == 0:
+                        return self.sections[0]
+        return self.sections[best] if best is not None else None
+
+
+def load_vocabulary(path: str) -> Dict[str, List[str]]:
+    """`{section: [keyword, ...]}` from a JSON file; languages may be nested one level."""
+    if not path or not os.path.exists(path):
+        return {}
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            raw = json.load(f)
+    except Exception:
+        logger.exception("Could not load heading vocabulary %s", path)
+        return {}
+
+    vocab: Dict[str, List[str]] = {}
+    for section, value in raw.items():
+        if isinstance(value, dict):  # {"education": {"en": [...], "es": [...]}}
+            words = [w for lang_words in value.values() for w in lang_words]
+        else:
+            words = list(value)
+        vocab.setdefault(section, []).extend(words)
+    return vocab
+
+
+def build_classifier(base: Dict[str, Iterable[str]], path: str = HEADINGS_FILE) -> HeadingClassifier:
+    classifier = HeadingClassifier(base)
+    extra = load_vocabulary(path)
+    if extra:
+        classifier.extend(extra)
+        logger.info("Loaded %d heading phrases", len(classifier))
+    return classifier
@@ -0,0 +1,242 @@
+# app/services/metrics.py
+# In-process counters / histograms, Prometheus text exposition and Server-Timing.
+#
+#   with metrics.timer("parse.name"):      # stage histogram + Server-Timing entry
+#       ...
+#   metrics.ENCODED_ITEMS.inc(len(texts))
+#
+# Worker processes do not share these objects: run_in_process ships the stage
+# timings recorded in the child back with the result (collect_timings /
+# record_timings), so parser stages show up here like everything else.
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+import os
+import time
+import bisect
+import threading
+import contextvars
+from contextlib import contextmanager
+
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "1") == "1"
+# serve GET /metrics for Prometheus; off by default since it exposes traffic
+# and catalog sizes -- enable only where the port is not publicly reachable
+METRICS_ENDPOINT = os.getenv("METRICS_ENDPOINT", "0") == "1"
+# add a Server-Timing header (per-stage ms) to every response
+SERVER_TIMING = os.getenv("SERVER_TIMING", "0") == "1"
+
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024)
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: LabelValues, extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _fmt(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class Counter:
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.label_names = tuple(labels)
+        self._values: Dict[LabelValues, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, *labels: str) -> None:
+        if not METRICS_ENABLED:
+            return
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def value(self, *labels: str) -> float:
+        return self._values.get(labels, 0.0)
+
+    def expose(self) -> Iterator[str]:
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} counter"
+        with self._lock:
+            items = sorted(self._values.items())
+        for labels, value in items:
+            yield f"{self.name}{_labels(self.label_names, labels)} {_fmt(value)}"
+
+
+class Histogram:
+    def __init__(self, name: str, help: str, labels: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.name = name
+        self.help = help
+        self.label_names = tuple(labels)
+        self.buckets = tuple(sorted(buckets))
+        # labels -> (per-bucket counts incl. +Inf, sum)
+        self._series: Dict[LabelValues, Tuple[List[int], List[float]]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels: str) -> None:
+        if not METRICS_ENABLED:
+            return
+        idx = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = ([0] * (len(self.buckets) + 1), [0.0])
+            series[0][idx] += 1
+            series[1][0] += value
+
+    def count(self, *labels: str) -> int:
+        series = self._series.get(labels)
+        return sum(series[0]) if series else 0
+
+    def expose(self) -> Iterator[str]:
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} histogram"
+        with self._lock:
+            items = sorted((labels, (list(c), s[0])) for labels, (c, s) in self._series.items())
+        for labels, (counts, total) in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = 'le="' + _fmt(bound) + '"'
+                yield f"{self.name}_bucket{_labels(self.label_names, labels, le)} {cumulative}"
+            yield f"{self.name}_sum{_labels(self.label_names, labels)} {_fmt(total)}"
+            yield f"{self.name}_count{_labels(self.label_names, labels)} {cumulative}"
+
+
+class GaugeCallback:
+    """Values read at scrape time, e.g. limiter queue depth. `fn() -> {labels: value}`."""
+
+    def __init__(self, name: str, help: str, labels: Sequence[str], fn: Callable[[], Dict[LabelValues, float]], kind: str = "gauge"):
+        self.name = name
+        self.help = help
+        self.label_names = tuple(labels)
+        self.fn = fn
+        self.kind = kind
+
+    def expose(self) -> Iterator[str]:
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} {self.kind}"
+        for labels, value in sorted(self.fn().items()):
+            yield f"{self.name}{_labels(self.label_names, labels)} {_fmt(value)}"
+
+
+# --------------------------
+# Registry
+# --------------------------
+_registry: Dict[str, Any] = {}
+_registry_lock = threading.Lock()
+
+
+def _register(metric):
+    with _registry_lock:
+        return _registry.setdefault(metric.name, metric)
+
+
+def counter(name: str, help: str, labels: Sequence[str] = ()) -> Counter:
+    return _register(Counter(name, help, labels))
+
+
+def histogram(name: str, help: str, labels: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+    return _register(Histogram(name, help, labels, buckets))
+
+
+def gauge_callback(name: str, help: str, labels: Sequence[str], fn: Callable[[], Dict[LabelValues, float]], kind: str = "gauge") -> GaugeCallback:
+    return _register(GaugeCallback(name, help, labels, fn, kind))
+
+
+def render() -> str:
+    """Prometheus text format 0.0.4."""
+    with _registry_lock:
+        metrics = list(_registry.values())
+    lines: List[str] = []
+    for metric in metrics:
+        try:
+            lines.extend(list(metric.expose()))
+        except Exception:
+            continue  # a broken callback must not take /metrics down
+    return "\n".join(lines) + "\n"
+
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# --------------------------
+# Shared metrics
+# --------------------------
+REQUEST_SECONDS = histogram("http_request_duration_seconds", "HTTP request latency", ("method", "path", "status"))
+STAGE_SECONDS = histogram("stage_duration_seconds", "Time spent in one hot-path stage", ("stage",))
+ENCODED_ITEMS = counter("encoded_items_total", "Texts run through the sentence encoder")
+ENCODE_BATCH_SIZE = histogram("encode_batch_size", "Texts per encoder call", buckets=SIZE_BUCKETS)
+ENCODE_BATCH_SECONDS = histogram("encode_batch_duration_seconds", "Wall time of one micro-batched encode (shared by its requests)")
+PDF_PAGES = counter("pdf_pages_total", "PDF pages extracted")
+
+# --------------------------
+# Stage timers / Server-Timing
+# --------------------------
+# stage -> seconds for the request being served (None outside a request)
+_timings: contextvars.ContextVar[Optional[Dict[str, float]]] = contextvars.ContextVar("request_timings", default=None)
+
+
+def record_timing(stage: str, seconds: float) -> None:
+    STAGE_SECONDS.observe(seconds, stage)
+    timings = _timings.get()
+    if timings is not None:
+        timings[stage] = timings.get(stage, 0.0) + seconds
+
+
+@contextmanager
+def timer(stage: str):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_timing(stage, time.perf_counter() - started)
+
+
+def record_timings(timings: Dict[str, float]) -> None:
+    for stage, seconds in timings.items():
+        record_timing(stage, seconds)
+
+
+def collect_timings(fn: Callable[..., Any], *args, **kwargs) -> Tuple[Any, Dict[str, float]]:
+    """Run `fn` (in a worker process) and return its result with the stage timings it recorded."""
+    timings: Dict[str, float] = {}
+    token = _timings.set(timings)
+    try:
+        return fn(*args, **kwargs), timings
+    finally:
+        _timings.reset(token)
+
+
+def server_timing_header(timings: Dict[str, float]) -> str:
+    return ", ".join(f"{stage};dur={seconds * 1000:.1f}" for stage, seconds in timings.items())
+
+
+async def metrics_middleware(request, call_next):
+    """Request latency histogram; Server-Timing header when SERVER_TIMING=1."""
+    timings: Dict[str, float] = {}
+    token = _timings.set(timings)
+    started = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+    finally:
+        elapsed = time.perf_counter() - started
+        _timings.reset(token)
+        route = request.scope.get("route")
+        # route template, not the raw URL, keeps label cardinality bounded
+        path = getattr(route, "path", None) or "unmatched"
+        REQUEST_SECONDS.observe(elapsed, request.method, path, str(status))
+    if SERVER_TIMING:
+        timings["total"] = elapsed
+        response.headers["Server-Timing"] = server_timing_header(timings)
+    return response
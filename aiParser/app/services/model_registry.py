@@ -0,0 +1,206 @@
+# app/services/model_registry.py
+"""
+Shared model registry: one instance per model per process.
+
+Models are loaded on first use (or by `warm_up`) instead of at import time, so
+importing `app.main` is cheap and the sentence encoder is shared by every router.
+`preload()` loads everything up front for `gunicorn --preload`, where workers
+forked from the master share the weights copy-on-write. With a parse
+process pool (EXECUTOR_PROCESSES > 0) the parser's models (PARSE_MODELS) are
+only loaded in the pool workers, each once, by the pool initializer.
+"""
+from typing import Any, Callable, Dict, Iterable, Optional
+import os
+import re
+import gc
+import hashlib
+import logging
+import threading
+
+from app.services.executor import EXECUTOR_PROCESSES
+
+logger = logging.getLogger(__name__)
+
+# --------------------------
+# Config
+# --------------------------
+SENTENCE_MODEL_NAME = os.getenv("SENTENCE_MODEL", "sentence-transformers/all-mpnet-base-v2")
+NER_MODEL_NAME = os.getenv("NER_MODEL", "dslim/bert-base-NER")
+SPACY_MODEL_NAMES = ("en_core_web_trf", "en_core_web_sm")
+
+# lazy | background | eager
+MODEL_WARMUP = os.getenv("MODEL_WARMUP", "background").lower()
+
+SENTENCE_ENCODER = "sentence-encoder"
+NER = "ner"
+SPACY = "spacy"
+
+
+# --------------------------
+# Loaders
+# --------------------------
+def _load_sentence_encoder():
+    # torch | torch-int8 | onnx, see encoder_backends.py
+    from app.services import encoder_backends
+    return encoder_backends.load(SENTENCE_MODEL_NAME)
+
+
+def sentence_encoder_id() -> str:
+    """
+    Model name + backend, for caches of encoder output: int8 / ONNX vectors
+    are close to the fp32 ones but must not be mixed with them. For ONNX the
+    file (fp32 vs. quantized variants) and a local export dir are part of it.
+    """
+    from app.services.encoder_backends import ONNX_FILE_NAME, ONNX_MODEL_DIR, SENTENCE_BACKEND
+    if SENTENCE_BACKEND == "torch":
+        return SENTENCE_MODEL_NAME
+    if SENTENCE_BACKEND != "onnx":
+        return f"{SENTENCE_MODEL_NAME}@{SENTENCE_BACKEND}"
+    variant = re.sub(r"[\\/]+", "_", ONNX_FILE_NAME or "model.onnx")
+    if ONNX_MODEL_DIR:
+        # a re-export to the same dir keeps its id: clear the store when that changes the model
+        variant += "-" + hashlib.sha256(os.path.realpath(ONNX_MODEL_DIR).encode("utf-8")).hexdigest()[:12]
+    return f"{SENTENCE_MODEL_NAME}@onnx-{variant}"
+
+
+def _load_ner():
+    # HuggingFace token classification (DSLIM NER)
+    try:
+        from transformers import pipeline
+        return pipeline("ner", model=NER_MODEL_NAME, aggregation_strategy="simple")
+    except Exception:
+        logger.warning("HuggingFace NER pipeline not available - install transformers and model")
+        return None
+
+
+def _load_spacy():
+    # prefer transformer model if installed
+    try:
+        import spacy
+    except Exception:
+        return None
+    for name in SPACY_MODEL_NAMES:
+        try:
+            nlp = spacy.load(name)
+            logger.info("Loaded spaCy %s", name)
+            return nlp
+        except Exception:
+            continue
+    return None
+
+
+_loaders: Dict[str, Callable[[], Any]] = {
+    SENTENCE_ENCODER: _load_sentence_encoder,
+    NER: _load_ner,
+    SPACY: _load_spacy,
+}
+
+# used where resumes are parsed: in the parse pool workers when there is a
+# pool (executor._init_parse_worker loads them there), otherwise here
+PARSE_MODELS = (NER, SPACY)
+
+# models this process cannot answer without; optional ones may load later
+REQUIRED_MODELS = (SENTENCE_ENCODER,) if EXECUTOR_PROCESSES > 0 else (SENTENCE_ENCODER, NER)
+
+_models: Dict[str, Any] = {}
+_state: Dict[str, str] = {name: "not_loaded" for name in _loaders}
+_locks: Dict[str, threading.Lock] = {name: threading.Lock() for name in _loaders}
+_warmup_thread: Optional[threading.Thread] = None
+
+
+def register(name: str, loader: Callable[[], Any]) -> None:
+    """Add (or replace) a model loader."""
+    _loaders[name] = loader
+    _locks.setdefault(name, threading.Lock())
+    _state[name] = "not_loaded"
+    _models.pop(name, None)
+
+
+def get(name: str) -> Any:
+    """Return the process-wide instance of `name`, loading it on first call."""
+    if name in _models:
+        return _models[name]
+    with _locks[name]:
+        if name in _models:
+            return _models[name]
+        _state[name] = "loading"
+        try:
+            model = _loaders[name]()
+        except Exception:
+            _state[name] = "failed"
+            logger.exception("Failed to load model %s", name)
+            raise
+        _models[name] = model
+        _state[name] = "ready" if model is not None else "unavailable"
+        logger.info("Model %s: %s", name, _state[name])
+        return model
+
+
+def get_sentence_model():
+    return get(SENTENCE_ENCODER)
+
+
+def get_ner_pipeline():
+    return get(NER)
+
+
+def get_spacy_nlp():
+    return get(SPACY)
+
+
+# --------------------------
+# Warm-up / readiness
+# --------------------------
+def _check_sentence_backend(names: Iterable[str]) -> None:
+    # a missing optional backend (SENTENCE_BACKEND=onnx without onnxruntime)
+    # is a deployment error: fail at startup, not on the first match request
+    if SENTENCE_ENCODER in names and _loaders[SENTENCE_ENCODER] is _load_sentence_encoder:
+        from app.services import encoder_backends
+        encoder_backends.check_available()
+
+
+def warm_up(names: Optional[Iterable[str]] = None, background: bool = False) -> Optional[threading.Thread]:
+    """
+    Load `names` (default: the required models), here or on a daemon thread.
+    Raises before loading anything if the sentence encoder backend cannot
+    be imported; other load errors only show up in `status()`.
+    """
+    names = list(names or REQUIRED_MODELS)
+    _check_sentence_backend(names)
+
+    def _run():
+        for name in names:
+            try:
+                get(name)
+            except Exception:
+                pass
+
+    if not background:
+        _run()
+        return None
+
+    global _warmup_thread
+    if _warmup_thread is None or not _warmup_thread.is_alive():
+        _warmup_thread = threading.Thread(target=_run, name="model-warmup", daemon=True)
+        _warmup_thread.start()
+    return _warmup_thread
+
+
+def status() -> Dict[str, str]:
+    return dict(_state)
+
+
+def is_ready() -> bool:
+    return all(_state.get(name) in ("ready", "unavailable") for name in REQUIRED_MODELS)
+
+
+def preload(names: Optional[Iterable[str]] = None) -> None:
+    """
+    Load models in the current (master) process before workers fork.
+    `gc.freeze()` keeps the collector from touching those objects later,
+    which would otherwise dirty the shared pages in every worker.
+    """
+    warm_up(names)
+    gc.collect()
+    if hasattr(gc, "freeze"):
+        gc.freeze()
@@ -0,0 +1,215 @@
+# app/services/parse_cache.py
+# Content-addressed cache for parse results (upload bytes / raw text + links).
+from typing import Any, Dict, List, Optional, Sequence
+import os
+import json
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+
+from app.services import metrics
+
+logger = logging.getLogger(__name__)
+
+# --------------------------
+# Config
+# --------------------------
+PARSE_CACHE_SIZE = int(os.getenv("PARSE_CACHE_SIZE", "1024"))          # in-memory entries
+PARSE_CACHE_DIR = os.getenv("PARSE_CACHE_DIR", "")                       # empty = no disk tier
+PARSE_CACHE_MAX_BYTES = int(os.getenv("PARSE_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+
+
+def files_fingerprint(paths: Sequence[str]) -> str:
+    """
+    Short hash of the contents of `paths` (a missing file hashes as empty), so
+    editing a vocabulary / model file the parser loaded changes every key.
+    """
+    h = hashlib.sha256()
+    for path in paths:
+        h.update(b"\x00")
+        try:
+            with open(path, "rb") as f:
+                for chunk in iter(lambda: f.read(1 << 20), b""):
+                    h.update(chunk)
+        except OSError:
+            pass
+    return h.hexdigest()[:16]
+
+
+def _fields_tag(fields: Optional[Sequence[str]]) -> bytes:
+    # partial parses (fields=...) never share an entry with the full result
+    return ("\x00fields=" + ",".join(sorted(fields))).encode("utf-8") if fields else b""
+
+
+def bytes_key(contents: bytes, version: str, fields: Optional[Sequence[str]] = None) -> str:
+    h = hashlib.sha256()
+    h.update(version.encode("utf-8"))
+    h.update(_fields_tag(fields))
+    h.update(b"\x00bytes\x00")
+    h.update(contents)
+    return h.hexdigest()
+
+
+def text_key(raw_text: str, links: Optional[List[str]], version: str, fields: Optional[Sequence[str]] = None) -> str:
+    # normalize so whitespace-only / link-order differences hit the same entry
+    text = "\n".join(l.strip() for l in raw_text.splitlines() if l.strip())
+    norm_links = sorted({l.strip() for l in (links or []) if l and l.strip()})
+    h = hashlib.sha256()
+    h.update(version.encode("utf-8"))
+    h.update(_fields_tag(fields))
+    h.update(b"\x00text\x00")
+    h.update(text.encode("utf-8"))
+    h.update(b"\x00")
+    h.update("\n".join(norm_links).encode("utf-8"))
+    return h.hexdigest()
+
+
+class ParseCache:
+    """
+    Two-tier cache: in-memory LRU, plus an optional directory of JSON files
+    evicted oldest-first once it grows past `max_bytes`.
+    """
+
+    def __init__(self, size: int = PARSE_CACHE_SIZE, directory: str = PARSE_CACHE_DIR, max_bytes: int = PARSE_CACHE_MAX_BYTES):
+        self.size = size
+        self.directory = directory or None
+        self.max_bytes = max_bytes
+        self._lru: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk_bytes: Optional[int] = None
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        if self.directory:
+            os.makedirs(self.directory, exist_ok=True)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "entries": len(self._lru),
+        }
+
+    # --------------------------
+    # Memory tier
+    # --------------------------
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            value = self._lru.get(key)
+            if value is not None:
+                self._lru.move_to_end(key)
+                self.hits += 1
+                return value
+
+        value = self._disk_get(key)
+        with self._lock:
+            if value is None:
+                self.misses += 1
+                return None
+            self.disk_hits += 1
+            self._remember(key, value)
+        return value
+
+    def put(self, key: str, value: Dict[str, Any]) -> None:
+        with self._lock:
+            self._remember(key, value)
+        self._disk_put(key, value)
+
+    def _remember(self, key: str, value: Dict[str, Any]) -> None:
+        if self.size <= 0:
+            return
+        self._lru[key] = value
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.size:
+            self._lru.popitem(last=False)
+
+    # --------------------------
+    # Disk tier
+    # --------------------------
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], key + ".json")
+
+    def _disk_get(self, key: str) -> Optional[Dict[str, Any]]:
+        if not self.directory:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                value = json.load(f)
+            os.utime(path)  # LRU-ish: eviction goes by mtime
+            return value
+        except FileNotFoundError:
+            return None
+        except Exception:
+            logger.warning("Dropping unreadable parse cache entry %s", path)
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            return None
+
+    def _disk_put(self, key: str, value: Dict[str, Any]) -> None:
+        if not self.directory:
+            return
+        path = self._path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            data = json.dumps(value).encode("utf-8")
+            tmp = path + ".tmp"
+            with open(tmp, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except Exception:
+            logger.exception("Parse cache write failed")
+            return
+        with self._lock:
+            if self._disk_bytes is None:
+                self._disk_bytes = self._scan_disk_bytes()
+            else:
+                self._disk_bytes += len(data)
+            over = self._disk_bytes > self.max_bytes
+        if over:
+            self._evict()
+
+    def _entries(self):
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if name.endswith(".json"):
+                    path = os.path.join(root, name)
+                    try:
+                        st = os.stat(path)
+                    except OSError:
+                        continue
+                    yield st.st_mtime, st.st_size, path
+
+    def _scan_disk_bytes(self) -> int:
+        return sum(size for _, size, _ in self._entries())
+
+    def _evict(self) -> None:
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        # drop down to 90% so we do not evict on every write
+        target = int(self.max_bytes * 0.9)
+        for _, size, path in entries:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                continue
+        with self._lock:
+            self._disk_bytes = total
+
+
+# process-wide instance
+parse_cache = ParseCache()
+
+metrics.gauge_callback(
+    "parse_cache_lookups_total", "Parse cache lookups by result", ("result",),
+    lambda: {("hit",): parse_cache.hits, ("disk_hit",): parse_cache.disk_hits, ("miss",): parse_cache.misses},
+    kind="counter",
+)
+metrics.gauge_callback("parse_cache_entries", "Parse results held in memory", (), lambda: {(): parse_cache.stats()["entries"]})
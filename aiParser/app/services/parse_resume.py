@@ -1,20 +1,21 @@
 # app/services/parse_resume.py
-from typing import List, Dict, Any, Optional, Tuple
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple, Union
 import re
 import logging
-from datetime import datetime
 from collections import defaultdict
 
 # NLP + ML
-try:
-    import spacy
-except Exception:
-    spacy = None
 
-from transformers import pipeline
-from dateparser import parse as date_parse
-from sklearn.feature_extraction.text import TfidfVectorizer
-import numpy as np
+from app.services import metrics, model_registry
+from app.services.headings import HEADINGS_FILE, build_classifier
+from app.services.parse_cache import files_fingerprint
+from app.services.resume_dates import YearMonth, format_year_month, parse_year_month, total_experience_years
+from app.services.skill_matcher import SKILLS_FILE, build_matcher
+from app.services.text_scanner import (
+    DATE_RANGE_RE, EMAIL_RE, HTTP_SCHEME_RE, YEAR_RE,
+    match_role_company, scan_contacts, scan_line,
+)
+from app.services.tfidf_model import TFIDF_MODEL_PATH, idf_model
 
 # optional fast fuzzy matching
 try:
@@ -25,36 +26,33 @@ except Exception:
 
 logger = logging.getLogger(__name__)
 
+# bump whenever parse output changes - part of the parse cache key
+PARSER_VERSION = "6"
+# what cache keys use: the code version plus the skills / headings / IDF files
+# loaded at startup, which can be swapped through env vars without a bump
+PARSE_CACHE_VERSION = PARSER_VERSION + "+" + files_fingerprint([SKILLS_FILE, HEADINGS_FILE, TFIDF_MODEL_PATH])
+
 # --------------------------
-# Load models once (global)
+# Models
 # --------------------------
-# spaCy NER (prefer transformer model if installed)
-_spacy_nlp = None
-if spacy:
-    try:
-        _spacy_nlp = spacy.load("en_core_web_trf")
-        logger.info("Loaded spaCy en_core_web_trf")
-    except Exception:
-        try:
-            _spacy_nlp = spacy.load("en_core_web_sm")
-            logger.info("Loaded spaCy en_core_web_sm")
-        except Exception:
-            _spacy_nlp = None
-
-# HuggingFace token classification fallback (DSLIM NER)
-try:
-    _hf_ner = pipeline("ner", model="dslim/bert-base-NER", aggregation_strategy="simple")
-except Exception:
-    _hf_ner = None
-    logger.warning("HuggingFace NER pipeline not available - install transformers and model")
+# spaCy NER and the HuggingFace DSLIM NER pipeline are loaded once per process
+# by app.services.model_registry, on first use or during warm-up.
 
 # --------------------------
 # Regex / vocabulary
 # --------------------------
-EMAIL_RE = re.compile(r"[a-zA-Z0-9._%+\-]+@[a-zA-Z0-9.\-]+\.[A-Za-z]{2,}", re.I)
-PHONE_RE = re.compile(r"(?:\+?\d{1,3}[\s\-])?(?:\(?\d{2,4}\)?[\s\-])?\d{3,4}[\s\-]?\d{3,4}")
-URL_RE = re.compile(r"https?://[^\s)]+|www\.[^\s)]+", re.I)
-YEAR_RE = re.compile(r"\b(19|20)\d{2}\b")
+# contact / URL / date-range patterns live in app.services.text_scanner
+WEBSITE_TLD_RE = re.compile(r"\.(dev|app|io|me|site|online|tech|studio|edu)\b")
+SKILL_PHRASE_RES = [
+    re.compile(r"(?:skills?:\s*)([A-Za-z0-9,\.\-\/\s\+]+)", re.I),
+    re.compile(r"(?:stack:)\s*([A-Za-z0-9,./\s\-\+/#]+)", re.I),
+    re.compile(r"(?:languages?:)\s*([A-Za-z0-9,./\s\-\+/#]+)", re.I),
+    re.compile(r"(?:experience with|worked with|using)\s+([A-Za-z0-9,./\s\-\+/#]+)", re.I),
+]
+PHRASE_SPLIT_RE = re.compile(r"[,\n;/|]+")
+SKILL_SPLIT_RE = re.compile(r"[,\|/]")
+KEYWORD_SPLIT_RE = re.compile(r"[,/|;]+")
+HAS_LETTER_RE = re.compile(r"[a-zA-Z]")
 
 # headings for detection (multi-domain)
 HEADING_KEYWORDS = {
@@ -67,6 +65,9 @@ HEADING_KEYWORDS = {
     "contact": ["contact", "contact information"],
 }
 
+# compiled once: built-in headings + multi-language vocabulary from app/headings.json
+_heading_classifier = build_classifier(HEADING_KEYWORDS)
+
 # broad multi-domain skill ontology (starter)
 COMMON_SKILLS = {
     # Tech & Dev
@@ -84,6 +85,9 @@ COMMON_SKILLS = {
     "communication","teamwork","leadership","problem solving","management","customer service"
 }
 
+# built once: COMMON_SKILLS + canonical names / aliases from app/skills.json
+_skill_matcher = build_matcher(COMMON_SKILLS)
+
 # job title keywords across domains (starter)
 JOB_TITLE_KEYWORDS = [
     "frontend developer","backend developer","full stack developer","software engineer","data scientist",
@@ -97,12 +101,6 @@ SENIORITY_KEYWORDS = {
     "junior": ["junior","jr.","entry-level","intern"]
 }
 
-# date range regex (many variants)
-DATE_RANGE_RE = re.compile(
-    r"(?P<start>(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Sept|Oct|Nov|Dec|\w+)[\w\.\s,/-]{0,20}\d{2,4})\s*[-–—]\s*(?P<end>present|current|now|(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Sept|Oct|Nov|Dec|\w+)[\w\.\s,/-]{0,20}\d{2,4})",
-    flags=re.I
-)
-
 # --------------------------
 # Helpers
 # --------------------------
@@ -116,11 +114,11 @@ def _normalize_links(raw_links: List[str]) -> List[str]:
         if not l:
             continue
         u = l.strip()
-        if "@" in u and re.match(EMAIL_RE, u):
+        if "@" in u and EMAIL_RE.match(u):
             # keep emails raw here
             val = u
         else:
-            if not re.match(r"^https?://", u, flags=re.I):
+            if not HTTP_SCHEME_RE.match(u):
                 val = "https://" + u.lstrip("/")
             else:
                 val = u
@@ -140,7 +138,7 @@ def _classify_links(urls: List[str]) -> Dict[str, List[str]]:
         if not u:
             continue
         low = u.lower()
-        if re.match(EMAIL_RE, u):
+        if EMAIL_RE.match(u):
             emails.append(u)
         elif "linkedin.com" in low:
             linkedin.append(u)
@@ -148,7 +146,7 @@ def _classify_links(urls: List[str]) -> Dict[str, List[str]]:
             github.append(u)
         elif any(x in low for x in ["behance", "dribbble", "figma", "codepen", "codesandbox", "vercel", "netlify", "portfolio"]):
             portfolio.append(u)
-        elif re.search(r"\.(dev|app|io|me|site|online|tech|studio|edu)\b", low):
+        elif WEBSITE_TLD_RE.search(low):
             website.append(u)
         else:
             others.append(u)
@@ -170,10 +168,11 @@ def _classify_links(urls: List[str]) -> Dict[str, List[str]]:
 # Name extraction
 # --------------------------
 def _extract_name_spacy(text: str) -> Optional[str]:
-    if not _spacy_nlp:
+    spacy_nlp = model_registry.get_spacy_nlp()
+    if not spacy_nlp:
         return None
     try:
-        doc = _spacy_nlp(text[:5000])  # limit for speed
+        doc = spacy_nlp(text[:5000])  # limit for speed
         persons = [ent.text.strip() for ent in doc.ents if ent.label_ in ("PERSON",)]
         if persons:
             # heuristic: longest / most complete
@@ -183,19 +182,15 @@ def _extract_name_spacy(text: str) -> Optional[str]:
         logger.exception("spaCy name extraction failed")
     return None
 def _extract_all_links(text: str) -> List[str]:
-    # basic regex
-    urls = URL_RE.findall(text)
-    # sometimes people write links like (www.example.com) or [example](https://...)
-    extra = re.findall(r"\(?https?://[^\s)]+\)?", text)
-    extra += re.findall(r"\[.*?\]\((https?://[^\s)]+)\)", text)
-    all_urls = list(dict.fromkeys(urls + extra))
-    return all_urls
+    # (www.example.com) and [example](https://...) are covered: URLs stop at ")"
+    return scan_contacts(text).urls
 
 def _extract_name_hf(text: str) -> Optional[str]:
-    if not _hf_ner:
+    hf_ner = model_registry.get_ner_pipeline()
+    if not hf_ner:
         return None
     try:
-        ents = _hf_ner(text[:2000])
+        ents = hf_ner(text[:2000])
         persons = [e["word"].strip() for e in ents if e.get("entity_group")=="PER"]
         if persons:
             # join up to three tokens
@@ -208,11 +203,12 @@ def _extract_name(text: str) -> Optional[str]:
     """
     HuggingFace NER based name extraction (works well on resumes)
     """
-    if not _hf_ner:
+    hf_ner = model_registry.get_ner_pipeline()
+    if not hf_ner:
         return None
 
     try:
-        ents = _hf_ner(text[:10000])
+        ents = hf_ner(text[:10000])
         persons = [e["word"].strip() for e in ents if e.get("entity_group")=="PER"]
         if persons:
             # join first few tokens to form full name
@@ -231,16 +227,10 @@ def _find_section_blocks(text: str) -> Dict[str,str]:
     lines = _split_into_lines(text)
     headings = []
     for idx, ln in enumerate(lines):
-        low = ln.lower()
-        for sec, kws in HEADING_KEYWORDS.items():
-            for kw in kws:
-                # exact word or startswith (handle "Education" or "Education & Awards")
-                if re.search(r"\b" + re.escape(kw) + r"\b", low) and len(ln.split()) <= 8:
-                    headings.append((idx, sec))
-                    break
-            else:
-                continue
-            break
+        # whole-word keyword match (handles "Education" or "Education & Awards")
+        sec = _heading_classifier.classify(ln)
+        if sec:
+            headings.append((idx, sec))
     blocks = {}
     if not headings:
         return blocks
@@ -252,43 +242,34 @@ def _find_section_blocks(text: str) -> Dict[str,str]:
 # --------------------------
 # Date parsing helpers
 # --------------------------
-def _parse_date_guess(s: str) -> Optional[datetime]:
-    if not s: return None
-    s = s.strip()
-    if re.search(r"\b(present|current|now|to date)\b", s, re.I):
-        return datetime.now()
-    try:
-        dt = date_parse(s, settings={"PREFER_DAY_OF_MONTH":"first"})
-        return dt
-    except Exception:
-        # fallback to give year only if present
-        m = YEAR_RE.search(s)
-        if m:
-            return datetime(int(m.group(0)), 1, 1)
-    return None
+def _parse_date_guess(s: str, end: bool = False) -> Optional[YearMonth]:
+    # fast path for "Jan 2021" / "01/2021" / "2019" / "present", memoized dateparser otherwise;
+    # a bare year is January as a start, December as an end
+    return parse_year_month(s, end)
 
-def _format_date(dt: Optional[datetime]) -> Optional[str]:
-    if not dt: return None
-    try:
-        return dt.strftime("%b %Y")
-    except Exception:
-        return None
+def _format_date(ym: Optional[YearMonth]) -> Optional[str]:
+    return format_year_month(ym)
 
 # --------------------------
 # Experience extraction
 # --------------------------
 def _extract_experience(block_text: str) -> List[Dict[str,Any]]:
+    return _extract_experience_with_ranges(block_text)[0]
+
+def _extract_experience_with_ranges(block_text: str) -> Tuple[List[Dict[str,Any]], List[Tuple[Optional[YearMonth], Optional[YearMonth]]]]:
+    """
+    Experience entries plus their parsed (start, end) year-months, so the
+    total-experience calculation never re-parses the formatted strings.
+    """
     if not block_text:
-        return []
+        return [], []
     lines = _split_into_lines(block_text)
     experiences=[]
     current=None
 
-    role_company_pattern = re.compile(r"(?P<role>[\w\-\s/&\.,]{2,80})\s+(?:at|\@|\|)\s+(?P<company>[\w\-\s\.,&/]{2,120})", re.I)
-
     for ln in lines:
         # if detects role@company or Role | Company
-        m = role_company_pattern.search(ln)
+        m = match_role_company(ln)
         if m:
             if current:
                 experiences.append(current)
@@ -296,21 +277,23 @@ def _extract_experience(block_text: str) -> List[Dict[str,Any]]:
             company = m.group("company").strip()
             current = {"role": role, "company": company, "start_date": None, "end_date": None, "description": ""}
             # sometimes the same line contains dates -> try to extract
-            dr = DATE_RANGE_RE.search(ln)
+            dr = DATE_RANGE_RE.search(scan_line(ln))
             if dr:
                 s = _parse_date_guess(dr.group("start"))
-                e = _parse_date_guess(dr.group("end"))
+                e = _parse_date_guess(dr.group("end"), end=True)
                 current["start_date"] = _format_date(s)
                 current["end_date"] = _format_date(e)
+                current["_range"] = (s, e)
             continue
 
         # detect date-range line
-        dr = DATE_RANGE_RE.search(ln)
+        dr = DATE_RANGE_RE.search(scan_line(ln))
         if dr and current:
             s = _parse_date_guess(dr.group("start"))
-            e = _parse_date_guess(dr.group("end"))
+            e = _parse_date_guess(dr.group("end"), end=True)
             current["start_date"] = _format_date(s)
             current["end_date"] = _format_date(e)
+            current["_range"] = (s, e)
             # also append the rest of line to description
             rest = DATE_RANGE_RE.sub("", ln).strip()
             if rest:
@@ -337,14 +320,12 @@ def _extract_experience(block_text: str) -> List[Dict[str,Any]]:
     if current:
         experiences.append(current)
 
-    # tidy descriptions and ensure dates are string formatted
+    # tidy descriptions and pull out the structured date ranges
+    ranges = []
     for e in experiences:
         e["description"] = e.get("description","").strip()
-        if isinstance(e.get("start_date"), datetime):
-            e["start_date"] = _format_date(e["start_date"])
-        if isinstance(e.get("end_date"), datetime):
-            e["end_date"] = _format_date(e["end_date"])
-    return experiences
+        ranges.append(e.pop("_range", (None, None)))
+    return experiences, ranges
 
 # --------------------------
 # Projects extraction
@@ -390,7 +371,7 @@ def _extract_education(block_text: str) -> List[str]:
     out=[]
     degree_words = ["bachelor","master","bs","ms","phd","bsc","msc","ba","mba","certificate","diploma","degree"]
     for ln in lines:
-        if re.search(r"\b(19|20)\d{2}\b", ln) or any(dw in ln.lower() for dw in degree_words) or len(ln.split())>3:
+        if YEAR_RE.search(ln) or any(dw in ln.lower() for dw in degree_words) or len(ln.split())>3:
             out.append(ln)
     return out or lines
 
@@ -406,30 +387,17 @@ def _extract_certifications(block_text: str) -> List[str]:
 # Skills extraction
 # --------------------------
 def _tfidf_top_terms(text: str, top_n: int = 80) -> List[str]:
+    # transform-only against the corpus IDF model (see app/services/tfidf_model.py)
     if not text or not text.strip():
         return []
-    try:
-        v = TfidfVectorizer(stop_words="english", ngram_range=(1,2), max_features=800)
-        X = v.fit_transform([text])
-        scores = np.asarray(X.sum(axis=0)).flatten()
-        terms = v.get_feature_names_out()
-        ranked = sorted(zip(terms, scores), key=lambda t: -t[1])
-        return [t for t,_ in ranked[:top_n]]
-    except Exception:
-        return []
+    return idf_model.top_terms(text, top_n=top_n)
 
 def _candidate_skills_from_phrases(text: str) -> List[str]:
-    patterns = [
-        r"(?:skills?:\s*)([A-Za-z0-9,\.\-\/\s\+]+)",
-        r"(?:stack:)\s*([A-Za-z0-9,./\s\-\+/#]+)",
-        r"(?:languages?:)\s*([A-Za-z0-9,./\s\-\+/#]+)",
-        r"(?:experience with|worked with|using)\s+([A-Za-z0-9,./\s\-\+/#]+)"
-    ]
     cand=[]
-    for pat in patterns:
-        for m in re.finditer(pat, text, flags=re.I):
+    for pat in SKILL_PHRASE_RES:
+        for m in pat.finditer(text):
             grp = m.group(1).strip().strip(".,;:-")
-            parts = re.split(r"[,\n;/|]+", grp)
+            parts = PHRASE_SPLIT_RE.split(grp)
             for p in parts:
                 p = p.strip()
                 if p:
@@ -445,23 +413,32 @@ def _candidate_skills_from_phrases(text: str) -> List[str]:
 def _filter_and_rank_skills(tfidf_terms: List[str], phrase_cands: List[str], text: str, max_k:int=20) -> List[str]:
     text_low = text.lower()
     candidates = []
+    seen_low = set()
 
     # 1. phrase candidates (higher weight)
     for ph in phrase_cands:
-        for part in re.split(r"[,\|/]", ph):
+        for part in SKILL_SPLIT_RE.split(ph):
             tok = part.strip()
-            if tok: candidates.append(tok)
-
-    # 2. common skills found in text
-    for sk in COMMON_SKILLS:
-        if sk in text_low and sk not in [c.lower() for c in candidates]:
+            if tok:
+                candidates.append(tok)
+                seen_low.add(tok.lower())
+                # "JS" in a skills line already covers ontology skill "javascript"
+                canonical = _skill_matcher.canonicalize(tok)
+                if canonical:
+                    seen_low.add(canonical)
+
+    # 2. ontology skills found in text (one pass, whole words, with counts)
+    skill_counts = _skill_matcher.match(text)
+    for sk in skill_counts:
+        if sk not in seen_low:
             candidates.append(sk)
+            seen_low.add(sk)
 
     # 3. tfidf-derived candidates (long-tail)
     for t in tfidf_terms:
         t_clean = t.strip()
         if len(t_clean.split()) > 3: continue
-        if not re.search(r"[a-zA-Z]", t_clean): continue
+        if not HAS_LETTER_RE.search(t_clean): continue
         if t_clean.lower() in text_low and t_clean not in candidates:
             candidates.append(t_clean)
 
@@ -470,13 +447,17 @@ def _filter_and_rank_skills(tfidf_terms: List[str], phrase_cands: List[str], tex
     for tok in candidates:
         score=0
         tl=tok.lower()
-        if tl in COMMON_SKILLS: score += 100
+        canonical = _skill_matcher.canonicalize(tl)
+        if canonical: score += 100
         # phrase match boost
-        if any(tok.lower() in pc.lower() or pc.lower() in tok.lower() for pc in phrase_cands): score += 20
+        if any(tl in pc.lower() or pc.lower() in tl for pc in phrase_cands): score += 20
         # shorter tokens higher priority
         score += max(0, 10 - len(tok.split()))
-        # presence frequency approx via counting occurrences
-        score += text_low.count(tok.lower())
+        # presence frequency: ontology hits were counted by the matcher pass
+        if canonical in skill_counts:
+            score += skill_counts[canonical]
+        else:
+            score += text_low.count(tl)
         scored.append((score, tok))
     scored_sorted = [t for _,t in sorted(scored, key=lambda x:-x[0])]
     final=[]
@@ -521,36 +502,203 @@ def _detect_seniority(text:str, years: float) -> str:
 # --------------------------
 # Years of experience calculation
 # --------------------------
-def _calculate_total_experience_from_experience_list(experiences: List[Dict[str,Any]]) -> float:
-    total_months = 0
-    for e in experiences:
-        s = e.get("start_date")
-        eend = e.get("end_date")
-        if not s or not eend:
-            continue
-        try:
-            ds = date_parse(s)
-            de = date_parse(eend)
-            if not ds or not de: continue
-            months = (de.year - ds.year) * 12 + (de.month - ds.month + 1)
-            if months > 0:
-                total_months += months
-        except Exception:
+def _calculate_total_experience_from_experience_list(
+    experiences: List[Dict[str,Any]],
+    ranges: Optional[List[Tuple[Optional[YearMonth], Optional[YearMonth]]]] = None,
+) -> float:
+    # overlapping roles are counted once; ranges come straight from extraction when available
+    if ranges is None:
+        ranges = [(_parse_date_guess(e.get("start_date")), _parse_date_guess(e.get("end_date"), end=True)) for e in experiences]
+    return total_experience_years(ranges)
+
+# --------------------------
+# Stages
+# --------------------------
+# Each stage declares what it needs; parse_resume_text only runs the stages
+# behind the requested fields, and every intermediate is computed at most once.
+class Stage(NamedTuple):
+    requires: Tuple[str, ...]
+    fn: Callable[..., Any]
+
+STAGES: Dict[str, Stage] = {}
+
+def _stage(name: str, *requires: str):
+    def register(fn):
+        STAGES[name] = Stage(requires, fn)
+        return fn
+    return register
+
+def _run_stage(name: str, ctx: Dict[str, Any]) -> Any:
+    if name not in ctx:
+        stage = STAGES[name]
+        args = [_run_stage(dep, ctx) for dep in stage.requires]
+        # dependencies resolved first -> each timer covers only its own stage
+        with metrics.timer("parse." + name):
+            ctx[name] = stage.fn(*args)
+    return ctx[name]
+
+# intermediates
+@_stage("scan", "raw_text")
+def _stage_scan(raw_text):
+    # emails, phones and URLs in a single pass over the text
+    return scan_contacts(raw_text)
+
+@_stage("all_urls", "scan", "raw_links")
+def _stage_all_urls(scan, raw_links):
+    # normalize & merge links (links argument may include emails or urls)
+    return list(dict.fromkeys(scan.urls + _normalize_links(raw_links or [])))
+
+@_stage("blocks", "raw_text")
+def _stage_blocks(raw_text):
+    return _find_section_blocks(raw_text)
+
+@_stage("experience_ranges", "raw_text", "blocks")
+def _stage_experience_ranges(raw_text, blocks):
+    experience_block = blocks.get("experience", "")
+    return _extract_experience_with_ranges(experience_block if experience_block else raw_text)
+
+@_stage("phrase_candidates", "raw_text", "blocks")
+def _stage_phrase_candidates(raw_text, blocks):
+    return _candidate_skills_from_phrases(blocks.get("skills", "") + "\n" + raw_text)
+
+@_stage("tfidf_terms", "raw_text")
+def _stage_tfidf_terms(raw_text):
+    return _tfidf_top_terms(raw_text, top_n=120)
+
+# output fields
+@_stage("name", "raw_text")
+def _stage_name(raw_text):
+    # name extraction (HF NER -> first line)
+    return _extract_name(raw_text)
+
+@_stage("links", "all_urls")
+def _stage_links(all_urls):
+    return _classify_links(all_urls)
+
+@_stage("emails", "scan", "links")
+def _stage_emails(scan, links):
+    emails = list(scan.emails)
+    # ensure we include any classified emails
+    for em in links.get("emails", []):
+        if em not in emails:
+            emails.append(em)
+    return list(dict.fromkeys(emails))
+
+@_stage("phones", "scan")
+def _stage_phones(scan):
+    return list(dict.fromkeys(scan.phones))
+
+@_stage("education", "blocks")
+def _stage_education(blocks):
+    education_block = blocks.get("education", "")
+    return _extract_education(education_block) if education_block else []
+
+@_stage("certifications", "blocks")
+def _stage_certifications(blocks):
+    cert_block = blocks.get("certifications", "")
+    return _extract_certifications(cert_block) if cert_block else []
+
+@_stage("experience", "experience_ranges")
+def _stage_experience(experience_ranges):
+    return experience_ranges[0]
+
+@_stage("projects", "blocks", "all_urls")
+def _stage_projects(blocks, all_urls):
+    return _extract_projects(blocks.get("projects", ""), all_urls)
+
+@_stage("skills", "tfidf_terms", "phrase_candidates", "raw_text")
+def _stage_skills(tfidf_terms, phrase_candidates, raw_text):
+    return _filter_and_rank_skills(tfidf_terms, phrase_candidates, raw_text, max_k=30)
+
+@_stage("keywords", "skills")
+def _stage_keywords(skills):
+    # keywords: short tokens for search / ATS
+    keywords = []
+    for s in skills:
+        # split comma-delimited multi skills
+        parts = KEYWORD_SPLIT_RE.split(s)
+        for p in parts:
+            tok = p.strip()
+            if tok and tok.lower() not in [k.lower() for k in keywords]:
+                keywords.append(tok)
+            if len(keywords) >= 25:
+                break
+        if len(keywords) >= 25:
+            break
+    return keywords
+
+@_stage("job_title", "raw_text", "tfidf_terms", "phrase_candidates")
+def _stage_job_title(raw_text, tfidf_terms, phrase_candidates):
+    return _detect_job_title(raw_text, tfidf_terms + phrase_candidates)
+
+@_stage("years_of_experience", "experience_ranges")
+def _stage_years_of_experience(experience_ranges):
+    # compute yrs-of-experience from experience entries if possible
+    years = _calculate_total_experience_from_experience_list(*experience_ranges)
+    return float(years) if years else 0.0
+
+@_stage("seniority", "raw_text", "years_of_experience")
+def _stage_seniority(raw_text, years_of_experience):
+    return _detect_seniority(raw_text, years_of_experience)
+
+@_stage("raw_sample", "raw_text")
+def _stage_raw_sample(raw_text):
+    return raw_text[:1500]
+
+# --------------------------
+# Field selection
+# --------------------------
+PERSONAL_INFO_FIELDS = ("name", "emails", "phones")
+PARSE_FIELDS = PERSONAL_INFO_FIELDS + (
+    "links", "education", "certifications", "skills", "projects", "experience",
+    "keywords", "job_title", "seniority", "years_of_experience", "raw_sample",
+)
+# shorthands accepted in fields=
+FIELD_GROUPS = {
+    "personal_info": PERSONAL_INFO_FIELDS,
+    "contacts": ("emails", "phones", "links"),
+}
+
+def resolve_fields(fields: Optional[Union[str, Iterable[str]]]) -> Optional[Tuple[str, ...]]:
+    """
+    "emails,phones,skills" / ["contacts", "skills"] -> canonical sorted tuple,
+    None (or empty) -> None meaning every field. Raises ValueError on unknown names.
+    """
+    if fields is None:
+        return None
+    names = fields.split(",") if isinstance(fields, str) else list(fields)
+    out = set()
+    for name in names:
+        name = name.strip()
+        if not name:
             continue
-    if total_months == 0:
-        return 0.0
-    return round(total_months / 12.0, 2)
+        if name in FIELD_GROUPS:
+            out.update(FIELD_GROUPS[name])
+        elif name in PARSE_FIELDS:
+            out.add(name)
+        else:
+            raise ValueError(f"Unknown field '{name}', expected any of: {', '.join(PARSE_FIELDS + tuple(FIELD_GROUPS))}")
+    if not out or out == set(PARSE_FIELDS):
+        return None
+    return tuple(sorted(out))
 
 # --------------------------
 # Top-level parser
 # --------------------------
-def parse_resume_text(raw_text: str, links: Optional[List[str]] = None) -> Dict[str, Any]:
+def parse_resume_text(
+    raw_text: str,
+    links: Optional[List[str]] = None,
+    fields: Optional[Union[str, Iterable[str]]] = None,
+) -> Dict[str, Any]:
     """
     Input:
       - raw_text: extracted text from uploaded resume (Pdf/docx/txt)
       - links: list of links found by extraction (or passed from external extractor)
+      - fields: optional subset of PARSE_FIELDS (or FIELD_GROUPS) to compute;
+        only the stages those fields depend on run. Default: everything.
     Returns:
-      dict matching your DB/frontend schema:
+      dict matching your DB/frontend schema (only the requested keys when
+      `fields` is given):
       {
         status,
         personal_info: { name, emails, phones },
@@ -569,84 +717,17 @@ def parse_resume_text(raw_text: str, links: Optional[List[str]] = None) -> Dict[
     if not raw_text:
         return {"status":"error","message":"empty text"}
 
-    lines = _split_into_lines(raw_text)
-    # normalize & merge links (links argument may include emails or urls)
-    normalized_links = _normalize_links(links or [])
-    urls_in_text = _extract_all_links(raw_text)
-    all_urls = list(dict.fromkeys(urls_in_text + normalized_links))
-    classified_links = _classify_links(all_urls)
-
-    # contacts
-    emails = EMAIL_RE.findall(raw_text)
-    phones = [p for p in PHONE_RE.findall(raw_text) if not YEAR_RE.search(p)]
-    # ensure we include any classified emails
-    if "emails" in classified_links:
-        for em in classified_links.get("emails", []):
-            if em not in emails:
-                emails.append(em)
-
-    # name extraction (spaCy -> HF -> heuristic)
-    name = _extract_name(raw_text)
-
-    # section blocks
-    blocks = _find_section_blocks(raw_text)
-    education_block = blocks.get("education","")
-    cert_block = blocks.get("certifications","")
-    skills_block = blocks.get("skills","")
-    projects_block = blocks.get("projects","")
-    experience_block = blocks.get("experience","")
-    summary_block = blocks.get("summary","")
-
-    # parse each
-    education = _extract_education(education_block) if education_block else []
-    certifications = _extract_certifications(cert_block) if cert_block else []
-    experience = _extract_experience(experience_block) if experience_block else _extract_experience(raw_text)
-    projects = _extract_projects(projects_block if projects_block else "", all_urls)
-
-    # skills candidates
-    phrase_candidates = _candidate_skills_from_phrases(skills_block + "\n" + raw_text)
-    tfidf_terms = _tfidf_top_terms(raw_text, top_n=120)
-    skills = _filter_and_rank_skills(tfidf_terms, phrase_candidates, raw_text, max_k=30)
-
-    # keywords: short tokens for search / ATS
-    keywords = []
-    for s in skills:
-        # split comma-delimited multi skills
-        parts = re.split(r"[,/|;]+", s)
-        for p in parts:
-            tok = p.strip()
-            if tok and tok.lower() not in [k.lower() for k in keywords]:
-                keywords.append(tok)
-            if len(keywords) >= 25:
-                break
-        if len(keywords) >= 25:
-            break
-
-    # job title and seniority
-    job_title = _detect_job_title(raw_text, tfidf_terms + phrase_candidates)
-    # compute yrs-of-experience from experience entries if possible
-    years_of_experience = _calculate_total_experience_from_experience_list(experience)
-    seniority = _detect_seniority(raw_text, years_of_experience)
-
-    result = {
-        "status": "success",
-        "personal_info": {
-            "name": name,
-            "emails": list(dict.fromkeys(emails)),
-            "phones": list(dict.fromkeys(phones))
-        },
-        "links": classified_links,
-        "education": education,
-        "certifications": certifications,
-        "skills": skills,
-        "projects": projects,
-        "experience": experience,
-        "keywords": keywords,
-        "job_title": job_title,
-        "seniority": seniority,
-        "years_of_experience": float(years_of_experience) if years_of_experience else 0.0,
-        "raw_sample": raw_text[:1500]
-    }
+    selected = resolve_fields(fields) or PARSE_FIELDS
+    ctx: Dict[str, Any] = {"raw_text": raw_text, "raw_links": links}
+
+    result: Dict[str, Any] = {"status": "success"}
+    with metrics.timer("parse.total"):
+        personal_info = {f: _run_stage(f, ctx) for f in PERSONAL_INFO_FIELDS if f in selected}
+        if personal_info:
+            result["personal_info"] = personal_info
+        for f in PARSE_FIELDS:
+            if f not in PERSONAL_INFO_FIELDS and f in selected:
+                result[f] = _run_stage(f, ctx)
     return result
 
 
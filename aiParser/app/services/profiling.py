@@ -0,0 +1,243 @@
+# app/services/profiling.py
+# Opt-in profiling of single requests: cProfile + tracemalloc, stored on disk.
+#
+#   PROFILING_ENABLED=1 uvicorn app.main:app ...
+#   curl -H "X-API-Key: $API_KEY" -H "X-Profile: 1" -F file=@slow.pdf .../api/v1/resume/upload -D -
+#   -> X-Profile-Id: 20250101T120000-1a2b3c4d
+#   GET /debug/profiles/<id>         summary (top functions, peak allocation)
+#   GET /debug/profiles/<id>/pstats  merged .prof for snakeviz / pstats
+#
+# Work sent to the thread / process pools is profiled inside the worker
+# (profiled_call) and merged into the request's profile.
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import io
+import os
+import json
+import time
+import uuid
+import pstats
+import cProfile
+import logging
+import threading
+import tracemalloc
+import contextvars
+
+logger = logging.getLogger(__name__)
+
+# --------------------------
+# Config
+# --------------------------
+PROFILING_ENABLED = os.getenv("PROFILING_ENABLED", "0") == "1"
+PROFILE_DIR = os.getenv("PROFILE_DIR", os.path.join(".cache", "profiles"))
+PROFILE_TOP_N = int(os.getenv("PROFILE_TOP_N", "40"))
+PROFILE_KEEP = int(os.getenv("PROFILE_KEEP", "50"))          # newest profiles kept on disk
+PROFILE_TRACE_FRAMES = int(os.getenv("PROFILE_TRACE_FRAMES", "1"))
+
+PROFILE_HEADER = "x-profile"
+PROFILE_QUERY = "profile"
+
+# one profiled request at a time: cProfile cannot stack on a thread, and
+# tracemalloc numbers are process-wide anyway
+_busy = threading.Lock()
+
+
+def api_keys() -> List[str]:
+    return [k for k in (os.getenv("API_KEY"), os.getenv("PARSER_API_KEY")) if k]
+
+
+def authorized(api_key: Optional[str]) -> bool:
+    # no key configured -> profiling stays off even when enabled
+    return bool(api_key) and api_key in api_keys()
+
+
+class RequestProfile:
+    def __init__(self, directory: str = PROFILE_DIR):
+        self.id = time.strftime("%Y%m%dT%H%M%S") + "-" + uuid.uuid4().hex[:8]
+        self.directory = directory
+        self.parts: List[str] = []
+        self.worker_peaks: List[int] = []
+        os.makedirs(directory, exist_ok=True)
+
+    def new_part(self) -> str:
+        path = os.path.join(self.directory, f"{self.id}.part{len(self.parts)}.prof")
+        self.parts.append(path)
+        return path
+
+    def path(self, suffix: str) -> str:
+        return os.path.join(self.directory, self.id + suffix)
+
+
+_active: contextvars.ContextVar[Optional[RequestProfile]] = contextvars.ContextVar("request_profile", default=None)
+
+
+def current() -> Optional[RequestProfile]:
+    return _active.get()
+
+
+def profiled_call(part_path: str, fn: Callable[..., Any], *args, **kwargs) -> Tuple[Any, Optional[int]]:
+    """
+    Run `fn` under cProfile (in a worker thread or process), dump the stats to
+    `part_path`, return (result, peak traced bytes or None if the caller is
+    already tracing this process).
+    """
+    own_trace = not tracemalloc.is_tracing()
+    if own_trace:
+        tracemalloc.start(PROFILE_TRACE_FRAMES)
+    profiler: Optional[cProfile.Profile] = cProfile.Profile()
+    try:
+        profiler.enable()
+    except ValueError:
+        # 3.12+: one profiler per interpreter; the request's profiler already sees this thread
+        profiler = None
+    try:
+        result = fn(*args, **kwargs)
+    finally:
+        if profiler is not None:
+            profiler.disable()
+            profiler.dump_stats(part_path)
+        peak = None
+        if own_trace:
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+    return result, peak
+
+
+def _top_functions(stats: pstats.Stats, n: int) -> List[Dict[str, Any]]:
+    rows = []
+    for (filename, line, func), (cc, nc, tt, ct, _) in stats.stats.items():
+        rows.append({
+            "function": f"{func} ({os.path.basename(filename)}:{line})",
+            "file": filename,
+            "ncalls": nc,
+            "tottime": round(tt, 6),
+            "cumtime": round(ct, 6),
+        })
+    rows.sort(key=lambda r: -r["cumtime"])
+    return rows[:n]
+
+
+def _prune(directory: str, keep: int) -> None:
+    try:
+        summaries = sorted(f for f in os.listdir(directory) if f.endswith(".json"))
+    except OSError:
+        return
+    for name in summaries[:-keep] if keep > 0 else []:
+        base = os.path.join(directory, name[: -len(".json")])
+        for suffix in (".json", ".prof"):
+            try:
+                os.remove(base + suffix)
+            except OSError:
+                pass
+
+
+def _finish(profile: RequestProfile, main: cProfile.Profile, started: float, snapshot_before, request, status: int) -> Dict[str, Any]:
+    wall = time.perf_counter() - started
+    peak = tracemalloc.get_traced_memory()[1]
+    growth = tracemalloc.take_snapshot().compare_to(snapshot_before, "lineno")[:10]
+
+    out = io.StringIO()
+    stats = pstats.Stats(main, stream=out)
+    for part in profile.parts:
+        if not os.path.exists(part):
+            continue
+        try:
+            stats.add(part)
+        except Exception:
+            logger.warning("Could not merge worker profile %s", part)
+        finally:
+            try:
+                os.remove(part)
+            except OSError:
+                pass
+    stats.dump_stats(profile.path(".prof"))
+
+    summary = {
+        "id": profile.id,
+        "method": request.method,
+        "path": request.url.path,
+        "status": status,
+        "wall_seconds": round(wall, 4),
+        "peak_traced_bytes": max([peak] + [p for p in profile.worker_peaks if p]),
+        "worker_calls": len(profile.parts),
+        "top_functions": _top_functions(stats, PROFILE_TOP_N),
+        "retained_allocations": [
+            {"site": str(diff.traceback), "size_diff": diff.size_diff, "count_diff": diff.count_diff}
+            for diff in growth
+        ],
+    }
+    with open(profile.path(".json"), "w", encoding="utf-8") as f:
+        json.dump(summary, f, indent=1)
+    _prune(profile.directory, PROFILE_KEEP)
+    return summary
+
+
+def _wants_profile(request) -> bool:
+    flag = request.headers.get(PROFILE_HEADER) or request.query_params.get(PROFILE_QUERY)
+    return flag is not None and flag.lower() in ("1", "true", "yes")
+
+
+async def profiling_middleware(request, call_next):
+    """Profiles the request when asked to (X-Profile: 1 or ?profile=1) by an API-key holder."""
+    if not _wants_profile(request) or not authorized(request.headers.get("x-api-key")):
+        return await call_next(request)
+    if not _busy.acquire(blocking=False):
+        response = await call_next(request)
+        response.headers["X-Profile-Id"] = "busy"
+        return response
+    try:
+        return await _profile_request(request, call_next)
+    finally:
+        _busy.release()
+
+
+async def _profile_request(request, call_next):
+    profile = RequestProfile()
+    token = _active.set(profile)
+    own_trace = not tracemalloc.is_tracing()
+    try:
+        if own_trace:
+            tracemalloc.start(PROFILE_TRACE_FRAMES)
+        tracemalloc.reset_peak()
+        before = tracemalloc.take_snapshot()
+        # the event-loop thread: handler code plus anything else the loop runs meanwhile
+        main = cProfile.Profile()
+        started = time.perf_counter()
+        main.enable()
+        try:
+            response = await call_next(request)
+        finally:
+            main.disable()
+        try:
+            summary = _finish(profile, main, started, before, request, response.status_code)
+        except Exception:
+            # a failed profile write must not fail the request itself
+            logger.exception("Could not write profile %s", profile.id)
+            return response
+    finally:
+        _active.reset(token)
+        if own_trace:
+            tracemalloc.stop()
+
+    response.headers["X-Profile-Id"] = profile.id
+    response.headers["X-Profile-Peak-Bytes"] = str(summary["peak_traced_bytes"])
+    logger.info("Profiled %s %s -> %s (%.3fs)", request.method, request.url.path, profile.id, summary["wall_seconds"])
+    return response
+
+
+def load_summary(profile_id: str) -> Optional[Dict[str, Any]]:
+    path = pstats_path(profile_id)
+    if path is None:
+        return None
+    try:
+        with open(path[: -len(".prof")] + ".json", "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def pstats_path(profile_id: str) -> Optional[str]:
+    # ids are generated here; reject anything that could walk out of PROFILE_DIR
+    if not profile_id or os.path.basename(profile_id) != profile_id or profile_id.startswith("."):
+        return None
+    path = os.path.join(PROFILE_DIR, profile_id + ".prof")
+    return path if os.path.exists(path) else None
@@ -0,0 +1,66 @@
+# app/services/responses.py
+# Response serialization: orjson for every JSON response when it is installed,
+# NDJSON streaming for large result sets.
+from typing import Any, AsyncIterator, Dict, Iterable, Iterator, Optional
+import os
+import json
+
+from fastapi.responses import JSONResponse, ORJSONResponse, StreamingResponse
+
+from app.services.executor import run_in_thread
+
+try:
+    import orjson
+except Exception:
+    orjson = None
+
+# --------------------------
+# Config
+# --------------------------
+# rows serialized per streamed chunk
+STREAM_CHUNK_ROWS = int(os.getenv("STREAM_CHUNK_ROWS", "1000"))
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+# app-wide default response class (see app/main.py)
+DefaultJSONResponse = ORJSONResponse if orjson is not None else JSONResponse
+
+
+def dumps(obj: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, ensure_ascii=False).encode("utf-8")
+
+
+def wants_stream(stream: bool, accept: Optional[str]) -> bool:
+    """?stream=true, or an Accept header asking for NDJSON."""
+    return bool(stream) or (accept is not None and NDJSON_MEDIA_TYPE in accept)
+
+
+def ndjson_chunks(rows: Iterable[Dict[str, Any]], chunk_rows: int = STREAM_CHUNK_ROWS) -> Iterator[bytes]:
+    """One JSON object per line, `chunk_rows` lines per yielded chunk."""
+    lines = []
+    for row in rows:
+        lines.append(dumps(row))
+        if len(lines) >= chunk_rows:
+            yield b"\n".join(lines) + b"\n"
+            lines = []
+    if lines:
+        yield b"\n".join(lines) + b"\n"
+
+
+async def _drain(chunks: Iterator[bytes]) -> AsyncIterator[bytes]:
+    # rows are built and serialized on the worker pool, not the event loop
+    while True:
+        chunk = await run_in_thread(next, chunks, None)
+        if chunk is None:
+            return
+        yield chunk
+
+
+def ndjson_response(rows: Iterable[Dict[str, Any]]) -> StreamingResponse:
+    """
+    Stream `rows` (typically a lazy generator over already-ranked results) as
+    NDJSON: the first lines go out before the rest are even built.
+    """
+    return StreamingResponse(_drain(ndjson_chunks(rows)), media_type=NDJSON_MEDIA_TYPE)
@@ -1,30 +1,127 @@
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+import os
+import asyncio
+
 import fitz  # PyMuPDF
-import tempfile
 
-async def get_resume_text(file):
-    # Save uploaded file temporarily
-    contents = await file.read()
-    with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp:
-        tmp.write(contents)
-        tmp_path = tmp.name
-
-    # Extract text + links
-    text = ""
-    links = []
-    doc = fitz.open(tmp_path)
-    for page in doc:
-        text += page.get_text("text") + "\n"
-
-        # Extract hyperlinks from annotations
-        for link in page.get_links():
-            if "uri" in link and link["uri"]:
-                links.append(link["uri"])
-
-    doc.close()
-    file.file.close()
+from app.services import executor, metrics
+from app.services.executor import run_in_thread
+
+# Upload limits
+MAX_PDF_BYTES = int(os.getenv("MAX_PDF_BYTES", str(10 * 1024 * 1024)))
+MAX_PDF_PAGES = int(os.getenv("MAX_PDF_PAGES", "50"))
+
+# Documents with at least this many pages are split across the PDF process pool
+# (executor.PDF_PROCESSES page ranges)
+PDF_PARALLEL_MIN_PAGES = int(os.getenv("PDF_PARALLEL_MIN_PAGES", "16"))
+
+
+class PdfLimitError(ValueError):
+    """Upload is larger than MAX_PDF_BYTES / MAX_PDF_PAGES."""
+
+
+def _open_pdf(contents: bytes, max_pages: int = MAX_PDF_PAGES):
+    if len(contents) > MAX_PDF_BYTES:
+        raise PdfLimitError(f"File larger than {MAX_PDF_BYTES} bytes")
+    # open straight from memory - no temp file
+    doc = fitz.open(stream=contents, filetype="pdf")
+    if doc.page_count > max_pages:
+        doc.close()
+        raise PdfLimitError(f"PDF has more than {max_pages} pages")
+    return doc
+
+
+def iter_pages(contents: bytes, max_pages: int = MAX_PDF_PAGES) -> Iterator[Tuple[str, List[str]]]:
+    """Yield (text, links) per page, in page order, as each page is decoded."""
+    with _open_pdf(contents, max_pages) as doc:
+        for page in doc:
+            yield _page_output(page)
+
+
+def iter_page_text(contents: bytes, max_pages: int = MAX_PDF_PAGES) -> Iterator[str]:
+    """Streaming per-page text, for stages that can start before the last page."""
+    for text, _ in iter_pages(contents, max_pages):
+        yield text
+
+
+def _page_output(page) -> Tuple[str, List[str]]:
+    # Extract hyperlinks from annotations
+    links = [link["uri"] for link in page.get_links() if link.get("uri")]
+    return page.get_text("text"), links
+
+
+def _extract_page_range(contents: bytes, start: int, stop: int) -> List[Tuple[str, List[str]]]:
+    # runs in a pool worker: each worker opens its own document from the same bytes
+    with fitz.open(stream=contents, filetype="pdf") as doc:
+        return [_page_output(doc[i]) for i in range(start, stop)]
+
+
+def _page_ranges(page_count: int, parts: int) -> List[Tuple[int, int]]:
+    step = -(-page_count // parts)
+    return [(start, min(start + step, page_count)) for start in range(0, page_count, step)]
+
+
+def _combine(pages: List[Tuple[str, List[str]]]) -> Dict[str, Any]:
+    metrics.PDF_PAGES.inc(len(pages))
+
+    links: List[str] = []
+    for _, page_links in pages:
+        links.extend(page_links)
 
     # Return both text and links
     return {
-        "text": text.strip(),
-        "links": list(set(links))  # remove duplicates
+        "text": "\n".join(text for text, _ in pages).strip(),
+        "links": list(dict.fromkeys(links))  # remove duplicates
     }
+
+
+def _extract_all(contents: bytes) -> Dict[str, Any]:
+    with _open_pdf(contents) as doc:
+        return _combine([_page_output(page) for page in doc])
+
+
+def _extract_unless_long(contents: bytes) -> Tuple[Optional[Dict[str, Any]], int]:
+    """(result, page count) for short documents, (None, page count) for long ones."""
+    with _open_pdf(contents) as doc:
+        if doc.page_count >= PDF_PARALLEL_MIN_PAGES and executor.pdf_process_pool() is not None:
+            return None, doc.page_count
+        return _combine([_page_output(page) for page in doc]), doc.page_count
+
+
+def extract_text_and_links(contents: bytes) -> Dict[str, Any]:
+    """All pages in this thread / process (bulk ingest, corpus fitting)."""
+    with metrics.timer("pdf.extract"):
+        return _extract_all(contents)
+
+
+async def extract_text_and_links_async(contents: bytes) -> Dict[str, Any]:
+    """
+    For request handlers: documents of PDF_PARALLEL_MIN_PAGES or more are
+    split into PDF_PROCESSES page ranges extracted on the PDF process pool,
+    and the ranges are awaited instead of blocking a worker thread.
+    """
+    with metrics.timer("pdf.extract"):
+        # fitz releases the GIL -> short documents are done on the worker thread pool
+        result, page_count = await run_in_thread(_extract_unless_long, contents)
+        if result is not None:
+            return result
+        ranges = _page_ranges(page_count, executor.PDF_PROCESSES)
+        parts = await asyncio.gather(*(
+            executor.run_in_pdf_process(_extract_page_range, contents, start, stop) for start, stop in ranges
+        ))
+    return _combine([page for part in parts for page in part])  # gather keeps page order
+
+
+async def read_upload(file, max_bytes: int = MAX_PDF_BYTES) -> bytes:
+    # read one byte past the limit so oversized uploads are rejected without buffering them whole
+    contents = await file.read(max_bytes + 1)
+    await file.close()
+    if len(contents) > max_bytes:
+        raise PdfLimitError(f"File larger than {max_bytes} bytes")
+    return contents
+
+
+async def get_resume_text(file):
+    with metrics.timer("upload.read"):
+        contents = await read_upload(file)
+    return await extract_text_and_links_async(contents)
@@ -0,0 +1,125 @@
+# app/services/resume_dates.py
+# Resume date handling: fast-path parsing, formatting, overlap-aware totals.
+from typing import Iterable, List, Optional, Tuple
+import re
+from datetime import datetime
+from functools import lru_cache
+
+from dateparser import parse as date_parse
+
+# (year, month), month 1-12
+YearMonth = Tuple[int, int]
+
+MONTHS = {
+    "jan": 1, "january": 1, "feb": 2, "february": 2, "mar": 3, "march": 3,
+    "apr": 4, "april": 4, "may": 5, "jun": 6, "june": 6, "jul": 7, "july": 7,
+    "aug": 8, "august": 8, "sep": 9, "sept": 9, "september": 9, "oct": 10, "october": 10,
+    "nov": 11, "november": 11, "dec": 12, "december": 12,
+}
+_MONTH_ABBR = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+
+PRESENT_RE = re.compile(r"\b(present|current|now|to date)\b", re.I)
+YEAR_RE = re.compile(r"\b(19|20)\d{2}\b")
+
+# "Jan 2021", "January, 2021", "Sept. 2019", "Jan '21" (also at the end of a longer string)
+_MONTH_YEAR_RE = re.compile(
+    r"\b(" + "|".join(sorted(MONTHS, key=len, reverse=True)) + r")\.?[\s,-]{0,3}((?:19|20)\d{2}|['’]\d{2})\s*$",
+    re.I,
+)
+# "01/2021", "1.2021", "01-2021"
+_NUM_MONTH_YEAR_RE = re.compile(r"\b(\d{1,2})\s*[/.\-]\s*((?:19|20)\d{2})\s*$")
+# "2021-01", "2021/1"
+_YEAR_NUM_MONTH_RE = re.compile(r"\b((?:19|20)\d{2})\s*[/.\-]\s*(\d{1,2})\s*$")
+# "2019"
+_YEAR_ONLY_RE = re.compile(r"^\s*((?:19|20)\d{2})\s*$")
+
+DATEPARSER_CACHE_SIZE = 4096
+
+
+def _year(text: str) -> int:
+    y = int(text.lstrip("'’"))
+    if y < 100:  # '21 -> 2021, '98 -> 1998
+        y += 2000 if y <= datetime.now().year % 100 + 1 else 1900
+    return y
+
+
+def _fast_path(s: str, end: bool = False) -> Optional[YearMonth]:
+    m = _MONTH_YEAR_RE.search(s)
+    if m:
+        return _year(m.group(2)), MONTHS[m.group(1).lower()]
+    m = _NUM_MONTH_YEAR_RE.search(s)
+    if m and 1 <= int(m.group(1)) <= 12:
+        return int(m.group(2)), int(m.group(1))
+    m = _YEAR_NUM_MONTH_RE.search(s)
+    if m and 1 <= int(m.group(2)) <= 12:
+        return int(m.group(1)), int(m.group(2))
+    m = _YEAR_ONLY_RE.match(s)
+    if m:
+        return int(m.group(1)), 12 if end else 1
+    return None
+
+
+@lru_cache(maxsize=DATEPARSER_CACHE_SIZE)
+def _slow_path(s: str, end: bool = False) -> Optional[YearMonth]:
+    try:
+        dt = date_parse(s, settings={"PREFER_DAY_OF_MONTH": "first",
+                                     "PREFER_MONTH_OF_YEAR": "last" if end else "first"})
+        return (dt.year, dt.month) if dt else None
+    except Exception:
+        # fallback to give year only if present
+        m = YEAR_RE.search(s)
+        if m:
+            return int(m.group(0)), 12 if end else 1
+    return None
+
+
+def parse_year_month(s: Optional[str], end: bool = False) -> Optional[YearMonth]:
+    """
+    Best-effort (year, month) for one side of a date range. A bare year is
+    January as a start and December as an end (`end=True`), so "2019 - 2021"
+    covers both years in full.
+    """
+    if not s:
+        return None
+    s = s.strip()
+    if PRESENT_RE.search(s):
+        now = datetime.now()
+        return now.year, now.month
+    return _fast_path(s, end) or _slow_path(s, end)
+
+
+def format_year_month(ym: Optional[YearMonth]) -> Optional[str]:
+    """(2021, 1) -> "Jan 2021" (same shape as strftime("%b %Y"))."""
+    if not ym:
+        return None
+    year, month = ym
+    return f"{_MONTH_ABBR[month - 1]} {year:04d}"
+
+
+def total_experience_years(ranges: Iterable[Tuple[Optional[YearMonth], Optional[YearMonth]]]) -> float:
+    """
+    Years covered by the union of (start, end) month ranges, both ends inclusive.
+    Overlapping or concurrent roles are only counted once.
+    """
+    spans: List[Tuple[int, int]] = []
+    for start, end in ranges:
+        if not start or not end:
+            continue
+        s = start[0] * 12 + start[1] - 1
+        e = end[0] * 12 + end[1] - 1
+        if e >= s:
+            spans.append((s, e))
+    if not spans:
+        return 0.0
+
+    spans.sort()
+    total = 0
+    cur_s, cur_e = spans[0]
+    for s, e in spans[1:]:
+        if s <= cur_e + 1:
+            cur_e = max(cur_e, e)
+        else:
+            total += cur_e - cur_s + 1
+            cur_s, cur_e = s, e
+    total += cur_e - cur_s + 1
+    return round(total / 12.0, 2)
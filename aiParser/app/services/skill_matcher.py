@@ -0,0 +1,124 @@
+# app/services/skill_matcher.py
+# Skill ontology matcher: token trie over canonical names + aliases.
+from typing import Dict, Iterable, List, Optional, Tuple
+import os
+import re
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+SKILLS_FILE = os.getenv(
+    "SKILLS_FILE",
+    os.path.join(os.path.dirname(os.path.dirname(__file__)), "skills.json"),
+)
+
+# runs of letters/digits, or any single other non-space char: "Next.js" -> next . js, "C++" -> c + +
+TOKEN_RE = re.compile(r"[^\W_]+|[^\w\s]|_")
+
+_END = ""  # trie key holding the canonical name of a phrase ending here
+
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN_RE.findall(text.lower())
+
+
+class SkillMatcher:
+    """
+    Finds ontology skills in a text in one left-to-right pass.
+
+    Every canonical name and alias is inserted into a trie of tokens; at each
+    token the longest phrase starting there wins, so matches respect word
+    boundaries ("java" does not fire inside "javascript") and "c++" beats "c".
+    The cost depends on the length of the text, not on the ontology size.
+    """
+
+    def __init__(self, ontology: Optional[Dict[str, Iterable[str]]] = None):
+        self._trie: Dict[str, dict] = {}
+        self.canonical: Dict[str, str] = {}  # lowercased surface form -> canonical
+        if ontology:
+            self.add_many(ontology)
+
+    def __len__(self) -> int:
+        return len(self.canonical)
+
+    def __contains__(self, name: str) -> bool:
+        return name.lower() in self.canonical
+
+    def add(self, canonical: str, aliases: Iterable[str] = ()) -> None:
+        canonical = canonical.strip().lower()
+        for surface in [canonical, *aliases]:
+            tokens = tokenize(surface)
+            if not tokens:
+                continue
+            node = self._trie
+            for tok in tokens:
+                node = node.setdefault(tok, {})
+            node[_END] = canonical
+            self.canonical[" ".join(tokens)] = canonical
+            self.canonical[surface.strip().lower()] = canonical
+
+    def add_many(self, ontology: Dict[str, Iterable[str]]) -> None:
+        for canonical, aliases in ontology.items():
+            self.add(canonical, aliases or ())
+
+    def canonicalize(self, name: str) -> Optional[str]:
+        key = name.strip().lower()
+        return self.canonical.get(key) or self.canonical.get(" ".join(tokenize(key)))
+
+    def match(self, text: str) -> Dict[str, int]:
+        """`{canonical: occurrences}` in order of first occurrence."""
+        tokens = tokenize(text)
+        counts: Dict[str, int] = {}
+        trie = self._trie
+        i, n = 0, len(tokens)
+        while i < n:
+            node = trie.get(tokens[i])
+            if node is None:
+                i += 1
+                continue
+            found: Optional[Tuple[int, str]] = None
+            j = i
+            while node is not None:
+                if _END in node:
+                    found = (j + 1, node[_END])
+                j += 1
+                if j >= n:
+                    break
+                node = node.get(tokens[j])
+            if found is None:
+                i += 1
+                continue
+            end, name = found
+            counts[name] = counts.get(name, 0) + 1
+            i = end
+        return counts
+
+
+def load_ontology(path: str = SKILLS_FILE) -> Dict[str, List[str]]:
+    """
+    Ontology file format: `{"skills": {"javascript": ["js", "ecmascript"], ...}}`
+    (a bare `{canonical: [aliases]}` object or a list of names also works).
+    """
+    if not path or not os.path.exists(path) or os.path.getsize(path) == 0:
+        return {}
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            raw = json.load(f)
+    except Exception:
+        logger.exception("Could not load skill ontology %s", path)
+        return {}
+    if isinstance(raw, dict) and "skills" in raw:
+        raw = raw["skills"]
+    if isinstance(raw, list):
+        return {name: [] for name in raw}
+    return {name: list(aliases or []) for name, aliases in raw.items()}
+
+
+def build_matcher(base: Iterable[str], path: str = SKILLS_FILE) -> SkillMatcher:
+    matcher = SkillMatcher({name: [] for name in base})
+    ontology = load_ontology(path)
+    if ontology:
+        matcher.add_many(ontology)
+    logger.info("Skill matcher ready: %d surface forms", len(matcher))
+    return matcher
@@ -0,0 +1,100 @@
+# app/services/text_scanner.py
+# Precompiled, backtracking-safe patterns + a single-pass contact/link scanner.
+#
+# Every pattern here is either anchored on a literal ("@", "http", "www.") or
+# built from bounded quantifiers, so the cost of a scan grows linearly with the
+# input even for adversarial PDF text (huge lines, no separators).
+# benchmarks/regex_fuzz.py measures the worst cases.
+from typing import List, NamedTuple, Optional
+import re
+
+from app.services.resume_dates import MONTHS, YEAR_RE
+
+# heuristics that work line by line only look at this much of a line
+MAX_LINE_SCAN_CHARS = 1000
+
+# --------------------------
+# Patterns
+# --------------------------
+# the look-behind stops the local part from being retried at every position
+# inside a long run of word characters (the classic quadratic email regex)
+_EMAIL = r"(?<![a-zA-Z0-9._%+\-])[a-zA-Z0-9._%+\-]{1,64}@[a-zA-Z0-9.\-]{1,253}\.[A-Za-z]{2,24}(?![A-Za-z])"
+_URL = r"https?://[^\s)]{1,2048}|www\.[^\s)]{1,2048}"
+_PHONE = r"(?:\+?\d{1,3}[\s\-])?(?:\(?\d{2,4}\)?[\s\-])?\d{3,4}[\s\-]?\d{3,4}"
+_YEAR = r"\b(?:19|20)\d{2}\b"
+
+EMAIL_RE = re.compile(_EMAIL, re.I)
+URL_RE = re.compile(_URL, re.I)
+PHONE_RE = re.compile(_PHONE)
+HTTP_SCHEME_RE = re.compile(r"^https?://", re.I)
+
+# one alternation, one pass. Order matters: an email or URL claims its digits
+# before the phone branch can see them.
+_CONTACT_RE = re.compile(
+    rf"(?P<email>{_EMAIL})|(?P<url>{_URL})|(?P<phone>{_PHONE})|(?P<year>{_YEAR})",
+    re.I,
+)
+
+# "Jan 2020 - Present", "01/2019 – 03/2021", "2018.05 - 2020", "Sept. 2019 - Dec '21".
+# Month words come from a fixed list instead of \w+, and every gap is bounded.
+_MONTH = r"(?:" + "|".join(sorted(MONTHS, key=len, reverse=True)) + r")\.?,?"
+_DATE = (
+    rf"(?:{_MONTH}\s{{0,3}}(?:(?:19|20)\d{{2}}|['’]?\d{{2}}(?!\d))"
+    r"|\d{1,2}\s{0,2}[/.\-]\s{0,2}(?:19|20)\d{2}"
+    r"|(?:19|20)\d{2}(?:\s{0,2}[/.\-]\s{0,2}\d{1,2}(?!\d))?)"
+)
+DATE_RANGE_RE = re.compile(
+    rf"(?<![\w])(?P<start>{_DATE})\s{{0,5}}[-–—]\s{{0,5}}(?P<end>present|current|now|{_DATE})",
+    re.I,
+)
+
+# "Frontend Developer at Acme", "Designer @ Studio", "Engineer | Company".
+# The role ends and the company starts on a non-space, so the \s+ around the
+# separator never fight the character classes over the same whitespace.
+ROLE_COMPANY_RE = re.compile(
+    r"(?P<role>[\w\-/&\.,][\w\-\s/&\.,]{0,78}[\w\-/&\.,])\s+(?:at|@|\|)\s+(?P<company>[\w\-\.,&/][\w\-\s\.,&/]{1,119})",
+    re.I,
+)
+# cheap pre-check before the role / company pattern
+_ROLE_SEPARATOR_RE = re.compile(r"\s(?:at|@|\|)\s", re.I)
+
+
+class ContactScan(NamedTuple):
+    emails: List[str]
+    phones: List[str]
+    urls: List[str]
+    years: List[str]
+
+
+def scan_contacts(text: str) -> ContactScan:
+    """
+    Emails, phone numbers, URLs and years in one left-to-right pass; each list
+    is de-duplicated in order of appearance. Phone-like matches that contain a
+    year ("2019 2020 2021") are dropped.
+    """
+    emails, phones, urls, years = {}, {}, {}, {}
+    for m in _CONTACT_RE.finditer(text or ""):
+        kind = m.lastgroup
+        value = m.group(kind)
+        if kind == "email":
+            emails[value] = None
+        elif kind == "url":
+            urls[value] = None
+        elif kind == "phone":
+            if not YEAR_RE.search(value):
+                phones[value] = None
+        else:
+            years[value] = None
+    return ContactScan(list(emails), list(phones), list(urls), list(years))
+
+
+def scan_line(line: str) -> str:
+    """The part of a line the per-line heuristics look at."""
+    return line[:MAX_LINE_SCAN_CHARS]
+
+
+def match_role_company(line: str) -> Optional["re.Match"]:
+    line = scan_line(line)
+    if not _ROLE_SEPARATOR_RE.search(line):
+        return None
+    return ROLE_COMPANY_RE.search(line)
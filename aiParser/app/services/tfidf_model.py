@@ -0,0 +1,163 @@
+# app/services/tfidf_model.py
+# Corpus-level IDF model for keyword ranking (fit offline, transform-only per request).
+#
+# No model ships with the app: document frequencies must come from the resumes
+# and job postings this deployment actually sees. Fit one on such a corpus
+# and point TFIDF_MODEL_PATH at it:
+#
+#   python -m app.services.tfidf_model fit ./corpus --out /srv/aiparser/tfidf_idf.json.gz
+#   TFIDF_MODEL_PATH=/srv/aiparser/tfidf_idf.json.gz uvicorn app.main:app
+#
+# Unset / empty TFIDF_MODEL_PATH ranks keywords by raw term frequency (logged
+# at startup); a configured path that cannot be read stops the import.
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+import os
+import sys
+import gzip
+import json
+import math
+import logging
+import argparse
+import threading
+from collections import Counter
+
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+logger = logging.getLogger(__name__)
+
+# fitted model file; empty = no model (every idf is 1: raw term frequency)
+TFIDF_MODEL_PATH = os.getenv("TFIDF_MODEL_PATH", "")
+
+# same tokenization as the per-resume TfidfVectorizer this replaces
+_analyzer: Callable[[str], List[str]] = TfidfVectorizer(stop_words="english", ngram_range=(1, 2)).build_analyzer()
+
+
+def analyze(text: str) -> List[str]:
+    return _analyzer(text)
+
+
+class IdfModel:
+    """
+    Document frequencies over a resume + job corpus.
+
+    idf(t) = ln((1 + N) / (1 + df(t))) + 1, as sklearn's smooth_idf. Terms never
+    seen in the corpus get the maximum idf, so rare terms rank high. With an
+    empty model every idf is 1 and ranking falls back to raw term frequency.
+    """
+
+    def __init__(self, n_docs: int = 0, df: Optional[Dict[str, int]] = None):
+        self.n_docs = n_docs
+        self.df: Dict[str, int] = df or {}
+        self._lock = threading.Lock()
+
+    def idf(self, term: str) -> float:
+        return math.log((1 + self.n_docs) / (1 + self.df.get(term, 0))) + 1.0
+
+    def update(self, texts: Iterable[str]) -> None:
+        """Incremental fit: add documents to the frequency counts."""
+        for text in texts:
+            terms = set(analyze(text))
+            with self._lock:
+                self.n_docs += 1
+                for t in terms:
+                    self.df[t] = self.df.get(t, 0) + 1
+
+    def top_terms(self, text: str, top_n: int = 80) -> List[str]:
+        if not text or not text.strip():
+            return []
+        tf = Counter(analyze(text))
+        if not tf:
+            return []
+        scored = sorted(((count * self.idf(term), term) for term, count in tf.items()), key=lambda x: (-x[0], x[1]))
+        return [term for _, term in scored[:top_n]]
+
+    # --------------------------
+    # Persistence
+    # --------------------------
+    def save(self, path: str, min_df: int = 2, max_terms: Optional[int] = None) -> None:
+        """Write a gzip'd JSON model; rare terms (df < min_df) are dropped to stay compact."""
+        terms = [(t, c) for t, c in self.df.items() if c >= min_df]
+        if max_terms:
+            terms = sorted(terms, key=lambda x: -x[1])[:max_terms]
+        tmp = path + ".tmp"
+        with gzip.open(tmp, "wt", encoding="utf-8") as f:
+            json.dump({"n_docs": self.n_docs, "df": dict(terms)}, f, separators=(",", ":"))
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str) -> "IdfModel":
+        """
+        Read a model written by `save`. A missing or unreadable file raises:
+        silently ranking by raw term frequency is what this model replaced.
+        """
+        if not path:
+            logger.warning("No IDF model (TFIDF_MODEL_PATH unset): keywords ranked by raw term frequency")
+            return cls()
+        if not os.path.exists(path):
+            raise FileNotFoundError(
+                f"IDF model {path} not found; fit one with `python -m app.services.tfidf_model fit <corpus> "
+                f"--out {path}` or unset TFIDF_MODEL_PATH to run without one"
+            )
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            raw = json.load(f)
+        model = cls(int(raw.get("n_docs", 0)), {t: int(c) for t, c in raw.get("df", {}).items()})
+        logger.info("Loaded IDF model: %d docs, %d terms", model.n_docs, len(model.df))
+        return model
+
+
+# process-wide model, loaded once and read-only afterwards: every worker
+# process ranks with the same frequencies, so parse output is reproducible.
+# Not loaded when this file runs as the `fit` CLI, which may be creating it.
+idf_model = IdfModel.load(TFIDF_MODEL_PATH) if __name__ != "__main__" else IdfModel()
+
+
+# --------------------------
+# Offline fitting
+# --------------------------
+def iter_corpus(root: str) -> Iterator[str]:
+    """.txt files, .pdf files and .ndjson/.jsonl files with a "text" (or "resumeText") field."""
+    paths = [root] if os.path.isfile(root) else [
+        os.path.join(d, f) for d, _, files in os.walk(root) for f in sorted(files)
+    ]
+    for path in paths:
+        low = path.lower()
+        try:
+            if low.endswith(".txt"):
+                with open(path, "r", encoding="utf-8", errors="replace") as f:
+                    yield f.read()
+            elif low.endswith(".pdf"):
+                from app.services.resumeText import extract_text_and_links
+                with open(path, "rb") as f:
+                    yield extract_text_and_links(f.read())["text"]
+            elif low.endswith((".ndjson", ".jsonl")):
+                with open(path, "r", encoding="utf-8") as f:
+                    for line in f:
+                        row = json.loads(line)
+                        text = row.get("text") or row.get("resumeText")
+                        if text:
+                            yield text
+        except Exception as e:
+            logger.warning("Skipping %s: %s", path, e)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description="Fit / update the corpus IDF model.")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    fit = sub.add_parser("fit", help="fit on a corpus (add --update to extend the existing model)")
+    fit.add_argument("corpus", help="directory or file of resumes / job postings")
+    fit.add_argument("--out", default=TFIDF_MODEL_PATH or None, required=not TFIDF_MODEL_PATH,
+                     help="model file (default: TFIDF_MODEL_PATH)")
+    fit.add_argument("--update", action="store_true", help="start from the model at --out")
+    fit.add_argument("--min-df", type=int, default=2)
+    fit.add_argument("--max-terms", type=int, default=200000)
+    args = ap.parse_args(argv)
+
+    model = IdfModel.load(args.out) if args.update else IdfModel()
+    model.update(iter_corpus(args.corpus))
+    model.save(args.out, min_df=args.min_df, max_terms=args.max_terms)
+    print(f"IDF model: {model.n_docs} documents -> {args.out}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
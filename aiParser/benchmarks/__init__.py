@@ -0,0 +1,2 @@
+# benchmarks/
+# Performance checks for the parser and matching services (not part of the app).
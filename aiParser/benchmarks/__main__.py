@@ -0,0 +1,87 @@
+# benchmarks/__main__.py
+#
+#   python -m benchmarks run --stub-encoder --scales 10,1000 --out bench.json
+#   python -m benchmarks compare baseline.json bench.json --tolerance 0.1
+#   python -m benchmarks.corpus --out ./bench-corpus --resumes 100 --pdf
+#   python -m benchmarks.regex_fuzz
+#   python -m benchmarks.loadgen --stub-encoder --concurrency 1,4,16 --duration 20
+#   python -m benchmarks.encoder_parity --backend torch-int8
+#   python -m benchmarks.compact_vectors --vectors 300000
+from typing import List, Optional
+import os
+import sys
+import argparse
+
+from benchmarks import harness
+
+SUITES = ("stages", "e2e")
+ENDPOINTS = ("upload", "match-jobs", "match-candidates")
+
+
+def cmd_run(args) -> int:
+    harness.prepare_app_environment(args.stub_encoder)
+    from benchmarks import e2e, stages
+    from benchmarks.corpus import generate_resumes
+
+    suites = [s.strip() for s in args.suite.split(",") if s.strip()]
+    scales = [int(s) for s in args.scales.split(",") if s.strip()]
+    endpoints = [e.strip() for e in args.endpoints.split(",") if e.strip()]
+
+    results = {}
+    if "stages" in suites:
+        results.update(stages.run(generate_resumes(args.stage_docs, args.seed), pdf_samples=args.pdf_samples))
+    if "e2e" in suites:
+        results.update(e2e.run(scales, args.seed, args.repeat, endpoints))
+
+    harness.print_table(results)
+    if args.out:
+        meta = harness.run_metadata(
+            seed=args.seed, scales=scales, suites=suites,
+            encoder="stub" if args.stub_encoder else os.getenv("SENTENCE_MODEL", "default"),
+            encoder_backend=os.getenv("SENTENCE_BACKEND", "torch"),
+        )
+        harness.write_results(args.out, meta, results)
+        print(f"results -> {args.out}", file=sys.stderr)
+    return 0
+
+
+def cmd_compare(args) -> int:
+    base, new = harness.load_results(args.base), harness.load_results(args.new)
+    rows = harness.compare(base, new, args.metric, args.tolerance)
+    print(f"{'benchmark':44} {'base':>10} {'new':>10} {'change':>8}")
+    for r in rows:
+        change = f"{r['change'] * 100:+.1f}%" if r["change"] is not None else "n/a"
+        flag = "  REGRESSION" if r["regression"] else ""
+        print(f"{r['benchmark']:44} {str(r['base']):>10} {str(r['new']):>10} {change:>8}{flag}")
+    return 1 if any(r["regression"] for r in rows) else 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(prog="python -m benchmarks", description="aiParser benchmarks")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+
+    run = sub.add_parser("run", help="run benchmark suites and write a JSON result file")
+    run.add_argument("--suite", default=",".join(SUITES), help=f"comma-separated: {', '.join(SUITES)}")
+    run.add_argument("--scales", default="10,1000,10000", help="item counts for the end-to-end suite")
+    run.add_argument("--endpoints", default=",".join(ENDPOINTS))
+    run.add_argument("--repeat", type=int, default=5, help="warm requests per match benchmark")
+    run.add_argument("--stage-docs", type=int, default=200, help="resumes for the stage microbenchmarks")
+    run.add_argument("--pdf-samples", type=int, default=20)
+    run.add_argument("--seed", type=int, default=0)
+    run.add_argument("--stub-encoder", action="store_true", help="deterministic hashing encoder instead of the model")
+    run.add_argument("--out", help="result file (JSON)")
+    run.set_defaults(fn=cmd_run)
+
+    cmp_ = sub.add_parser("compare", help="compare two result files; exit 1 on regressions")
+    cmp_.add_argument("base")
+    cmp_.add_argument("new")
+    cmp_.add_argument("--metric", default="p50_ms")
+    cmp_.add_argument("--tolerance", type=float, default=0.10, help="allowed slowdown (0.10 = 10%%)")
+    cmp_.set_defaults(fn=cmd_compare)
+
+    args = ap.parse_args(argv)
+    return args.fn(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
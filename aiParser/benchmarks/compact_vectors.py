@@ -0,0 +1,113 @@
+# benchmarks/compact_vectors.py
+# Memory saved vs. ranking agreement for float16 / int8 catalog vectors
+# (app/services/compact_vectors.py), against float32.
+#
+#   python -m benchmarks.compact_vectors --vectors 300000 --dim 768
+#   python -m benchmarks.compact_vectors --source stub --vectors 20000 --out compact.json
+from typing import Any, Dict, List, Optional
+import sys
+import argparse
+
+import numpy as np
+
+from benchmarks import harness
+
+
+def synthetic_embeddings(n: int, dim: int, seed: int, rank: int = 64) -> np.ndarray:
+    """
+    Normalized vectors with sentence-embedding-like structure: a shared mean
+    direction plus a low-rank topic component plus noise, so similarities
+    cluster well above zero instead of around it.
+    """
+    rng = np.random.default_rng(seed)
+    mean = rng.normal(size=dim).astype(np.float32)
+    basis = rng.normal(size=(rank, dim)).astype(np.float32)
+    out = np.empty((n, dim), dtype=np.float32)
+    for start in range(0, n, 65536):
+        m = min(65536, n - start)
+        x = 0.6 * mean + rng.normal(size=(m, rank)).astype(np.float32) @ basis / np.sqrt(rank)
+        x += 0.3 * rng.normal(size=(m, dim)).astype(np.float32)
+        out[start:start + m] = x / np.linalg.norm(x, axis=1, keepdims=True)
+    return out
+
+
+def stub_embeddings(n: int, seed: int) -> np.ndarray:
+    from benchmarks.corpus import generate_resumes
+    from benchmarks.stub_encoder import HashingEncoder
+    return HashingEncoder().encode([r["text"] for r in generate_resumes(n, seed)])
+
+
+def _overlap(ref_top: np.ndarray, top: np.ndarray) -> float:
+    return float(np.mean([len(set(a) & set(b)) / len(a) for a, b in zip(ref_top.tolist(), top.tolist())]))
+
+
+def run(pool: np.ndarray, queries: np.ndarray, ks: List[int]) -> Dict[str, Dict[str, Any]]:
+    from app.scoring import to_percentages
+    from app.services.compact_vectors import DTYPES, VectorBlock
+
+    ref_scores = None
+    ref_top = {}
+    results: Dict[str, Dict[str, Any]] = {}
+    for dtype in DTYPES:
+        block = VectorBlock.from_float(pool, dtype)
+        block @ queries[0]  # warm-up
+        samples, scores = [], []
+        for q in queries:
+            samples.append(harness.time_call(lambda: scores.append(block @ q)))
+        scores = np.stack(scores, axis=1)  # (pool, queries)
+
+        stats = harness.summarize(samples, items=len(block))
+        stats["bytes"] = block.nbytes
+        stats["bytes_per_vector"] = round(block.nbytes / len(block), 1)
+        if ref_scores is None:
+            ref_scores = scores
+            ref_bytes = block.nbytes
+        stats["memory_ratio"] = round(block.nbytes / ref_bytes, 4)
+        stats["max_abs_error"] = round(float(np.abs(scores - ref_scores).max()), 6)
+        # matchPercentage is reported with 2 decimals: how often it changes
+        stats["percentage_changed"] = round(float(np.mean(to_percentages(scores) != to_percentages(ref_scores))), 4)
+        for k in ks:
+            top = np.argsort(-scores, axis=0)[:k].T
+            ref_top.setdefault(k, top)
+            stats[f"top{k}_overlap"] = round(_overlap(ref_top[k], top), 4)
+        results[f"compact.{dtype}"] = stats
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description="float16 / int8 embedding storage vs float32")
+    ap.add_argument("--source", choices=("synthetic", "stub"), default="synthetic",
+                    help="synthetic dense vectors (fast, any size) or stub-encoded corpus resumes")
+    ap.add_argument("--vectors", type=int, default=100000, help="pool size (e.g. registered seekers)")
+    ap.add_argument("--dim", type=int, default=768, help="synthetic only (all-mpnet-base-v2: 768)")
+    ap.add_argument("--queries", type=int, default=50)
+    ap.add_argument("--k", default="10,100", help="comma-separated top-k for ranking agreement")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--out", help="result file (JSON)")
+    args = ap.parse_args(argv)
+
+    total = args.vectors + args.queries
+    if args.source == "stub":
+        data = stub_embeddings(total, args.seed)
+    else:
+        data = synthetic_embeddings(total, args.dim, args.seed)
+    pool, queries = data[:args.vectors], data[args.vectors:]
+    ks = [int(k) for k in args.k.split(",") if k.strip()]
+
+    results = run(pool, queries, ks)
+    print(f"{'storage':16} {'MB':>9} {'ratio':>7} {'p50 ms/query':>13} {'max err':>9} {'pct chg':>8} " +
+          " ".join(f"{'top' + str(k):>7}" for k in ks))
+    for name, r in results.items():
+        print(f"{name:16} {r['bytes'] / 2**20:9.1f} {r['memory_ratio']:7.3f} {r['p50_ms']:13.3f} "
+              f"{r['max_abs_error']:9.5f} {r['percentage_changed']:8.4f} " +
+              " ".join(f"{r[f'top{k}_overlap']:7.4f}" for k in ks))
+    if args.out:
+        meta = harness.run_metadata(source=args.source, vectors=args.vectors, dim=int(pool.shape[1]),
+                                    queries=args.queries, seed=args.seed)
+        harness.write_results(args.out, meta, results)
+        print(f"results -> {args.out}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
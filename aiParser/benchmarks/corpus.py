@@ -0,0 +1,211 @@
+# benchmarks/corpus.py
+# Seeded synthetic resumes (text / PDF) and job postings.
+#
+#   python -m benchmarks.corpus --out ./bench-corpus --resumes 200 --jobs 50 --pdf
+#
+# Same seed -> byte-identical corpus, so benchmark runs are comparable.
+from typing import Any, Dict, List, Optional
+import os
+import sys
+import json
+import random
+import argparse
+
+FIRST_NAMES = ["Ana", "Ben", "Chloe", "Diego", "Emeka", "Fatima", "George", "Hana", "Ivan", "Julia",
+               "Kofi", "Lena", "Mateo", "Nadia", "Omar", "Priya", "Quinn", "Rosa", "Sami", "Tara"]
+LAST_NAMES = ["Alvarez", "Brown", "Chen", "Dubois", "Evans", "Fischer", "Garcia", "Haddad", "Ivanova",
+              "Jensen", "Kim", "Lopez", "Müller", "Nakamura", "Okafor", "Patel", "Rossi", "Silva", "Tanaka"]
+COMPANIES = ["Acme Corp", "Globex", "Initech", "Umbrella Health", "Stark Industries", "Wayne Finance",
+             "Hooli", "Vandelay Imports", "Soylent Labs", "Cyberdyne", "Northwind Traders", "Contoso"]
+SCHOOLS = ["State University", "Institute of Technology", "City College", "National University",
+           "Polytechnic School", "University of the Arts"]
+DEGREES = ["BSc Computer Science", "BA Economics", "MSc Data Science", "BSN Nursing", "MBA",
+           "BFA Graphic Design", "BEng Electrical Engineering", "Diploma in Accounting"]
+
+# domain -> (job titles, skills, bullet templates)
+DOMAINS: Dict[str, Dict[str, List[str]]] = {
+    "software": {
+        "titles": ["Software Engineer", "Frontend Developer", "Backend Developer", "Full Stack Developer"],
+        "skills": ["Python", "JavaScript", "TypeScript", "React", "Node.js", "Django", "Docker",
+                   "Kubernetes", "AWS", "PostgreSQL", "Git", "REST APIs", "GraphQL", "CI/CD"],
+        "bullets": ["Built {skill} services handling {n}k requests per day",
+                    "Migrated legacy modules to {skill}, cutting latency by {p}%",
+                    "Led a team of {k} engineers delivering {skill} features",
+                    "Wrote automated tests with {skill}, raising coverage to {p}%"],
+    },
+    "data": {
+        "titles": ["Data Scientist", "Data Analyst", "Machine Learning Engineer"],
+        "skills": ["Python", "SQL", "Pandas", "NumPy", "scikit-learn", "TensorFlow", "PyTorch",
+                   "Statistics", "Machine Learning", "NLP", "Tableau", "Spark"],
+        "bullets": ["Trained {skill} models improving forecast accuracy by {p}%",
+                    "Automated {skill} reporting for {k} business units",
+                    "Analyzed {n}M rows with {skill} to find churn drivers"],
+    },
+    "healthcare": {
+        "titles": ["Registered Nurse", "Clinical Research Coordinator", "Medical Assistant"],
+        "skills": ["Patient Care", "EMR", "Phlebotomy", "Clinical Research", "BLS", "Triage",
+                   "Medication Administration", "HIPAA"],
+        "bullets": ["Provided {skill} for up to {k} patients per shift",
+                    "Coordinated {skill} across {k} departments",
+                    "Trained {k} new staff on {skill} procedures"],
+    },
+    "finance": {
+        "titles": ["Financial Analyst", "Accountant", "Project Manager"],
+        "skills": ["Excel", "Financial Analysis", "Budgeting", "Accounting", "Forecasting",
+                   "Power BI", "SAP", "Project Management", "Risk Management"],
+        "bullets": ["Owned {skill} for a ${n}M portfolio",
+                    "Reduced month-end close by {k} days with {skill} automation",
+                    "Presented {skill} findings to {k} executives"],
+    },
+    "design": {
+        "titles": ["Graphic Designer", "UX Designer", "UI Designer"],
+        "skills": ["Figma", "Photoshop", "Illustrator", "UI/UX", "Sketch", "Prototyping",
+                   "User Research", "After Effects"],
+        "bullets": ["Designed {skill} assets for {k} product launches",
+                    "Ran {k} rounds of {skill} with customers",
+                    "Rebuilt the design system in {skill}, used by {k} teams"],
+    },
+}
+MONTHS = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+
+
+def _date(rng: random.Random, year: int) -> str:
+    style = rng.random()
+    month = rng.randint(1, 12)
+    if style < 0.6:
+        return f"{MONTHS[month - 1]} {year}"
+    if style < 0.85:
+        return f"{month:02d}/{year}"
+    return str(year)
+
+
+def _bullet(rng: random.Random, template: str, skills: List[str]) -> str:
+    return template.format(skill=rng.choice(skills), n=rng.randint(2, 900), p=rng.randint(5, 80), k=rng.randint(2, 30))
+
+
+def make_resume(rng: random.Random, idx: int) -> Dict[str, Any]:
+    domain = rng.choice(sorted(DOMAINS))
+    d = DOMAINS[domain]
+    first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+    handle = f"{first}{last}".lower().replace("ü", "u")
+    skills = rng.sample(d["skills"], k=min(len(d["skills"]), rng.randint(5, 10)))
+    links = [f"https://linkedin.com/in/{handle}{idx}"]
+    if domain in ("software", "data"):
+        links.append(f"https://github.com/{handle}{idx}")
+    if domain == "design":
+        links.append(f"https://www.behance.net/{handle}{idx}")
+
+    lines = [
+        f"{first} {last}",
+        f"{rng.choice(d['titles'])}",
+        f"{handle}.{idx}@example.com | +1 {rng.randint(200, 989)}-555-{rng.randint(1000, 9999)} | {links[0]}",
+        "",
+        "Summary",
+        f"{rng.choice(['Detail-oriented', 'Results-driven', 'Curious', 'Pragmatic'])} {domain} professional "
+        f"with experience in {', '.join(skills[:3])}.",
+        "",
+        "Experience",
+    ]
+    year = 2024
+    for _ in range(rng.randint(1, 4)):
+        start = year - rng.randint(1, 4)
+        end = "Present" if year == 2024 and rng.random() < 0.5 else _date(rng, year)
+        lines.append(f"{rng.choice(d['titles'])} at {rng.choice(COMPANIES)}")
+        lines.append(f"{_date(rng, start)} - {end}")
+        for _ in range(rng.randint(2, 5)):
+            lines.append("- " + _bullet(rng, rng.choice(d["bullets"]), skills))
+        year = start - rng.randint(0, 1)
+    lines += ["", "Education", f"{rng.choice(DEGREES)}, {rng.choice(SCHOOLS)} {year - rng.randint(0, 4)}", ""]
+    lines += ["Skills", ", ".join(skills), ""]
+    if domain in ("software", "data", "design"):
+        lines += ["Projects"]
+        for p in range(rng.randint(1, 3)):
+            lines.append(f"{rng.choice(['Portfolio website', 'Open source app', 'Dashboard project', 'Clone project'])} {p + 1}")
+            lines.append(_bullet(rng, rng.choice(d["bullets"]), skills))
+        lines.append("")
+    if rng.random() < 0.5:
+        lines += ["Certifications", rng.choice(["AWS Certified Developer", "PMP", "BLS Certification",
+                                                "Google Data Analytics", "CPA", "Scrum Master"])]
+
+    return {
+        "id": f"seeker-{idx}",
+        "domain": domain,
+        "text": "\n".join(lines).strip(),
+        "links": links,
+    }
+
+
+def make_job(rng: random.Random, idx: int) -> Dict[str, Any]:
+    domain = rng.choice(sorted(DOMAINS))
+    d = DOMAINS[domain]
+    title = rng.choice(d["titles"])
+    skills = rng.sample(d["skills"], k=min(len(d["skills"]), rng.randint(4, 8)))
+    text = (
+        f"{rng.choice(COMPANIES)} is hiring a {title}. "
+        f"You will {rng.choice(['build', 'own', 'improve', 'support'])} {rng.choice(['core', 'new', 'customer-facing'])} "
+        f"{domain} work with a team of {rng.randint(3, 40)}. "
+        f"Requirements: {', '.join(skills)}. {rng.randint(1, 8)}+ years of experience. "
+        f"Nice to have: {rng.choice(d['skills'])}."
+    )
+    return {"jobId": f"job-{idx}", "title": title, "text": text, "domain": domain}
+
+
+def generate_resumes(n: int, seed: int = 0) -> List[Dict[str, Any]]:
+    rng = random.Random(seed)
+    return [make_resume(rng, i) for i in range(n)]
+
+
+def generate_jobs(n: int, seed: int = 0) -> List[Dict[str, Any]]:
+    rng = random.Random(seed + 1_000_003)
+    return [make_job(rng, i) for i in range(n)]
+
+
+def render_pdf(resume: Dict[str, Any]) -> bytes:
+    """One resume as a PDF (PyMuPDF), with its links as URI annotations."""
+    import fitz  # PyMuPDF
+
+    doc = fitz.open()
+    lines = resume["text"].splitlines()
+    per_page = 55
+    for start in range(0, len(lines), per_page):
+        page = doc.new_page()
+        y = 56
+        for line in lines[start:start + per_page]:
+            page.insert_text((56, y), line, fontsize=10)
+            y += 13
+    first = doc[0]
+    for i, url in enumerate(resume.get("links", [])):
+        rect = fitz.Rect(56, 40 - 10 * i, 300, 48 - 10 * i)
+        first.insert_link({"kind": fitz.LINK_URI, "from": rect, "uri": url})
+    data = doc.tobytes(deflate=True)
+    doc.close()
+    return data
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description="Write a seeded synthetic resume / job corpus.")
+    ap.add_argument("--out", required=True)
+    ap.add_argument("--resumes", type=int, default=100)
+    ap.add_argument("--jobs", type=int, default=50)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--pdf", action="store_true", help="also render each resume as a PDF")
+    args = ap.parse_args(argv)
+
+    os.makedirs(os.path.join(args.out, "resumes"), exist_ok=True)
+    resumes = generate_resumes(args.resumes, args.seed)
+    for r in resumes:
+        base = os.path.join(args.out, "resumes", r["id"])
+        with open(base + ".txt", "w", encoding="utf-8") as f:
+            f.write(r["text"])
+        if args.pdf:
+            with open(base + ".pdf", "wb") as f:
+                f.write(render_pdf(r))
+    with open(os.path.join(args.out, "jobs.ndjson"), "w", encoding="utf-8") as f:
+        for job in generate_jobs(args.jobs, args.seed):
+            f.write(json.dumps(job) + "\n")
+    print(f"{args.resumes} resumes, {args.jobs} jobs -> {args.out}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,96 @@
+# benchmarks/e2e.py
+# End-to-end benchmarks through the FastAPI app (in-process ASGI client).
+from typing import Any, Dict, List
+
+from benchmarks.corpus import generate_jobs, generate_resumes, render_pdf
+from benchmarks.harness import API_KEY, summarize, time_call
+
+# candidate matching scores every job against every seeker: cap the job side
+MAX_CANDIDATE_JOBS = 1000
+
+
+def _check(response) -> None:
+    if response.status_code != 200:
+        raise RuntimeError(f"{response.request.url}: {response.status_code} {response.text[:200]}")
+
+
+def bench_upload(client, n: int, seed: int) -> Dict[str, Any]:
+    """n distinct PDFs, one request each: extraction + parsing, nothing cached."""
+    pdfs = [render_pdf(r) for r in generate_resumes(n, seed + 7)]
+    headers = {"x-api-key": API_KEY}
+
+    def one(data: bytes) -> None:
+        _check(client.post("/api/v1/resume/upload", files={"file": ("resume.pdf", data, "application/pdf")}, headers=headers))
+
+    return summarize([time_call(lambda: one(p)) for p in pdfs])
+
+
+def bench_match_jobs(client, n: int, seed: int, repeat: int) -> Dict[str, Dict[str, Any]]:
+    """One resume against n jobs: first call encodes the jobs (cold), the rest hit the store."""
+    jobs = [{k: j[k] for k in ("jobId", "title", "text")} for j in generate_jobs(n, seed)]
+    resumes = generate_resumes(repeat + 1, seed + 11)
+    headers = {"x-api-key": API_KEY}
+
+    def one(resume: Dict[str, Any], **extra) -> None:
+        _check(client.post("/api/v1/match-jobs", json={"resumeText": resume["text"], "jobs": jobs, **extra}, headers=headers))
+
+    cold = time_call(lambda: one(resumes[0]))
+    warm = [time_call(lambda: one(r)) for r in resumes[1:]]
+
+    # same catalog registered once, then referenced by id
+    _check(client.put("/api/v1/catalog/jobs", json={"jobs": jobs}, headers=headers))
+    job_ids = [j["jobId"] for j in jobs]
+
+    def registered_one(resume: Dict[str, Any], **extra) -> None:
+        _check(client.post("/api/v1/match-jobs", json={"resumeText": resume["text"], **extra}, headers=headers))
+
+    registered = [time_call(lambda: registered_one(r, jobIds=job_ids)) for r in resumes[1:]]
+    # all active registered jobs, approximate top-k from the catalog's IVF index
+    top_k = [time_call(lambda: registered_one(r, top_k=10)) for r in resumes[1:]]
+    return {
+        "cold": summarize([cold], n),
+        "warm": summarize(warm, n),
+        "top_k": summarize(top_k, n),
+        "registered": summarize(registered, n),
+    }
+
+
+def bench_match_candidates(client, n: int, seed: int, repeat: int) -> Dict[str, Dict[str, Any]]:
+    """n seekers against min(n, MAX_CANDIDATE_JOBS) jobs; cold = first encode of both sides."""
+    jobs = [{k: j[k] for k in ("jobId", "title", "text")} for j in generate_jobs(min(n, MAX_CANDIDATE_JOBS), seed + 13)]
+    seekers = [{"seekerId": r["id"], "resumeText": r["text"]} for r in generate_resumes(n, seed + 17)]
+    body = {"jobs": jobs, "jobseekers": seekers}
+    headers = {"x-api-key": API_KEY}
+
+    def one(**extra) -> None:
+        _check(client.post("/api/v1/match-candidates", json={**body, **extra}, headers=headers))
+
+    cold = time_call(one)
+    warm = [time_call(one) for _ in range(repeat)]
+    best = [time_call(lambda: one(mode="best_per_seeker")) for _ in range(repeat)]
+    top_k = [time_call(lambda: one(mode="top_k_per_job", k=10)) for _ in range(repeat)]
+    return {
+        "cold": summarize([cold], n),
+        "warm": summarize(warm, n),
+        "best_per_seeker": summarize(best, n),
+        "top_k_per_job": summarize(top_k, n),
+    }
+
+
+def run(scales: List[int], seed: int, repeat: int, endpoints: List[str]) -> Dict[str, Dict[str, Any]]:
+    # imported here: the caller sets up the environment (stub encoder, temp store) first
+    from fastapi.testclient import TestClient
+    from app.main import app
+
+    results: Dict[str, Dict[str, Any]] = {}
+    with TestClient(app) as client:
+        for n in scales:
+            if "upload" in endpoints:
+                results[f"e2e.upload[{n}]"] = bench_upload(client, n, seed)
+            if "match-jobs" in endpoints:
+                for mode, r in bench_match_jobs(client, n, seed, repeat).items():
+                    results[f"e2e.match_jobs[{n}].{mode}"] = r
+            if "match-candidates" in endpoints:
+                for mode, r in bench_match_candidates(client, n, seed, repeat).items():
+                    results[f"e2e.match_candidates[{n}].{mode}"] = r
+    return results
@@ -0,0 +1,54 @@
+# benchmarks/encoder_parity.py
+# Encoder backend parity on the synthetic corpus: cosine drift against the fp32
+# reference, top-k job agreement per resume, encode throughput.
+#
+#   python -m benchmarks.encoder_parity --backend torch-int8 --jobs 500 --resumes 50
+#   python -m benchmarks.encoder_parity --backend onnx --min-cosine 0.98 --out parity.json
+from typing import List, Optional
+import sys
+import json
+import argparse
+
+from benchmarks import harness
+from benchmarks.corpus import generate_jobs, generate_resumes
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    from app.services import encoder_backends
+    from app.services.model_registry import SENTENCE_MODEL_NAME
+
+    ap = argparse.ArgumentParser(description="sentence encoder backend parity")
+    ap.add_argument("--model", default=SENTENCE_MODEL_NAME)
+    ap.add_argument("--backend", required=True, choices=list(encoder_backends.BACKENDS))
+    ap.add_argument("--reference", default="torch", choices=list(encoder_backends.BACKENDS))
+    ap.add_argument("--jobs", type=int, default=500, help="texts encoded by both backends")
+    ap.add_argument("--resumes", type=int, default=50, help="queries for the top-k agreement")
+    ap.add_argument("--k", type=int, default=10)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--min-cosine", type=float, default=None, help="exit 1 if any text drifts below this")
+    ap.add_argument("--out", help="report file (JSON)")
+    args = ap.parse_args(argv)
+
+    # the texts /match-jobs embeds: "title. text" for jobs, the raw resume
+    texts = [f"{j['title']}. {j['text']}" for j in generate_jobs(args.jobs, args.seed)]
+    queries = [r["text"] for r in generate_resumes(args.resumes, args.seed + 1)]
+
+    report = encoder_backends.parity(
+        encoder_backends.load(args.model, args.reference),
+        encoder_backends.load(args.model, args.backend),
+        texts, queries, k=args.k,
+    )
+    report.update(model=args.model, backend=args.backend, reference=args.reference)
+    print(json.dumps(report, indent=1))
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump({"meta": harness.run_metadata(seed=args.seed), "parity": report}, f, indent=1)
+
+    if args.min_cosine is not None and report["cosine_min"] < args.min_cosine:
+        print(f"cosine_min {report['cosine_min']} < {args.min_cosine}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
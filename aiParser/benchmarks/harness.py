@@ -0,0 +1,114 @@
+# benchmarks/harness.py
+# Timing, result files and run-to-run comparison shared by the benchmark suites.
+from typing import Any, Callable, Dict, List, Optional
+import os
+import sys
+import json
+import time
+import platform
+import tempfile
+import subprocess
+
+import numpy as np
+
+# x-api-key the benchmark processes configure for themselves
+API_KEY = "benchmark"
+
+
+def prepare_app_environment(stub_encoder: bool = False) -> None:
+    """Before `app` is imported: throwaway caches, test API keys, optional stub encoder."""
+    workdir = tempfile.mkdtemp(prefix="aiparser-bench-")
+    os.environ["EMBEDDING_STORE_DIR"] = os.path.join(workdir, "embeddings")
+    os.environ["PARSE_CACHE_DIR"] = ""
+    os.environ["API_KEY"] = API_KEY
+    os.environ["PARSER_API_KEY"] = API_KEY
+    os.environ.setdefault("MODEL_WARMUP", "lazy")
+    if stub_encoder:
+        from benchmarks import stub_encoder as stub
+        stub.install()
+
+
+def summarize(samples: List[float], items: int = 1) -> Dict[str, Any]:
+    """Latency stats in ms for `samples` (seconds); `items` processed per sample."""
+    arr = np.asarray(samples, dtype=np.float64) * 1000.0
+    total = float(arr.sum()) / 1000.0
+    return {
+        "runs": len(samples),
+        "mean_ms": round(float(arr.mean()), 3),
+        "p50_ms": round(float(np.percentile(arr, 50)), 3),
+        "p95_ms": round(float(np.percentile(arr, 95)), 3),
+        "p99_ms": round(float(np.percentile(arr, 99)), 3),
+        "min_ms": round(float(arr.min()), 3),
+        "max_ms": round(float(arr.max()), 3),
+        "items_per_sec": round(items * len(samples) / total, 2) if total > 0 else None,
+    }
+
+
+def time_call(fn: Callable[[], Any]) -> float:
+    started = time.perf_counter()
+    fn()
+    return time.perf_counter() - started
+
+
+def measure(fn: Callable[[], Any], repeat: int, warmup: int = 1, items: int = 1) -> Dict[str, Any]:
+    for _ in range(warmup):
+        fn()
+    return summarize([time_call(fn) for _ in range(repeat)], items)
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=5,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout.strip() or None
+    except Exception:
+        return None
+
+
+def run_metadata(**extra) -> Dict[str, Any]:
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "git_commit": _git_commit(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        **extra,
+    }
+
+
+def write_results(path: str, meta: Dict[str, Any], results: Dict[str, Dict[str, Any]]) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"meta": meta, "results": results}, f, indent=1, sort_keys=True)
+
+
+def load_results(path: str) -> Dict[str, Any]:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def compare(base: Dict[str, Any], new: Dict[str, Any], metric: str = "p50_ms", tolerance: float = 0.10) -> List[Dict[str, Any]]:
+    """
+    Per benchmark: base / new `metric` and the relative change. `regression`
+    is set when the new run is slower by more than `tolerance` (0.10 = 10%).
+    """
+    rows = []
+    base_results, new_results = base.get("results", {}), new.get("results", {})
+    for name in sorted(set(base_results) | set(new_results)):
+        b = base_results.get(name, {}).get(metric)
+        n = new_results.get(name, {}).get(metric)
+        change = (n - b) / b if b and n is not None else None
+        rows.append({
+            "benchmark": name,
+            "base": b,
+            "new": n,
+            "change": round(change, 4) if change is not None else None,
+            "regression": change is not None and change > tolerance,
+        })
+    return rows
+
+
+def print_table(results: Dict[str, Dict[str, Any]], out=sys.stdout) -> None:
+    print(f"{'benchmark':44} {'runs':>5} {'p50 ms':>10} {'p95 ms':>10} {'items/s':>10}", file=out)
+    for name, r in sorted(results.items()):
+        print(f"{name:44} {r['runs']:5d} {r['p50_ms']:10.3f} {r['p95_ms']:10.3f} {str(r.get('items_per_sec')):>10}", file=out)
@@ -0,0 +1,300 @@
+# benchmarks/loadgen.py
+# Async load generator: a weighted mix of /match-jobs, /match-candidates and
+# /resume/upload at increasing concurrency, with latency percentiles, error
+# rates and throughput per endpoint and per concurrency level.
+#
+#   in-process (ASGI, no sockets):
+#     python -m benchmarks.loadgen --stub-encoder --concurrency 1,4,16,64 --duration 20
+#   one local uvicorn worker started for the run:
+#     python -m benchmarks.loadgen --serve --stub-encoder --out load.json
+#   an already running service:
+#     python -m benchmarks.loadgen --url http://localhost:9000 --api-key $API_KEY
+#
+# Each worker is a closed loop (send, wait, send again), so offered load grows
+# with concurrency until the service saturates; --burst adds upload bursts on
+# top of the mix. Result files work with `python -m benchmarks compare`.
+from typing import Any, Dict, List, NamedTuple, Optional
+import os
+import sys
+import json
+import time
+import random
+import asyncio
+import argparse
+import subprocess
+
+import httpx
+
+from benchmarks import harness
+from benchmarks.corpus import generate_jobs, generate_resumes, render_pdf
+
+ENDPOINTS = {
+    "match-jobs": "/api/v1/match-jobs",
+    "match-candidates": "/api/v1/match-candidates",
+    "upload": "/api/v1/resume/upload",
+}
+# jobseekers browsing >> uploads >> recruiter searches
+DEFAULT_MIX = "match-jobs=85,upload=10,match-candidates=5"
+# a concurrency level whose throughput is within this fraction of the best
+# level counts as saturated
+SATURATION_FRACTION = 0.95
+
+
+class Record(NamedTuple):
+    endpoint: str
+    seconds: float
+    ok: bool
+    status: str
+
+
+def parse_mix(spec: str) -> Dict[str, float]:
+    """"match-jobs=85,upload=10" -> {endpoint: weight}."""
+    mix: Dict[str, float] = {}
+    for part in spec.split(","):
+        if not part.strip():
+            continue
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in ENDPOINTS:
+            raise ValueError(f"unknown endpoint '{name}' (expected one of: {', '.join(ENDPOINTS)})")
+        mix[name] = float(weight) if weight else 1.0
+    if not mix or sum(mix.values()) <= 0:
+        raise ValueError("traffic mix needs at least one endpoint with a positive weight")
+    return mix
+
+
+class TrafficPlan:
+    """Pre-built request bodies, so the generator itself stays cheap per request."""
+
+    def __init__(self, mix: Dict[str, float], api_key: str, seed: int = 0, jobs: int = 200,
+                 candidate_jobs: int = 20, candidate_seekers: int = 500, pool: int = 50):
+        self.names = list(mix)
+        self.weights = [mix[n] for n in self.names]
+        self.headers = {"x-api-key": api_key}
+        json_headers = {**self.headers, "content-type": "application/json"}
+        self._bodies: Dict[str, List[Dict[str, Any]]] = {}
+
+        if "match-jobs" in mix:
+            catalog = [{k: j[k] for k in ("jobId", "title", "text")} for j in generate_jobs(jobs, seed)]
+            self._bodies["match-jobs"] = [
+                {"content": json.dumps({"resumeText": r["text"], "jobs": catalog}).encode("utf-8"), "headers": json_headers}
+                for r in generate_resumes(pool, seed + 1)
+            ]
+        if "match-candidates" in mix:
+            bodies = []
+            for i in range(max(1, pool // 10)):
+                job_docs = generate_jobs(candidate_jobs, seed + 100 + i)
+                seekers = generate_resumes(candidate_seekers, seed + 200 + i)
+                payload = {
+                    "jobs": [{k: j[k] for k in ("jobId", "title", "text")} for j in job_docs],
+                    "jobseekers": [{"seekerId": r["id"], "resumeText": r["text"]} for r in seekers],
+                }
+                bodies.append({"content": json.dumps(payload).encode("utf-8"), "headers": json_headers})
+            self._bodies["match-candidates"] = bodies
+        if "upload" in mix:
+            # distinct documents; against a service with a parse cache the
+            # pool repeats after `pool` uploads
+            self._bodies["upload"] = [
+                {"files": {"file": (f"resume-{r['id']}.pdf", render_pdf(r), "application/pdf")}, "headers": self.headers}
+                for r in generate_resumes(pool, seed + 2)
+            ]
+
+    def pick(self, rng: random.Random) -> str:
+        return rng.choices(self.names, self.weights)[0]
+
+    def request(self, name: str, rng: random.Random) -> Dict[str, Any]:
+        return {"method": "POST", "url": ENDPOINTS[name], **rng.choice(self._bodies[name])}
+
+
+async def _send(client: httpx.AsyncClient, plan: TrafficPlan, name: str, rng: random.Random,
+                records: List[Record]) -> None:
+    started = time.perf_counter()
+    try:
+        response = await client.request(**plan.request(name, rng))
+        ok, status = response.status_code < 400, str(response.status_code)
+    except httpx.HTTPError as e:
+        ok, status = False, type(e).__name__
+    records.append(Record(name, time.perf_counter() - started, ok, status))
+
+
+async def _worker(client, plan, rng, deadline, records) -> None:
+    while time.perf_counter() < deadline:
+        await _send(client, plan, plan.pick(rng), rng, records)
+
+
+async def _bursts(client, plan, rng, deadline, size, interval, records) -> None:
+    while time.perf_counter() + interval < deadline:
+        await asyncio.sleep(interval)
+        await asyncio.gather(*(_send(client, plan, "upload", rng, records) for _ in range(size)))
+
+
+def summarize_stage(records: List[Record], elapsed: float) -> Dict[str, Dict[str, Any]]:
+    """Per endpoint (and "all"): latency percentiles, request rate, errors."""
+    groups: Dict[str, List[Record]] = {"all": records}
+    for r in records:
+        groups.setdefault(r.endpoint, []).append(r)
+    out: Dict[str, Dict[str, Any]] = {}
+    for name, recs in groups.items():
+        if not recs:
+            continue
+        errors = [r for r in recs if not r.ok]
+        stats = harness.summarize([r.seconds for r in recs])
+        stats["requests_per_sec"] = round(len(recs) / elapsed, 2) if elapsed > 0 else None
+        stats["errors"] = len(errors)
+        stats["error_rate"] = round(len(errors) / len(recs), 4)
+        if errors:
+            stats["error_statuses"] = sorted({r.status for r in errors})
+        out[name] = stats
+    return out
+
+
+async def run_stage(client: httpx.AsyncClient, plan: TrafficPlan, concurrency: int, duration: float,
+                    seed: int, burst: int = 0, burst_interval: float = 10.0) -> Dict[str, Dict[str, Any]]:
+    records: List[Record] = []
+    started = time.perf_counter()
+    deadline = started + duration
+    tasks = [_worker(client, plan, random.Random(seed * 1000 + i), deadline, records) for i in range(concurrency)]
+    if burst and "upload" in plan.names:
+        tasks.append(_bursts(client, plan, random.Random(seed - 1), deadline, burst, burst_interval, records))
+    await asyncio.gather(*tasks)
+    return summarize_stage(records, time.perf_counter() - started)
+
+
+def saturation_point(stages: Dict[int, Dict[str, Dict[str, Any]]]) -> Optional[int]:
+    """Lowest concurrency reaching SATURATION_FRACTION of the best throughput."""
+    rates = {c: s["all"]["requests_per_sec"] for c, s in stages.items() if "all" in s}
+    if not rates:
+        return None
+    peak = max(rates.values())
+    return min(c for c, rps in rates.items() if rps >= SATURATION_FRACTION * peak)
+
+
+def print_stage(concurrency: int, stage: Dict[str, Dict[str, Any]], out=sys.stdout) -> None:
+    print(f"\nconcurrency {concurrency}", file=out)
+    print(f"  {'endpoint':18} {'reqs':>6} {'req/s':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'errors':>7}", file=out)
+    for name, s in sorted(stage.items(), key=lambda kv: kv[0] == "all"):
+        print(
+            f"  {name:18} {s['runs']:6d} {s['requests_per_sec']:8.2f} {s['p50_ms']:9.1f} {s['p95_ms']:9.1f} "
+            f"{s['p99_ms']:9.1f} {s['error_rate'] * 100:6.1f}%",
+            file=out,
+        )
+
+
+async def _run(args, base_url: Optional[str]) -> Dict[int, Dict[str, Dict[str, Any]]]:
+    plan = TrafficPlan(
+        parse_mix(args.mix), args.api_key, seed=args.seed, jobs=args.jobs,
+        candidate_jobs=args.candidate_jobs, candidate_seekers=args.candidate_seekers, pool=args.pool,
+    )
+    limits = httpx.Limits(max_connections=None, max_keepalive_connections=None)
+    timeout = httpx.Timeout(args.timeout)
+    stages: Dict[int, Dict[str, Dict[str, Any]]] = {}
+
+    async def ramp(client: httpx.AsyncClient) -> None:
+        if args.warmup > 0:
+            await run_stage(client, plan, 1, args.warmup, args.seed)
+        for c in args.concurrency:
+            stages[c] = await run_stage(client, plan, c, args.duration, args.seed + c, args.burst, args.burst_interval)
+            print_stage(c, stages[c])
+
+    if base_url:
+        async with httpx.AsyncClient(base_url=base_url, timeout=timeout, limits=limits) as client:
+            await ramp(client)
+    else:
+        from app.main import app
+        transport = httpx.ASGITransport(app=app)
+        # ASGITransport does not send lifespan events; run startup/shutdown here
+        async with app.router.lifespan_context(app):
+            async with httpx.AsyncClient(transport=transport, base_url="http://loadgen", timeout=timeout) as client:
+                await ramp(client)
+    return stages
+
+
+def _start_server(args) -> subprocess.Popen:
+    cmd = [sys.executable, "-m", "benchmarks.serve", "--port", str(args.port)]
+    if args.stub_encoder:
+        cmd.append("--stub-encoder")
+    proc = subprocess.Popen(cmd, cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    url = f"http://127.0.0.1:{args.port}"
+    deadline = time.time() + 120
+    while time.time() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"server exited with code {proc.returncode}")
+        try:
+            if httpx.get(url + "/", timeout=1.0).status_code == 200:
+                return proc
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.25)
+    proc.terminate()
+    raise RuntimeError("server did not come up within 120s")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description="aiParser load generator")
+    target = ap.add_mutually_exclusive_group()
+    target.add_argument("--url", help="base URL of a running service (default: in-process ASGI)")
+    target.add_argument("--serve", action="store_true", help="start one local uvicorn worker for the run")
+    ap.add_argument("--port", type=int, default=9100, help="port for --serve")
+    ap.add_argument("--api-key", default=None, help="x-api-key for --url (default: $API_KEY)")
+    ap.add_argument("--stub-encoder", action="store_true", help="hashing encoder instead of the model (in-process / --serve)")
+    ap.add_argument("--mix", default=DEFAULT_MIX, help="endpoint weights, e.g. match-jobs=85,upload=10,match-candidates=5")
+    ap.add_argument("--concurrency", default="1,4,16,64", help="concurrency ramp (comma-separated)")
+    ap.add_argument("--duration", type=float, default=20.0, help="seconds per concurrency level")
+    ap.add_argument("--warmup", type=float, default=5.0, help="seconds at concurrency 1 before measuring")
+    ap.add_argument("--burst", type=int, default=0, help="concurrent uploads per burst (0 = no bursts)")
+    ap.add_argument("--burst-interval", type=float, default=10.0)
+    ap.add_argument("--jobs", type=int, default=200, help="job catalog size per /match-jobs request")
+    ap.add_argument("--candidate-jobs", type=int, default=20)
+    ap.add_argument("--candidate-seekers", type=int, default=500)
+    ap.add_argument("--pool", type=int, default=50, help="distinct request bodies per endpoint")
+    ap.add_argument("--timeout", type=float, default=120.0)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--out", help="result file (JSON)")
+    args = ap.parse_args(argv)
+    args.concurrency = [int(c) for c in args.concurrency.split(",") if c.strip()]
+
+    try:
+        parse_mix(args.mix)
+    except ValueError as e:
+        ap.error(str(e))
+
+    proc = None
+    if args.url:
+        base_url = args.url.rstrip("/")
+        args.api_key = args.api_key or os.getenv("API_KEY", "")
+    else:
+        args.api_key = harness.API_KEY
+        if args.serve:
+            proc = _start_server(args)
+            base_url = f"http://127.0.0.1:{args.port}"
+        else:
+            harness.prepare_app_environment(args.stub_encoder)
+            base_url = None
+
+    try:
+        stages = asyncio.run(_run(args, base_url))
+    finally:
+        if proc is not None:
+            proc.terminate()
+            proc.wait(timeout=30)
+
+    knee = saturation_point(stages)
+    if knee is not None:
+        best = stages[knee]["all"]
+        print(f"\nsaturation: ~{best['requests_per_sec']} req/s at concurrency {knee} (p95 {best['p95_ms']} ms)")
+
+    if args.out:
+        results = {f"load[c={c}].{name}": s for c, stage in stages.items() for name, s in stage.items()}
+        meta = harness.run_metadata(
+            target=args.url or ("uvicorn" if args.serve else "asgi"), mix=parse_mix(args.mix),
+            concurrency=args.concurrency, duration=args.duration, seed=args.seed,
+            encoder="stub" if args.stub_encoder else os.getenv("SENTENCE_MODEL", "default"),
+            saturation_concurrency=knee,
+        )
+        harness.write_results(args.out, meta, results)
+        print(f"results -> {args.out}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,141 @@
+# benchmarks/regex_fuzz.py
+# Worst-case timing of the text-scanning patterns on pathological input.
+#
+#   python -m benchmarks.regex_fuzz                  # pathological cases + 200 fuzz docs
+#   python -m benchmarks.regex_fuzz --legacy         # also time the pre-hardening patterns
+#                                                    # (quadratic: timed at --legacy-size)
+#
+# Each case is timed at two sizes. Linear patterns take ~2x as long at 2x the
+# size; a ratio well above that means backtracking has gone super-linear. Exits
+# 1 when any case is over --max-ratio or over the --budget-ms per 100 KB.
+from typing import Callable, Dict, List, Optional, Tuple
+import re
+import sys
+import time
+import random
+import argparse
+
+from app.services.text_scanner import DATE_RANGE_RE, match_role_company, scan_contacts
+
+# what the parser used before app/services/text_scanner.py
+LEGACY_PATTERNS = {
+    "email": re.compile(r"[a-zA-Z0-9._%+\-]+@[a-zA-Z0-9.\-]+\.[A-Za-z]{2,}", re.I),
+    "markdown-link": re.compile(r"\[.*?\]\((https?://[^\s)]+)\)"),
+    "date-range": re.compile(
+        r"(?P<start>(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Sept|Oct|Nov|Dec|\w+)[\w\.\s,/-]{0,20}\d{2,4})\s*[-–—]\s*(?P<end>present|current|now|(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Sept|Oct|Nov|Dec|\w+)[\w\.\s,/-]{0,20}\d{2,4})",
+        re.I,
+    ),
+    "role-company": re.compile(r"(?P<role>[\w\-\s/&\.,]{2,80})\s+(?:at|\@|\|)\s+(?P<company>[\w\-\s\.,&/]{2,120})", re.I),
+}
+
+# name -> builder(n) returning roughly n characters; one long line each, the
+# shape broken PDF extraction produces
+PATHOLOGICAL: Dict[str, Callable[[int], str]] = {
+    "word-run": lambda n: "a" * n,
+    "digit-run": lambda n: "1" * n,
+    "space-run": lambda n: "x" + " " * n + "x",
+    "dotted-run": lambda n: "a." * (n // 2),
+    "at-signs": lambda n: "a@" * (n // 2),
+    "open-brackets": lambda n: "[" * n,
+    "separators": lambda n: "a at " * (n // 5),
+    "date-like": lambda n: "Jan 2019 " * (n // 9),
+    "dangling-dash": lambda n: "2019 -" * (n // 6),
+    "words-no-dash": lambda n: "January 2019 and " * (n // 17),
+}
+
+
+def _scanner(text: str) -> None:
+    scan_contacts(text)
+    DATE_RANGE_RE.search(text)
+    match_role_company(text)
+
+
+def _parser(text: str) -> None:
+    from app.services.parse_resume import parse_resume_text
+    parse_resume_text(text)
+
+
+def _legacy(name: str) -> Callable[[str], None]:
+    pattern = LEGACY_PATTERNS[name]
+    return lambda text: pattern.search(text)
+
+
+def _time(fn: Callable[[str], None], text: str) -> float:
+    started = time.perf_counter()
+    fn(text)
+    return time.perf_counter() - started
+
+
+def run_case(fn: Callable[[str], None], build: Callable[[int], str], size: int) -> Tuple[float, float]:
+    """(seconds at `size`, seconds at 2 * `size` / seconds at `size`)."""
+    small = _time(fn, build(size))
+    large = _time(fn, build(2 * size))
+    return small, (large / small if small > 0 else 0.0)
+
+
+def fuzz_documents(seed: int, count: int, size: int) -> List[str]:
+    """Random mixes of resume-ish tokens and junk, mostly without newlines."""
+    rng = random.Random(seed)
+    tokens = [
+        "a", "1", " ", ".", "-", "–", "@", "/", "|", "(", ")", "[", "]", "at", "www.", "https://",
+        "Jan", "Sept.", "2019", "'21", "present", "+1", "555", "skills:", "using", ",", "\n",
+    ]
+    docs = []
+    for _ in range(count):
+        weights = [rng.random() for _ in tokens]
+        parts, length = [], 0
+        while length < size:
+            tok = rng.choices(tokens, weights)[0] * rng.randint(1, 50)
+            parts.append(tok)
+            length += len(tok)
+        docs.append("".join(parts))
+    return docs
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description="Time text-scanning patterns on pathological input.")
+    ap.add_argument("--size", type=int, default=100_000, help="characters per case (timed at 1x and 2x)")
+    ap.add_argument("--fuzz", type=int, default=200, help="random documents to scan")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--budget-ms", type=float, default=500.0, help="max ms per 100 KB for any single case")
+    ap.add_argument("--max-ratio", type=float, default=3.0, help="max slowdown when the input doubles")
+    ap.add_argument("--parser", action="store_true", help="also time the whole parse_resume_text")
+    ap.add_argument("--legacy", action="store_true", help="also time the old patterns (slow!)")
+    ap.add_argument("--legacy-size", type=int, default=2_000)
+    args = ap.parse_args(argv)
+
+    targets: Dict[str, Callable[[str], None]] = {"scanner": _scanner}
+    if args.parser:
+        targets["parse_resume_text"] = _parser
+    if args.legacy:
+        targets.update({f"legacy:{name}": _legacy(name) for name in LEGACY_PATTERNS})
+
+    per_100kb = 100_000 / args.size
+    failures = 0
+    print(f"{'target':28} {'case':16} {'ms':>10} {'x2 ratio':>9}")
+    for target, fn in targets.items():
+        legacy = target.startswith("legacy:")
+        size = args.legacy_size if legacy else args.size
+        fn("warm up")  # imports, model registry, compiled pattern caches
+        for case, build in PATHOLOGICAL.items():
+            seconds, ratio = run_case(fn, build, size)
+            ms = seconds * 1000
+            bad = not legacy and (ratio > args.max_ratio or ms * per_100kb > args.budget_ms)
+            failures += bad
+            print(f"{target:28} {case:16} {ms:10.1f} {ratio:9.2f}{'  FAIL' if bad else ''}")
+
+    worst, worst_doc = 0.0, -1
+    for i, doc in enumerate(fuzz_documents(args.seed, args.fuzz, args.size // 10)):
+        seconds = _time(_scanner, doc)
+        if seconds > worst:
+            worst, worst_doc = seconds, i
+    worst_ms = worst * 1000
+    fuzz_bad = worst_ms * per_100kb * 10 > args.budget_ms
+    failures += fuzz_bad
+    print(f"fuzz: {args.fuzz} docs of {args.size // 10} chars, worst {worst_ms:.1f} ms (doc #{worst_doc}, seed {args.seed})"
+          f"{'  FAIL' if fuzz_bad else ''}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
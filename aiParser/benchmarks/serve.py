@@ -0,0 +1,29 @@
+# benchmarks/serve.py
+# One uvicorn worker with the benchmark environment (temp store, test key,
+# optional stub encoder) -- the target `loadgen --serve` starts and stops.
+#
+#   python -m benchmarks.serve --port 9100 --stub-encoder
+from typing import List, Optional
+import argparse
+
+from benchmarks.harness import prepare_app_environment
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    ap = argparse.ArgumentParser(description="serve the app for load tests")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=9100)
+    ap.add_argument("--stub-encoder", action="store_true")
+    args = ap.parse_args(argv)
+
+    # the stub is installed in this process, so the app object is passed
+    # directly rather than as an import string uvicorn would re-import
+    prepare_app_environment(args.stub_encoder)
+    import uvicorn
+    from app.main import app
+
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
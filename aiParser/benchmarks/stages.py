@@ -0,0 +1,39 @@
+# benchmarks/stages.py
+# Microbenchmarks: each parse_resume.py stage on its own, plus PDF extraction.
+from typing import Any, Dict, List
+
+from benchmarks.corpus import render_pdf
+from benchmarks.harness import summarize, time_call
+
+
+def run(resumes: List[Dict[str, Any]], pdf_samples: int = 20) -> Dict[str, Dict[str, Any]]:
+    """
+    Every registered parser stage timed exclusively (its inputs are computed
+    first, untimed), the whole parser with and without field selection, the
+    contact scanner and PDF text extraction.
+    """
+    from app.services import parse_resume as pr
+    from app.services.resumeText import extract_text_and_links
+    from app.services.text_scanner import scan_contacts
+
+    results: Dict[str, Dict[str, Any]] = {}
+
+    for name, stage in pr.STAGES.items():
+        samples = []
+        for r in resumes:
+            ctx = {"raw_text": r["text"], "raw_links": r["links"]}
+            args = [pr._run_stage(dep, ctx) for dep in stage.requires]
+            samples.append(time_call(lambda: stage.fn(*args)))
+        results[f"stage.{name}"] = summarize(samples)
+
+    results["parse.scan_contacts"] = summarize([time_call(lambda: scan_contacts(r["text"])) for r in resumes])
+    results["parse.full"] = summarize([time_call(lambda: pr.parse_resume_text(r["text"], r["links"])) for r in resumes])
+    fields = pr.resolve_fields("contacts,skills")
+    results["parse.contacts_skills"] = summarize(
+        [time_call(lambda: pr.parse_resume_text(r["text"], r["links"], fields)) for r in resumes]
+    )
+
+    pdfs = [render_pdf(r) for r in resumes[:pdf_samples]]
+    if pdfs:
+        results["pdf.extract"] = summarize([time_call(lambda: extract_text_and_links(p)) for p in pdfs])
+    return results
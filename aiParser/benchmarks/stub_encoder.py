@@ -0,0 +1,52 @@
+# benchmarks/stub_encoder.py
+# Deterministic stand-in for the sentence encoder (no torch, no download).
+#
+# Feature-hashes word unigrams + bigrams into `dim` buckets, so similar texts
+# still score higher than unrelated ones and the matching code paths do real
+# work; the absolute scores mean nothing.
+from typing import Sequence
+import os
+import re
+import zlib
+
+import numpy as np
+
+STUB_MODEL_NAME = "benchmark-stub-hash-384"
+STUB_DIM = 384
+
+_TOKEN_RE = re.compile(r"[a-z0-9+#.]+")
+
+
+class HashingEncoder:
+    """`encode()` with the SentenceTransformer keyword arguments the app uses."""
+
+    def __init__(self, dim: int = STUB_DIM):
+        self.dim = dim
+
+    def _vector(self, text: str) -> np.ndarray:
+        vec = np.zeros(self.dim, dtype=np.float32)
+        tokens = _TOKEN_RE.findall(text.lower())
+        for tok in tokens + [a + " " + b for a, b in zip(tokens, tokens[1:])]:
+            h = zlib.crc32(tok.encode("utf-8"))
+            vec[h % self.dim] += 1.0 if (h >> 16) & 1 else -1.0
+        return vec
+
+    def encode(self, texts: Sequence[str], batch_size: int = 32, convert_to_numpy: bool = True,
+               normalize_embeddings: bool = True, **_) -> np.ndarray:
+        out = np.stack([self._vector(t) for t in texts]) if len(texts) else np.zeros((0, self.dim), np.float32)
+        if normalize_embeddings:
+            norms = np.linalg.norm(out, axis=1, keepdims=True)
+            out = out / np.where(norms == 0, 1.0, norms)
+        return out.astype(np.float32)
+
+
+def install() -> None:
+    """
+    Use the stub for this process. Call before importing `app`: the embedding
+    store directory is keyed by model name, so stub vectors never mix with
+    real ones.
+    """
+    os.environ["SENTENCE_MODEL"] = STUB_MODEL_NAME
+    from app.services import model_registry
+    model_registry.SENTENCE_MODEL_NAME = STUB_MODEL_NAME
+    model_registry.register(model_registry.SENTENCE_ENCODER, HashingEncoder)
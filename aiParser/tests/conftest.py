@@ -0,0 +1,21 @@
+# tests/conftest.py
+# Runs before any `app` import: throwaway caches, no background model warm-up,
+# and the deterministic hashing encoder instead of downloading the real model.
+#
+#   cd aiParser && python -m pytest -q
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+_workdir = tempfile.mkdtemp(prefix="aiparser-tests-")
+os.environ["EMBEDDING_STORE_DIR"] = os.path.join(_workdir, "embeddings")
+os.environ["PARSE_CACHE_DIR"] = ""
+os.environ["MODEL_WARMUP"] = "lazy"
+os.environ.pop("PARSER_API_KEY", None)
+os.environ.pop("API_KEY", None)
+
+from benchmarks import stub_encoder  # noqa: E402
+
+stub_encoder.install()
@@ -0,0 +1,50 @@
+import numpy as np
+
+from app.services.ann_index import IVFIndex
+
+
+def _clustered(n, dim=32, clusters=40, seed=0):
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(clusters, dim))
+    x = centers[rng.integers(0, clusters, size=n)] + 0.3 * rng.normal(size=(n, dim))
+    return (x / np.linalg.norm(x, axis=1, keepdims=True)).astype(np.float32)
+
+
+def test_trained_index_recall():
+    data = _clustered(4000)
+    index = IVFIndex(nprobe=8, min_train_size=1000)
+    index.add([str(i) for i in range(3800)], data[:3800])
+    assert index.is_trained
+    assert index.recall(data[3800:], k=10) >= 0.9
+
+
+def test_small_index_is_exact():
+    data = _clustered(200)
+    index = IVFIndex(min_train_size=1000)
+    index.add([str(i) for i in range(200)], data)
+    q = data[7]
+    expected = np.argsort(-(data @ q), kind="stable")[:5]
+    assert [i for i, _ in index.search(q, 5)] == [str(i) for i in expected]
+
+
+def test_remove_and_sync():
+    data = _clustered(50)
+    ids = [str(i) for i in range(50)]
+    index = IVFIndex(min_train_size=1000)
+    index.add(ids, data, tags=ids)
+    index.remove(["3"])
+    assert "3" not in index and len(index) == 49
+    assert "3" not in {i for i, _ in index.search(data[3], 49)}
+
+    requested = []
+
+    def vectors_for(positions):
+        requested.extend(positions)
+        return data[positions]
+
+    # "0" dropped, "3" back, "5" re-tagged: only the last two are re-inserted
+    tags = list(ids[1:])
+    tags[4] = "changed"
+    index.sync(ids[1:], tags, vectors_for)
+    assert sorted(requested) == [2, 4]
+    assert "0" not in index and "3" in index and index.tag("5") == "changed"
@@ -0,0 +1,77 @@
+import io
+import json
+import zipfile
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api.v1 import bulk_resume
+from app.main import app
+
+RESUME = b"Jane Doe\njane@example.com\nSkills: Python, SQL, Docker\nExperience\nEngineer at Acme 2019 - 2023\n"
+
+
+@pytest.fixture(scope="module")
+def client():
+    with TestClient(app) as c:
+        yield c
+
+
+def _zip(members):
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w") as zf:
+        for name, data in members.items():
+            zf.writestr(name, data)
+    return buf.getvalue()
+
+
+def _lines(response):
+    return [json.loads(line) for line in response.text.splitlines() if line]
+
+
+def test_single_file_over_the_per_file_limit_is_rejected(client, monkeypatch):
+    monkeypatch.setattr(bulk_resume, "MAX_PDF_BYTES", 64)
+    r = client.post("/api/v1/resume/bulk", files=[("files", ("big.txt", b"x" * 65, "text/plain"))])
+    assert r.status_code == 413 and "big.txt" in r.json()["detail"]
+
+
+def test_request_over_the_total_limit_is_rejected(client, monkeypatch):
+    monkeypatch.setattr(bulk_resume, "MAX_BULK_BYTES", 100)
+    files = [("files", (f"r{i}.txt", b"x" * 40, "text/plain")) for i in range(3)]
+    r = client.post("/api/v1/resume/bulk", files=files)
+    assert r.status_code == 413 and "Bulk upload" in r.json()["detail"]
+
+
+def test_zip_members_and_files_are_parsed(client):
+    files = [
+        ("files", ("a.txt", RESUME, "text/plain")),
+        ("files", ("batch.zip", _zip({"b.txt": RESUME, "notes.md": b"skip"}), "application/zip")),
+    ]
+    r = client.post("/api/v1/resume/bulk", files=files)
+    assert r.status_code == 200
+    lines = _lines(r)
+    assert sorted(row["file"] for row in lines[:-1]) == ["a.txt", "batch.zip!b.txt"]
+    assert all(row["status"] == "success" for row in lines[:-1])
+    assert lines[-1]["summary"]["documents"] == 2
+
+
+def test_stream_holds_the_bulk_slot_only_while_it_runs():
+    import asyncio
+
+    from app.services.executor import limit
+
+    async def documents():
+        yield "a.txt", RESUME
+
+    async def scenario():
+        limiter = limit("resume-bulk")
+        bulk_resume._stream(documents(), limiter)  # response never sent
+        assert limiter.in_flight == 0
+
+        stream = bulk_resume._stream(documents(), limiter)
+        await stream.__anext__()
+        assert limiter.in_flight == 1
+        await stream.aclose()  # client went away mid-body
+        assert limiter.in_flight == 0
+
+    asyncio.run(scenario())
@@ -0,0 +1,116 @@
+import numpy as np
+import pytest
+
+from app.services import catalog
+from app.services.embeddings import store
+
+
+@pytest.fixture
+def seekers(tmp_path, monkeypatch):
+    monkeypatch.setattr(catalog, "EMBEDDING_DTYPE", "int8")
+    c = catalog.Catalog("test-seekers", store, (catalog.SEEKER_RESUME,))
+    c._path = str(tmp_path / "catalog-test-seekers.jsonl")
+    c._file_lock = None
+    return c
+
+
+def _docs(n, start=0, suffix=""):
+    return [{"id": f"s{i}", "texts": {catalog.SEEKER_RESUME: f"resume {i} python docker {suffix}"}}
+            for i in range(start, start + n)]
+
+
+def _rebuilt(c):
+    # what a from-scratch build of the current view holds
+    fresh = catalog.Catalog("test-seekers", store, (catalog.SEEKER_RESUME,))
+    fresh._path, fresh._file_lock = c._path, None
+    fresh._load()
+    return fresh.select(catalog.SEEKER_RESUME)
+
+
+def _assert_same(selection, expected):
+    assert selection.ids == expected.ids
+    np.testing.assert_array_equal(selection.vectors.codes, expected.vectors.codes)
+    np.testing.assert_array_equal(selection.vectors.scales, expected.vectors.scales)
+
+
+def test_delete_updates_the_view_without_reading_the_store(seekers, monkeypatch):
+    seekers.upsert(_docs(50))
+    seekers.select(catalog.SEEKER_RESUME)
+
+    reads = []
+    get_keys = store.get_keys
+    monkeypatch.setattr(store, "get_keys", lambda keys: reads.append(len(keys)) or get_keys(keys))
+    seekers.delete(["s3", "s10"])
+    seekers.delete(["s49"])
+    selection = seekers.select(catalog.SEEKER_RESUME)
+    assert sum(reads) == 0
+    assert len(selection.ids) == 47 and "s3" not in selection.ids
+    _assert_same(selection, _rebuilt(seekers))
+
+
+def test_edits_and_additions_only_read_changed_rows(seekers, monkeypatch):
+    seekers.upsert(_docs(50))
+    seekers.select(catalog.SEEKER_RESUME)
+    seekers.upsert(_docs(2, start=5, suffix="edited") + _docs(3, start=50))
+    seekers.delete(["s0"])
+
+    reads = []
+    get_keys = store.get_keys
+    monkeypatch.setattr(store, "get_keys", lambda keys: reads.append(len(keys)) or get_keys(keys))
+    selection = seekers.select(catalog.SEEKER_RESUME)
+    assert sum(reads) == 5
+    _assert_same(selection, _rebuilt(seekers))
+
+
+def _reader(c):
+    other = catalog.Catalog("test-seekers", store, (catalog.SEEKER_RESUME,))
+    other._path, other._file_lock = c._path, None
+    return other
+
+
+def test_writes_within_one_mtime_tick_are_all_seen(seekers):
+    import os
+
+    reader = _reader(seekers)
+    seekers.upsert(_docs(3))
+    stamp = os.stat(seekers._path).st_mtime_ns
+    assert len(reader) == 3
+
+    seekers.delete(["s0"])
+    os.utime(seekers._path, ns=(stamp, stamp))  # same mtime as the previous write
+    assert len(reader) == 2
+    assert reader.select(catalog.SEEKER_RESUME).ids == ["s1", "s2"]
+
+
+def test_log_is_compacted(seekers, monkeypatch):
+    monkeypatch.setattr(catalog, "_COMPACT_MIN_RECORDS", 4)
+    reader = _reader(seekers)
+    for i in range(10):
+        seekers.upsert(_docs(1, suffix=str(i)))  # one document, edited over and over
+    with open(seekers._path, encoding="utf-8") as f:
+        assert len(f.readlines()) <= 1 + 4  # header + records since the last snapshot
+    assert len(reader) == 1
+    _assert_same(reader.select(catalog.SEEKER_RESUME), _rebuilt(seekers))
+
+
+def test_legacy_catalog_is_migrated(seekers, tmp_path):
+    import json
+
+    seekers.upsert(_docs(2))
+    legacy = tmp_path / "legacy" / "catalog-test-seekers.json"
+    legacy.parent.mkdir()
+    legacy.write_text(json.dumps({"kind": "test-seekers", "docs": seekers._docs}))
+
+    c = catalog.Catalog("test-seekers", store, (catalog.SEEKER_RESUME,))
+    c._path, c._file_lock, c._version = str(legacy) + "l", None, 0
+    c._load()
+    assert len(c) == 2
+    c.upsert(_docs(1, start=2))
+    assert len(_reader(c)) == 3
+
+
+def test_upsert_does_not_read_vectors_back(seekers, monkeypatch):
+    reads = []
+    monkeypatch.setattr(store, "get", lambda texts: reads.append(texts))
+    assert seekers.upsert(_docs(3, suffix="no-readback")) == 3
+    assert reads == []
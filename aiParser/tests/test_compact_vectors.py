@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+
+from app.services.compact_vectors import VectorBlock, similarity
+
+
+def _unit(n, dim=64, seed=0):
+    x = np.random.default_rng(seed).normal(size=(n, dim)).astype(np.float32)
+    return x / np.linalg.norm(x, axis=1, keepdims=True)
+
+
+@pytest.mark.parametrize("dtype,tol", [("float32", 0.0), ("float16", 1e-3), ("int8", 0.01)])
+def test_round_trip(dtype, tol):
+    x = _unit(300)
+    block = VectorBlock.from_float(x, dtype)
+    assert block.dtype == dtype and block.shape == x.shape
+    assert np.abs(block.to_float() - x).max() <= tol
+
+
+@pytest.mark.parametrize("dtype", ["float16", "int8"])
+def test_blockwise_scoring_matches_dequantized(dtype):
+    x, q = _unit(1000), _unit(3, seed=1)
+    block = VectorBlock.from_float(x, dtype)
+    block.block_rows = 128
+    dense = block.to_float()
+    np.testing.assert_allclose(block @ q[0], dense @ q[0], atol=1e-5)
+    np.testing.assert_allclose(block @ q.T, dense @ q.T, atol=1e-5)
+    np.testing.assert_allclose(similarity(q, block), q @ dense.T, atol=1e-5)
+    np.testing.assert_allclose(similarity(block, q), dense @ q.T, atol=1e-5)
+
+
+def test_int8_memory_and_zero_rows():
+    x = _unit(100)
+    x[5] = 0
+    block = VectorBlock.from_float(x, "int8")
+    assert block.nbytes == 100 * 64 + 100 * 4
+    assert not block.to_float()[5].any()
+    sub = block[[5, 6]]
+    np.testing.assert_allclose(sub.to_float(), block.to_float()[[5, 6]])
+
+
+def test_unknown_dtype():
+    with pytest.raises(ValueError, match="EMBEDDING_DTYPE"):
+        VectorBlock.empty(1, 4, "int4")
+
+
+# int8 tolerance against float32 on embedding-like vectors (768-d, 20k pool):
+# raw similarity within 0.005 (half a matchPercentage point) and >= 95% of
+# the float32 top-10 kept
+INT8_MAX_ABS_ERROR = 0.005
+INT8_MIN_TOP10_OVERLAP = 0.95
+
+
+def test_int8_ranking_stays_close_to_float32():
+    from benchmarks.compact_vectors import synthetic_embeddings
+
+    data = synthetic_embeddings(20040, 768, seed=3)
+    pool, queries = data[:20000], data[20000:]
+    exact = pool @ queries.T
+    approx = VectorBlock.from_float(pool, "int8") @ queries.T
+    assert np.abs(approx - exact).max() <= INT8_MAX_ABS_ERROR
+
+    top_exact = np.argsort(-exact, axis=0)[:10].T
+    top_int8 = np.argsort(-approx, axis=0)[:10].T
+    overlap = np.mean([len(set(a) & set(b)) / 10 for a, b in zip(top_exact.tolist(), top_int8.tolist())])
+    assert overlap >= INT8_MIN_TOP10_OVERLAP
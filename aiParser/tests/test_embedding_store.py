@@ -0,0 +1,79 @@
+import os
+
+import numpy as np
+
+from app.services.embedding_store import INDEX_FILE, EmbeddingStore, QueryCache
+
+
+def _encoder(calls):
+    def encode(texts):
+        calls.append(list(texts))
+        rng = np.random.default_rng(len(calls))
+        return rng.normal(size=(len(texts), 8)).astype(np.float32)
+    return encode
+
+
+def test_store_creates_directory_on_first_write(tmp_path):
+    store = EmbeddingStore("org/model", root=str(tmp_path / "store"))
+    assert not (tmp_path / "store").exists()
+    store.encode(["a"], _encoder([]))
+    assert os.path.exists(os.path.join(store.path, INDEX_FILE))
+
+
+def test_store_encodes_each_text_once_and_survives_reopen(tmp_path):
+    calls = []
+    store = EmbeddingStore("m", root=str(tmp_path))
+    first = store.encode(["a", "b", "a"], _encoder(calls))
+    second = store.encode(["b", "c"], _encoder(calls))
+    assert calls == [["a", "b"], ["c"]]
+    np.testing.assert_allclose(np.linalg.norm(first, axis=1), 1.0, rtol=1e-5)
+
+    reopened = EmbeddingStore("m", root=str(tmp_path))
+    assert len(reopened) == 3
+    np.testing.assert_array_equal(reopened.get(["a", "b", "c"]), np.vstack([first[:2], second[1:]]))
+
+
+def test_store_index_is_append_only(tmp_path):
+    store = EmbeddingStore("m", root=str(tmp_path))
+    store.encode(["a", "b"], _encoder([]))
+    index = os.path.join(store.path, INDEX_FILE)
+    with open(index, "rb") as f:
+        before = f.read()
+    store.encode(["c"], _encoder([]))
+    with open(index, "rb") as f:
+        after = f.read()
+    assert after.startswith(before)
+    assert len(after.splitlines()) == 1 + 3  # header + one key per row
+
+
+def test_store_sees_rows_appended_by_another_writer(tmp_path):
+    reader = EmbeddingStore("m", root=str(tmp_path))
+    writer = EmbeddingStore("m", root=str(tmp_path))
+    writer.encode(["a", "b"], _encoder([]))
+    assert reader.missing(["a", "b", "z"]) == ["z"]
+    np.testing.assert_array_equal(reader.get(["b"]), writer.get(["b"]))
+
+
+def test_store_ignores_torn_index_line(tmp_path):
+    store = EmbeddingStore("m", root=str(tmp_path))
+    store.encode(["a"], _encoder([]))
+    with open(os.path.join(store.path, INDEX_FILE), "a") as f:
+        f.write("deadbeef")  # writer crashed mid-line
+    reopened = EmbeddingStore("m", root=str(tmp_path))
+    assert len(reopened) == 1
+    reopened.encode(["b"], _encoder([]))
+    assert len(EmbeddingStore("m", root=str(tmp_path))) == 2
+
+
+def test_query_cache_is_bounded_and_memory_only(tmp_path):
+    calls = []
+    cache = QueryCache("m", size=2)
+    vectors = cache.encode(["x", "y", "x"], _encoder(calls))
+    np.testing.assert_array_equal(vectors[0], vectors[2])
+    cache.encode(["x"], _encoder(calls))
+    assert calls == [["x", "y"]]
+
+    cache.encode(["z"], _encoder(calls))
+    assert len(cache) == 2
+    found, missing = cache.lookup(["y", "x"])
+    assert missing == ["y"] and list(found) == ["x"]
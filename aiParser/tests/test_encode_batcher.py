@@ -0,0 +1,59 @@
+import asyncio
+import threading
+
+import numpy as np
+import pytest
+
+from app.services import metrics
+from app.services.encode_batcher import EncodeBatcher
+
+
+def _encode(texts):
+    metrics.record_timing("encode", 0.5)
+    return np.ones((len(texts), 4), dtype=np.float32)
+
+
+def test_batch_is_not_charged_to_the_request_that_opened_it():
+    batcher = EncodeBatcher(_encode, max_wait_ms=1)
+    before = metrics.ENCODE_BATCH_SECONDS.count()
+
+    async def request(texts):
+        timings = {}
+        metrics._timings.set(timings)
+        vectors = await batcher.encode(texts)
+        return vectors, timings
+
+    async def scenario():
+        return await asyncio.gather(request(["a", "b"]), request(["c"]))
+
+    (first, first_timings), (second, _) = asyncio.run(scenario())
+    assert first.shape == (2, 4) and second.shape == (1, 4)
+    assert batcher.batches == 1
+    assert "encode" not in first_timings
+    assert metrics.ENCODE_BATCH_SECONDS.count() == before + 1
+
+
+def test_close_cancels_in_flight_batches():
+    started, release = threading.Event(), threading.Event()
+
+    def slow(texts):
+        started.set()
+        release.wait(5)
+        return np.ones((len(texts), 4), dtype=np.float32)
+
+    batcher = EncodeBatcher(slow, max_wait_ms=1)
+
+    async def scenario():
+        caller = asyncio.ensure_future(batcher.encode(["a"]))
+        while not started.is_set():
+            await asyncio.sleep(0.001)
+        assert len(batcher._tasks) == 1  # the batcher owns the flush task
+        await batcher.close()
+        with pytest.raises(asyncio.CancelledError):
+            await caller
+        assert not batcher._tasks
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        release.set()
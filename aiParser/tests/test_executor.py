@@ -0,0 +1,25 @@
+import pytest
+
+from app.services import executor
+
+
+@pytest.fixture
+def fresh_pools():
+    executor.shutdown()
+    yield
+    executor.shutdown()
+
+
+def test_start_process_pool_spawns_every_worker(fresh_pools):
+    executor.start_process_pool(wait=True)
+    assert len(executor._process_pool._processes) == executor.EXECUTOR_PROCESSES
+
+
+def test_parse_workers_load_their_models_before_ready(fresh_pools):
+    from app.services import model_registry
+
+    assert model_registry.NER not in model_registry.REQUIRED_MODELS
+    assert not executor.process_pool_ready()
+    executor.start_process_pool(wait=True)
+    assert executor.parse_workers_ready() == executor.EXECUTOR_PROCESSES
+    assert executor.process_pool_ready()
@@ -0,0 +1,40 @@
+import json
+
+from app.services.headings import HeadingClassifier, build_classifier
+
+
+def _classifier():
+    return HeadingClassifier({
+        "experience": ["experience", "work history"],
+        "education": ["education"],
+        "awards": ["awards", "education awards"],
+    })
+
+
+def test_classify_lines():
+    c = _classifier()
+    assert c.classify("WORK HISTORY") == "experience"
+    assert c.classify("Education:") == "education"
+    assert c.classify("Python, SQL") is None
+
+
+def test_earlier_section_wins():
+    c = _classifier()
+    # "education awards" is listed under awards, but "education" ranks higher
+    assert c.classify("Education & Awards") == "education"
+    assert c.classify("Experience and Education") == "experience"
+
+
+def test_long_lines_are_not_headings():
+    assert _classifier().classify("I gained a lot of experience building data pipelines for teams") is None
+
+
+def test_vocabulary_file_extends_base(tmp_path):
+    path = tmp_path / "headings.json"
+    path.write_text(json.dumps({"education": {"es": ["formación"], "de": ["ausbildung"]},
+                                "projects": ["projects"]}), encoding="utf-8")
+    c = build_classifier({"experience": ["experience"]}, str(path))
+    assert c.classify("Formación") == "education"
+    assert c.classify("Ausbildung") == "education"
+    assert c.classify("Projects") == "projects"
+    assert c.sections == ["experience", "education", "projects"]
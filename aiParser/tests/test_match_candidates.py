@@ -0,0 +1,116 @@
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.scoring import to_percentages
+from app.services.embeddings import embed, query_cache, store
+
+TOPICS = ["python fastapi backend", "java spring services", "react frontend", "aws docker devops"]
+
+
+@pytest.fixture(scope="module")
+def client():
+    with TestClient(app) as c:
+        yield c
+
+
+def _jobs(n):
+    return [{"jobId": f"j{i}", "title": "engineer", "text": f"{TOPICS[i % 4]} engineer role {i}"} for i in range(n)]
+
+
+def _seekers(n):
+    # seekers 0 and 1 share a resume: every job scores them equally
+    texts = ["python fastapi backend developer"] * 2 + [f"{TOPICS[i % 4]} developer {i}" for i in range(2, n)]
+    return [{"seekerId": f"s{i}", "resumeText": t} for i, t in enumerate(texts)]
+
+
+def _scores(jobs, seekers):
+    j = embed([job["text"] for job in jobs])
+    s = embed([seeker["resumeText"] for seeker in seekers])
+    return to_percentages(j @ s.T)
+
+
+def _post(client, jobs, seekers, **extra):
+    response = client.post("/api/v1/match-candidates", json={"jobs": jobs, "jobseekers": seekers, **extra})
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def _triples(scores, threshold=20.0):
+    return [(f"j{r}", f"s{c}", float(scores[r, c]))
+            for r in range(scores.shape[0]) for c in range(scores.shape[1]) if scores[r, c] >= threshold]
+
+
+def test_pairs(client):
+    jobs, seekers = _jobs(6), _seekers(5)
+    rows = _post(client, jobs, seekers)
+    expected = sorted(_triples(_scores(jobs, seekers)), key=lambda t: -t[2])
+    assert [r["matchPercentage"] for r in rows] == [t[2] for t in expected]
+    assert {(r["jobId"], r["seekerId"]) for r in rows} == {t[:2] for t in expected}
+
+
+@pytest.mark.parametrize("k", [1, 2, 50])
+def test_top_k_per_job(client, k):
+    jobs, seekers = _jobs(6), _seekers(5)
+    scores = _scores(jobs, seekers)
+    rows = _post(client, jobs, seekers, mode="top_k_per_job", k=k)
+    for row in rows:
+        r = int(row["jobId"][1:])
+        order = [c for c in np.argsort(-scores[r], kind="stable") if scores[r, c] >= 20][:k]
+        # ties keep seeker order: s0 before s1
+        assert [m["seekerId"] for m in row["candidates"]] == [f"s{c}" for c in order]
+    assert {row["jobId"] for row in rows} == {f"j{r}" for r in range(len(jobs)) if scores[r].max() >= 20}
+
+
+@pytest.mark.parametrize("k", [None, 2, 50])
+def test_best_per_seeker(client, k):
+    jobs, seekers = _jobs(6), _seekers(5)
+    scores = _scores(jobs, seekers)
+    rows = _post(client, jobs, seekers, mode="best_per_seeker", **({"k": k} if k else {}))
+    best = [(f"s{c}", f"j{int(np.argmax(scores[:, c]))}", float(scores[:, c].max())) for c in range(len(seekers))]
+    expected = sorted([b for b in best if b[2] >= 20], key=lambda b: -b[2])[:k or len(best)]
+    assert [(r["seekerId"], r["jobId"], r["matchPercentage"]) for r in rows] == expected
+
+
+@pytest.mark.parametrize("k", [1, 3, 1000])
+def test_global_top_k(client, k):
+    jobs, seekers = _jobs(6), _seekers(5)
+    rows = _post(client, jobs, seekers, mode="global_top_k", k=k)
+    # stable sort of the row-major pairs: ties in (job, seeker) order
+    expected = sorted(_triples(_scores(jobs, seekers)), key=lambda t: -t[2])[:k]
+    assert [(r["jobId"], r["seekerId"], r["matchPercentage"]) for r in rows] == expected
+
+
+def test_mode_validation(client):
+    body = {"jobs": _jobs(2), "jobseekers": _seekers(2)}
+    assert client.post("/api/v1/match-candidates", json={**body, "mode": "nope"}).status_code == 400
+    assert client.post("/api/v1/match-candidates", json={**body, "mode": "global_top_k"}).status_code == 400
+    assert client.post("/api/v1/match-candidates", json={**body, "mode": "global_top_k", "k": 0}).status_code == 400
+
+
+def test_unknown_registered_ids_are_listed(client):
+    response = client.post("/api/v1/match-candidates",
+                           json={"jobIds": ["nope-job"], "seekerIds": ["nope-seeker"]})
+    assert response.status_code == 404
+    assert "nope-job" in response.json()["detail"] and "nope-seeker" in response.json()["detail"]
+
+
+def test_empty_registered_side_is_not_an_empty_match(client):
+    seekers = [{"seekerId": "reg-s0", "resumeText": "python developer", "attributes": {"team": "a"}}]
+    assert client.put("/api/v1/catalog/jobseekers", json={"jobseekers": seekers}).status_code == 200
+    response = client.post("/api/v1/match-candidates",
+                           json={"jobs": _jobs(2), "seekerFilters": {"team": "nobody"}})
+    assert response.status_code == 404
+    assert "seekerFilters" in response.json()["detail"]
+    rows = _post(client, _jobs(2), None, seekerFilters={"team": "a"}, mode="global_top_k", k=5)
+    assert {r["seekerId"] for r in rows} <= {"reg-s0"}
+
+
+def test_inline_seekers_are_cached_beyond_the_query_cache(client, monkeypatch):
+    monkeypatch.setattr(query_cache, "size", 4)
+    seekers = [{"seekerId": f"big-{i}", "resumeText": f"bulk pool resume {i} python"} for i in range(20)]
+    _post(client, _jobs(2), seekers, mode="global_top_k", k=5)
+    misses = store.misses
+    _post(client, _jobs(2), seekers, mode="global_top_k", k=5)
+    assert store.misses == misses
@@ -0,0 +1,73 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.scoring import ranked_matches
+from app.services import catalog
+from app.services.embeddings import embed, embed_queries
+
+RESUME = "Senior Python developer: FastAPI, PostgreSQL, Docker, AWS, machine learning pipelines"
+
+
+@pytest.fixture(scope="module")
+def client():
+    with TestClient(app) as c:
+        yield c
+
+
+def _jobs(prefix, n):
+    topics = ["python fastapi backend", "java spring", "react frontend", "aws docker devops", "data science python"]
+    return [{"jobId": f"{prefix}-{i}", "title": f"{topics[i % 5]} engineer",
+             "text": f"{topics[i % 5]} role {i} with python and docker"} for i in range(n)]
+
+
+def test_inline_top_k_returns_only_the_callers_jobs(client):
+    for prefix in ("client-a", "client-b"):
+        jobs = _jobs(prefix, 30)
+        body = {"resumeText": RESUME, "jobs": jobs, "top_k": 5, "min_score": 0}
+        rows = client.post("/api/v1/match-jobs", json=body).json()
+        assert len(rows) == 5
+        assert {r["jobId"] for r in rows} <= {j["jobId"] for j in jobs}
+
+
+def test_inline_top_k_is_the_exact_ranking_cut(client):
+    jobs = _jobs("exact", 40)
+    full = client.post("/api/v1/match-jobs", json={"resumeText": RESUME, "jobs": jobs, "min_score": 0}).json()
+    top = client.post("/api/v1/match-jobs", json={"resumeText": RESUME, "jobs": jobs, "min_score": 0, "top_k": 7}).json()
+    assert top == full[:7]
+
+
+def test_registered_top_k_searches_the_active_catalog(client):
+    jobs = _jobs("catalog", 50)
+    assert client.put("/api/v1/catalog/jobs", json={"jobs": jobs}).status_code == 200
+    client.post("/api/v1/catalog/jobs/delete", json={"ids": ["catalog-0", "catalog-1"]})
+
+    rows = client.post("/api/v1/match-jobs", json={"resumeText": RESUME, "top_k": 10, "min_score": 0}).json()
+
+    selection = catalog.jobs.select(catalog.JOB_LISTING)
+    expected = ranked_matches(selection.vectors @ embed_queries([RESUME])[0], selection.ids, "jobId", 0, 10)
+    # below ANN_MIN_TRAIN_SIZE the index scans exactly; equal percentages may
+    # come back in raw-score rather than catalog order
+    assert [r["matchPercentage"] for r in rows] == [r["matchPercentage"] for r in expected]
+    cut = expected[-1]["matchPercentage"]
+    assert {r["jobId"] for r in rows if r["matchPercentage"] > cut} == \
+        {r["jobId"] for r in expected if r["matchPercentage"] > cut}
+    assert not {"catalog-0", "catalog-1"} & {r["jobId"] for r in rows}
+    # the index follows catalog edits
+    ids, _ = catalog.jobs.nearest(catalog.JOB_LISTING, embed([jobs[0]["title"] + ". " + jobs[0]["text"]])[0], 100)
+    assert "catalog-0" not in ids and "catalog-2" in ids
+
+
+def test_metrics_endpoint_is_off_by_default(client):
+    assert client.get("/metrics").status_code == 404
+
+
+def test_empty_registered_selection_is_a_404_like_match_candidates(client):
+    jobs = [{**j, "attributes": {"location": "Remote"}} for j in _jobs("filtered", 3)]
+    assert client.put("/api/v1/catalog/jobs", json={"jobs": jobs}).status_code == 200
+    body = {"resumeText": RESUME, "filters": {"location": "Mars"}}
+    response = client.post("/api/v1/match-jobs", json=body)
+    assert response.status_code == 404 and "filters" in response.json()["detail"]
+    assert client.post("/api/v1/match-jobs?stream=true", json=body).status_code == 404
+    body["filters"] = {"location": "Remote"}
+    assert client.post("/api/v1/match-jobs", json={**body, "min_score": 0}).status_code == 200
@@ -0,0 +1,56 @@
+import importlib.util
+
+import pytest
+
+from app.services import encoder_backends, model_registry
+
+
+@pytest.fixture
+def no_onnxruntime(monkeypatch):
+    # torch / sentence-transformers "installed", the onnx extras not
+    monkeypatch.setattr(importlib.util, "find_spec",
+                        lambda name, *a: None if name in ("onnxruntime", "optimum") else object())
+
+
+def test_check_available(no_onnxruntime):
+    encoder_backends.check_available("torch")
+    with pytest.raises(ImportError, match="requirements-onnx.txt"):
+        encoder_backends.check_available("onnx")
+    with pytest.raises(ValueError, match="SENTENCE_BACKEND"):
+        encoder_backends.check_available("tensorrt")
+
+
+def test_warm_up_fails_fast_without_the_backend(no_onnxruntime, monkeypatch):
+    loaded = []
+    monkeypatch.setattr(encoder_backends, "SENTENCE_BACKEND", "onnx")
+    monkeypatch.setitem(model_registry._loaders, model_registry.SENTENCE_ENCODER, model_registry._load_sentence_encoder)
+    monkeypatch.setitem(model_registry._loaders, model_registry.NER, lambda: loaded.append("ner"))
+    for kwargs in ({}, {"background": True}):
+        with pytest.raises(ImportError, match="onnxruntime"):
+            model_registry.warm_up(**kwargs)
+    with pytest.raises(ImportError):
+        model_registry.preload()
+    assert loaded == []
+
+
+def test_custom_loader_skips_the_backend_check(no_onnxruntime, monkeypatch):
+    monkeypatch.setattr(encoder_backends, "SENTENCE_BACKEND", "onnx")
+    # conftest registered the stub encoder
+    assert model_registry._loaders[model_registry.SENTENCE_ENCODER] is not model_registry._load_sentence_encoder
+    model_registry.warm_up([model_registry.SENTENCE_ENCODER])
+    assert model_registry.status()[model_registry.SENTENCE_ENCODER] == "ready"
+
+
+def test_onnx_variants_get_their_own_store(monkeypatch, tmp_path):
+    from app.services.embedding_store import EmbeddingStore
+
+    monkeypatch.setattr(encoder_backends, "SENTENCE_BACKEND", "onnx")
+    paths = set()
+    for file_name, model_dir in [(None, None), ("onnx/model_qint8_avx512_vnni.onnx", None),
+                                 ("onnx/model_O4.onnx", None), (None, str(tmp_path / "export"))]:
+        monkeypatch.setattr(encoder_backends, "ONNX_FILE_NAME", file_name)
+        monkeypatch.setattr(encoder_backends, "ONNX_MODEL_DIR", model_dir)
+        paths.add(EmbeddingStore(model_registry.sentence_encoder_id(), root=str(tmp_path)).path)
+    monkeypatch.setattr(encoder_backends, "SENTENCE_BACKEND", "torch")
+    paths.add(EmbeddingStore(model_registry.sentence_encoder_id(), root=str(tmp_path)).path)
+    assert len(paths) == 5
@@ -0,0 +1,51 @@
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services.parse_cache import ParseCache, bytes_key, files_fingerprint, text_key
+from app.services.parse_resume import PARSE_CACHE_VERSION, PARSER_VERSION
+
+
+def test_fingerprint_follows_file_contents(tmp_path):
+    skills = tmp_path / "skills.json"
+    skills.write_text('{"skills": {"python": []}}')
+    missing = str(tmp_path / "absent.json")
+    before = files_fingerprint([str(skills), missing])
+    assert files_fingerprint([str(skills), missing]) == before
+
+    skills.write_text('{"skills": {"python": ["py"]}}')
+    assert files_fingerprint([str(skills), missing]) != before
+
+
+def test_cache_version_includes_loaded_files():
+    assert PARSE_CACHE_VERSION.startswith(PARSER_VERSION + "+")
+    assert text_key("a", [], PARSE_CACHE_VERSION) != text_key("a", [], PARSER_VERSION)
+    assert bytes_key(b"a", "6+x") != bytes_key(b"a", "6+y")
+
+
+def test_text_key_normalizes_whitespace_and_link_order():
+    assert text_key(" a \n\n b", ["y", "x "], "v") == text_key("a\nb", ["x", "y"], "v")
+    assert text_key("a", [], "v", ["skills"]) != text_key("a", [], "v")
+
+
+def test_lru_evicts_oldest():
+    cache = ParseCache(size=2, directory="")
+    cache.put("a", {"v": 1})
+    cache.put("b", {"v": 2})
+    cache.get("a")
+    cache.put("c", {"v": 3})
+    assert cache.get("b") is None and cache.get("a") == {"v": 1}
+
+
+def test_cache_stats_are_not_public():
+    with TestClient(app) as client:
+        assert client.get("/api/v1/resume/cache/stats").status_code in (404, 405)
+
+
+def test_stats_are_exported_as_metrics():
+    from app.services import metrics
+    from app.services.parse_cache import parse_cache
+
+    parse_cache.get("never-stored")
+    text = metrics.render()
+    assert 'parse_cache_lookups_total{result="miss"}' in text
+    assert "parse_cache_entries" in text
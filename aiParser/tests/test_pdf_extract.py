@@ -0,0 +1,38 @@
+import asyncio
+
+import fitz
+import pytest
+
+from app.services import executor, resumeText
+
+
+def _pdf(pages):
+    doc = fitz.open()
+    for i in range(pages):
+        page = doc.new_page()
+        page.insert_text((72, 72), f"page {i} experience python")
+        page.insert_link({"kind": fitz.LINK_URI, "from": fitz.Rect(72, 80, 200, 90), "uri": f"https://example.com/{i % 3}"})
+    return doc.tobytes()
+
+
+@pytest.mark.parametrize("pages,parts", [(1, 4), (16, 4), (17, 4), (50, 8), (3, 8)])
+def test_page_ranges_cover_every_page_once(pages, parts):
+    ranges = resumeText._page_ranges(pages, parts)
+    assert len(ranges) <= parts
+    assert [p for start, stop in ranges for p in range(start, stop)] == list(range(pages))
+
+
+def test_parallel_extraction_matches_serial(monkeypatch):
+    monkeypatch.setattr(executor, "PDF_PROCESSES", 3)
+    data = _pdf(resumeText.PDF_PARALLEL_MIN_PAGES + 5)
+    try:
+        parallel = asyncio.run(resumeText.extract_text_and_links_async(data))
+    finally:
+        executor.shutdown()
+    assert parallel == resumeText.extract_text_and_links(data)
+    assert parallel["links"] == [f"https://example.com/{i}" for i in range(3)]
+
+
+def test_page_limit_is_enforced_before_splitting():
+    with pytest.raises(resumeText.PdfLimitError):
+        asyncio.run(resumeText.extract_text_and_links_async(_pdf(resumeText.MAX_PDF_PAGES + 1)))
@@ -0,0 +1,56 @@
+from datetime import datetime
+
+import pytest
+
+from app.services.resume_dates import format_year_month, parse_year_month, total_experience_years
+
+
+@pytest.mark.parametrize("text,start,end", [
+    ("Jan 2021", (2021, 1), (2021, 1)),
+    ("Sept. 2019", (2019, 9), (2019, 9)),
+    ("01/2021", (2021, 1), (2021, 1)),
+    ("2021-03", (2021, 3), (2021, 3)),
+    ("2019", (2019, 1), (2019, 12)),
+])
+def test_parse_year_month(text, start, end):
+    assert parse_year_month(text) == start
+    assert parse_year_month(text, end=True) == end
+
+
+def test_present_is_this_month():
+    now = datetime.now()
+    assert parse_year_month("Present", end=True) == (now.year, now.month)
+    assert parse_year_month("") is None and parse_year_month(None) is None
+
+
+def test_format_year_month():
+    assert format_year_month((2021, 1)) == "Jan 2021"
+    assert format_year_month(None) is None
+
+
+def _range(start, end):
+    return parse_year_month(start), parse_year_month(end, end=True)
+
+
+def test_bare_end_year_covers_the_whole_year():
+    assert total_experience_years([_range("11/2021", "2024")]) == pytest.approx(3.17, abs=0.01)
+    assert total_experience_years([_range("2019", "2021")]) == 3.0
+
+
+def test_overlapping_ranges_count_once():
+    ranges = [_range("Jan 2018", "Dec 2019"), _range("Jun 2019", "Jun 2020"), _range("Jan 2022", "Dec 2022")]
+    assert total_experience_years(ranges) == 3.5
+
+
+def test_adjacent_ranges_merge_without_gap_or_double_count():
+    assert total_experience_years([_range("Jan 2020", "Jun 2020"), _range("Jul 2020", "Dec 2020")]) == 1.0
+
+
+def test_present_range_runs_to_this_month():
+    now = datetime.now()
+    months = (now.year - 2020) * 12 + now.month
+    assert total_experience_years([_range("Jan 2020", "present")]) == round(months / 12, 2)
+
+
+def test_incomplete_or_reversed_ranges_are_ignored():
+    assert total_experience_years([(None, (2020, 1)), ((2020, 1), None), _range("2022", "2020")]) == 0.0
@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+
+from app.scoring import global_top_k, iter_matches, rank_matches, top_k_indices, top_k_per_row
+
+
+def _stable_top_k(values, k):
+    return sorted(np.argsort(-values, kind="stable")[:k].tolist())
+
+
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize("k", [1, 3, 10, 50])
+def test_top_k_indices_matches_a_stable_sort(seed, k):
+    # few distinct values: plenty of ties at the cut-off
+    values = np.random.default_rng(seed).integers(0, 6, size=30).astype(np.float64)
+    assert top_k_indices(values, k).tolist() == _stable_top_k(values, k)
+
+
+def test_top_k_indices_keeps_lower_index_on_ties():
+    assert top_k_indices(np.array([5.0, 7.0, 5.0, 5.0, 1.0]), 3).tolist() == [0, 1, 2]
+    assert top_k_indices(np.array([1.0, 2.0]), 5).tolist() == [0, 1]
+
+
+def test_top_k_per_row_orders_and_thresholds():
+    scores = np.array([[90.0, 50.0, 90.0, 10.0],
+                       [15.0, 19.99, 5.0, 0.0]])
+    out = top_k_per_row(scores, ["r0", "r1"], ["a", "b", "c", "d"], "row", "col", k=2)
+    # ties broken by column order; a row with nothing above the threshold is left out
+    assert out == [{"row": "r0", "matches": [{"col": "a", "matchPercentage": 90.0},
+                                              {"col": "c", "matchPercentage": 90.0}]}]
+
+
+def test_top_k_per_row_matches_a_full_sort():
+    rng = np.random.default_rng(1)
+    scores = np.round(rng.uniform(0, 100, size=(20, 40)), 0)
+    cols = [f"c{i}" for i in range(40)]
+    out = top_k_per_row(scores, [f"r{i}" for i in range(20)], cols, "row", "col", k=5, threshold=0)
+    for r, row in enumerate(out):
+        expected = [cols[c] for c in np.argsort(-scores[r], kind="stable")[:5]]
+        assert [m["col"] for m in row["matches"]] == expected
+
+
+def test_top_k_per_row_k_above_columns():
+    out = top_k_per_row(np.array([[30.0, 40.0]]), ["r"], ["a", "b"], "row", "col", k=10)
+    assert [m["col"] for m in out[0]["matches"]] == ["b", "a"]
+    assert top_k_per_row(np.zeros((1, 0)), ["r"], [], "row", "col", k=3) == []
+
+
+def test_global_top_k():
+    scores = np.array([[80.0, 30.0], [80.0, 95.0], [10.0, 60.0]])
+    out = global_top_k(scores, ["r0", "r1", "r2"], ["a", "b"], "row", "col", k=3)
+    assert [(p["row"], p["col"], p["matchPercentage"]) for p in out] == [
+        ("r1", "b", 95.0), ("r0", "a", 80.0), ("r1", "a", 80.0)]
+    assert len(global_top_k(scores, ["r0", "r1", "r2"], ["a", "b"], "row", "col", k=100)) == 5
+
+
+def test_rank_matches_is_eager_and_iter_matches_only_builds_dicts():
+    similarities = np.array([0.5, 0.9, 0.1, 0.9, 0.3])
+    order, percentages = rank_matches(similarities, threshold=20, k=3)
+    assert order.tolist() == [1, 3, 0] and percentages.tolist() == [90.0, 90.0, 50.0]
+    ids = ["a", "b", "c", "d", "e"]
+    assert list(iter_matches((order, percentages), ids, "id")) == [
+        {"id": "b", "matchPercentage": 90.0}, {"id": "d", "matchPercentage": 90.0}, {"id": "a", "matchPercentage": 50.0}]
+    assert rank_matches(similarities, threshold=95)[0].size == 0
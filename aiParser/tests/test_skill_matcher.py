@@ -0,0 +1,30 @@
+from app.services.skill_matcher import SkillMatcher
+
+
+def _matcher():
+    return SkillMatcher({
+        "java": [], "javascript": ["js", "ecmascript"], "c": [], "c++": ["cpp"],
+        "machine learning": ["ml"], "next.js": ["nextjs"],
+    })
+
+
+def test_word_boundaries_and_longest_match():
+    found = _matcher().match("JavaScript, Java and C++ (not C#); also plain C.")
+    assert found == {"javascript": 1, "java": 1, "c++": 1, "c": 2}
+
+
+def test_aliases_and_multi_word_phrases():
+    found = _matcher().match("ML engineer: machine learning, Next.js and nextjs, cpp, JS")
+    assert found == {"machine learning": 2, "next.js": 2, "c++": 1, "javascript": 1}
+
+
+def test_match_order_is_first_occurrence():
+    assert list(_matcher().match("cpp then java then js")) == ["c++", "java", "javascript"]
+
+
+def test_canonicalize():
+    m = _matcher()
+    assert m.canonicalize(" ECMAScript ") == "javascript"
+    assert m.canonicalize("next . js") == "next.js"
+    assert m.canonicalize("rust") is None
+    assert "CPP" in m
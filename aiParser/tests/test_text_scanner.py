@@ -0,0 +1,42 @@
+import time
+
+from app.services.text_scanner import DATE_RANGE_RE, match_role_company, scan_contacts
+
+
+def test_scan_contacts():
+    text = ("Jane Doe | jane.doe@example.com | +1 415-555-0100\n"
+            "https://github.com/jane www.jane.dev jane.doe@example.com\n"
+            "Acme (2019), Globex (2021)\nteams 2019 2020 2021")
+    scan = scan_contacts(text)
+    assert scan.emails == ["jane.doe@example.com"]
+    assert scan.urls == ["https://github.com/jane", "www.jane.dev"]
+    # "2019 2020 2021" looks like a phone number but is not one
+    assert scan.phones == ["+1 415-555-0100"]
+    assert scan.years == ["2019", "2021"]
+
+
+def test_date_ranges():
+    for text, start, end in [
+        ("Jan 2020 - Present", "Jan 2020", "Present"),
+        ("01/2019 – 03/2021", "01/2019", "03/2021"),
+        ("Sept. 2019 - Dec '21", "Sept. 2019", "Dec '21"),
+        ("2018.05 - 2020", "2018.05", "2020"),
+    ]:
+        m = DATE_RANGE_RE.search(text)
+        assert (m.group("start"), m.group("end")) == (start, end)
+
+
+def test_role_company():
+    m = match_role_company("Frontend Developer at Acme Corp")
+    assert (m.group("role"), m.group("company")) == ("Frontend Developer", "Acme Corp")
+    assert match_role_company("Frontend Developer, Acme") is None
+
+
+def test_adversarial_input_is_linear():
+    # runs that used to make the naive email / role patterns backtrack
+    text = "a" * 50000 + "@" + "b" * 50000 + " " + "x " * 20000 + "at"
+    started = time.perf_counter()
+    scan_contacts(text)
+    match_role_company(text)
+    DATE_RANGE_RE.search("1" * 50000)
+    assert time.perf_counter() - started < 2.0
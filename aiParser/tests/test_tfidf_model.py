@@ -0,0 +1,40 @@
+import pytest
+
+from app.services.tfidf_model import TFIDF_MODEL_PATH, IdfModel, idf_model
+
+
+def test_no_model_by_default():
+    # conftest leaves TFIDF_MODEL_PATH unset
+    assert TFIDF_MODEL_PATH == "" and idf_model.n_docs == 0
+
+
+def test_missing_model_fails_loudly(tmp_path):
+    with pytest.raises(FileNotFoundError, match="tfidf_model fit"):
+        IdfModel.load(str(tmp_path / "absent.json.gz"))
+
+
+def test_empty_path_means_no_model():
+    model = IdfModel.load("")
+    assert model.n_docs == 0 and model.idf("anything") == 1.0
+
+
+def test_rare_terms_outrank_common_ones(tmp_path):
+    model = IdfModel()
+    model.update(["python experience team"] * 9 + ["kubernetes experience"])
+    assert model.idf("kubernetes") > model.idf("python") > model.idf("experience")
+    # same term frequency: rarer term first
+    unigrams = [t for t in model.top_terms("experience kubernetes python") if " " not in t]
+    assert unigrams == ["kubernetes", "python", "experience"]
+
+    path = str(tmp_path / "idf.json.gz")
+    model.save(path, min_df=1)
+    loaded = IdfModel.load(path)
+    assert loaded.n_docs == 10 and loaded.df == model.df
+
+
+def test_save_drops_terms_below_min_df(tmp_path):
+    model = IdfModel()
+    model.update(["python sql", "python"])
+    path = str(tmp_path / "idf.json.gz")
+    model.save(path, min_df=2)
+    assert set(IdfModel.load(path).df) == {"python"}